@@ -8,18 +8,19 @@ r"""
                        memorilabs.ai
 """
 
+import logging
 import os
+import threading
 from collections.abc import Callable
 from typing import Any
 from uuid import uuid4
 
-import psycopg
-
 from memori._config import Config
 from memori._exceptions import (
     QuotaExceededError,
     warn_if_legacy_memorisdk_installed,
 )
+from memori.llm._embeddings import embed_texts
 from memori.llm._providers import Agno as LlmProviderAgno
 from memori.llm._providers import Anthropic as LlmProviderAnthropic
 from memori.llm._providers import Google as LlmProviderGoogle
@@ -33,6 +34,8 @@ from memori.storage import Manager as StorageManager
 
 __all__ = ["Memori", "QuotaExceededError"]
 
+logger = logging.getLogger(__name__)
+
 warn_if_legacy_memorisdk_installed()
 
 
@@ -69,7 +72,9 @@ class LlmRegistry:
 
 
 class Memori:
-    def __init__(self, conn: Callable[[], Any] | Any | None = None):
+    def __init__(
+        self, conn: Callable[[], Any] | Any | None = None, warmup: bool = False
+    ):
         self.config = Config()
         self.config.api_key = os.environ.get("MEMORI_API_KEY", None)
         self.config.enterprise = os.environ.get("MEMORI_ENTERPRISE", "0") == "1"
@@ -91,9 +96,32 @@ class Memori:
         self.pydantic_ai = LlmProviderPydanticAi(self)
         self.xai = LlmProviderXAi(self)
 
+        self.warmup_thread = None
+        if warmup:
+            self.warmup_thread = threading.Thread(
+                target=self._warmup, name="memori-warmup", daemon=True
+            )
+            self.warmup_thread.start()
+
+    def _warmup(self):
+        """Load the embedding model and run one encode, so the first recall
+        does not pay for it."""
+        embeddings = self.config.embeddings
+        try:
+            embed_texts(
+                "warmup",
+                embeddings.model,
+                embeddings.fallback_dimension,
+                onnx=embeddings.onnx,
+            )
+        except Exception as e:
+            logger.warning(f"Embedding warmup failed: {e}")
+
     def _get_default_connection(self) -> Callable[[], Any]:
         connection_string = os.environ.get("MEMORI_COCKROACHDB_CONNECTION_STRING")
         if connection_string:
+            import psycopg
+
             return lambda: psycopg.connect(connection_string)
 
         raise RuntimeError(
@@ -114,19 +142,34 @@ class Memori:
             if len(process_id) > 100:
                 raise RuntimeError("process_id cannot be greater than 100 characters")
 
+        if entity_id != self.config.entity_id:
+            self.config.cache.entity_id = None
+
         self.config.entity_id = entity_id
         self.config.process_id = process_id
 
+        self._prefetch_recall()
         return self
 
     def new_session(self):
         self.config.session_id = uuid4()
         self.config.reset_cache()
+        self._prefetch_recall()
         return self
 
+    def _prefetch_recall(self):
+        if not self.config.recall_prefetch or self.config.entity_id is None:
+            return
+
+        if self.config.augmentation is not None:
+            self.config.augmentation.prefetch(self.config.entity_id)
+
     def set_session(self, id):
         self.config.session_id = id
         return self
 
     def recall(self, query: str, limit: int = 5):
         return Recall(self.config).search_facts(query, limit)
+
+    def recall_many(self, queries: list[str], limit: int = 5):
+        return Recall(self.config).search_facts_many(queries, limit)
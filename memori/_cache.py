@@ -0,0 +1,351 @@
+r"""
+ __  __                           _
+|  \/  | ___ _ __ ___   ___  _ __(_)
+| |\/| |/ _ \ '_ ` _ \ / _ \| '__| |
+| |  | |  __/ | | | | | (_) | |  | |
+|_|  |_|\___|_| |_| |_|\___/|_|  |_|
+                  perfectam memoriam
+                       memorilabs.ai
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class EntityIndexCache:
+    """In-process LRU cache of per-entity recall indexes.
+
+    Entries are keyed by the entity's database id and hold an ``EntityIndex``
+    (normalized vectors plus row ids). The cache is bounded by
+    ``config.recall_index_cache_max_bytes``; least recently used entities are
+    evicted first. Setting the budget to 0 disables caching.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.entries: OrderedDict[Any, Any] = OrderedDict()
+        self.evictions = 0
+        self.hits = 0
+        self.lock = threading.Lock()
+        self.misses = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self.config.recall_index_cache_max_bytes or 0
+
+    @property
+    def nbytes(self) -> int:
+        with self.lock:
+            return sum(entry.nbytes for entry in self.entries.values())
+
+    def __contains__(self, entity_id) -> bool:
+        with self.lock:
+            return entity_id in self.entries
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.entries)
+
+    def append(self, entity_id, ids: list, vectors, contents=None) -> bool:
+        entry = self.peek(entity_id)
+        if entry is None:
+            return False
+
+        entry.add(ids, vectors, contents)
+
+        with self.lock:
+            self._evict()
+
+        return True
+
+    def clear(self) -> "EntityIndexCache":
+        with self.lock:
+            self.entries.clear()
+        return self
+
+    def get(self, entity_id):
+        with self.lock:
+            entry = self.entries.get(entity_id)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(entity_id)
+            self.hits += 1
+            return entry
+
+    def invalidate(self, entity_id) -> "EntityIndexCache":
+        with self.lock:
+            self.entries.pop(entity_id, None)
+        return self
+
+    def peek(self, entity_id):
+        with self.lock:
+            return self.entries.get(entity_id)
+
+    def put(self, entity_id, entry):
+        max_bytes = self.max_bytes
+        if max_bytes <= 0 or entry.nbytes > max_bytes:
+            return entry
+
+        with self.lock:
+            self.entries[entity_id] = entry
+            self.entries.move_to_end(entity_id)
+            self._evict()
+
+        return entry
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "evictions": self.evictions,
+                "hits": self.hits,
+                "misses": self.misses,
+                "nbytes": sum(entry.nbytes for entry in self.entries.values()),
+            }
+
+    def _evict(self) -> None:
+        max_bytes = self.max_bytes
+        total = sum(entry.nbytes for entry in self.entries.values())
+
+        while self.entries and total > max_bytes:
+            _, entry = self.entries.popitem(last=False)
+            total -= entry.nbytes
+            self.evictions += 1
+
+
+class EntityVersions:
+    """Per-entity write counters used to invalidate cached recall results.
+
+    ``EntityFact.create`` and ``KnowledgeGraph.create`` bump the counter of
+    the entity they write to in every driver. Drivers are not handed a config, so the counters are
+    process-wide; a bump for an unrelated database sharing the same entity
+    id only costs a cache miss.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.versions: dict[Any, int] = {}
+
+    def bump(self, entity_id) -> int:
+        with self.lock:
+            version = self.versions.get(entity_id, 0) + 1
+            self.versions[entity_id] = version
+            return version
+
+    def get(self, entity_id) -> int:
+        with self.lock:
+            return self.versions.get(entity_id, 0)
+
+
+entity_versions = EntityVersions()
+
+
+class RecallResultCache:
+    """In-process LRU cache of recall results.
+
+    Entries are keyed by (entity id, hash of the normalized query, limit) and
+    remember the entity version they were computed at, so any fact written
+    to the entity afterwards turns them into misses. The cache holds at most
+    ``config.recall_result_cache_max_entries`` results, each for
+    ``config.recall_result_cache_ttl_seconds``. Setting the size to 0
+    disables caching.
+
+    Results dropped for being stale are kept, up to the same size, as
+    fallbacks that ``get_stale`` can serve when recall misses its deadline.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.entries: OrderedDict[Any, tuple[int, float, list]] = OrderedDict()
+        self.evictions = 0
+        self.fallbacks: OrderedDict[Any, list] = OrderedDict()
+        self.hits = 0
+        self.lock = threading.Lock()
+        self.misses = 0
+
+    @property
+    def max_entries(self) -> int:
+        return self.config.recall_result_cache_max_entries or 0
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.entries)
+
+    @staticmethod
+    def key(entity_id, query: str, limit: int) -> tuple:
+        normalized = " ".join(query.casefold().split())
+        return (
+            entity_id,
+            hashlib.sha256(normalized.encode("utf-8")).hexdigest(),
+            limit,
+        )
+
+    def clear(self) -> "RecallResultCache":
+        with self.lock:
+            self.entries.clear()
+            self.fallbacks.clear()
+        return self
+
+    def get(self, entity_id, query: str, limit: int) -> list | None:
+        if self.max_entries <= 0:
+            return None
+
+        key = self.key(entity_id, query, limit)
+        version = entity_versions.get(entity_id)
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            entry_version, expires_at, facts = entry
+            if entry_version != version or time.monotonic() >= expires_at:
+                del self.entries[key]
+                self.fallbacks[key] = facts
+                self.fallbacks.move_to_end(key)
+                while len(self.fallbacks) > self.max_entries:
+                    self.fallbacks.popitem(last=False)
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return list(facts)
+
+    def put(self, entity_id, query: str, limit: int, facts: list, version: int):
+        """Store a result computed while the entity was at ``version``.
+
+        Callers read the version before searching, so a fact written during
+        the search leaves the entry already stale.
+        """
+        max_entries = self.max_entries
+        if max_entries <= 0:
+            return facts
+
+        expires_at = time.monotonic() + (
+            self.config.recall_result_cache_ttl_seconds or 0
+        )
+
+        with self.lock:
+            key = self.key(entity_id, query, limit)
+            self.entries[key] = (version, expires_at, list(facts))
+            self.entries.move_to_end(key)
+            self.fallbacks.pop(key, None)
+
+            while len(self.entries) > max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+        return facts
+
+    def get_stale(self, entity_id, query: str, limit: int) -> list | None:
+        """Return the last result stored for the key, however old.
+
+        Ignores the entity version and TTL and does not count as a hit or a
+        miss.
+        """
+        key = self.key(entity_id, query, limit)
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                return list(entry[2])
+
+            facts = self.fallbacks.get(key)
+            return list(facts) if facts is not None else None
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "evictions": self.evictions,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class EntityGraphCache:
+    """In-process LRU cache of per-entity knowledge graph adjacency.
+
+    Entries hold an ``EntityGraph`` together with the entity version it was
+    loaded at, so a graph or fact write to the entity makes the next recall
+    reload it. At most ``config.recall_graph.cache_max_entities`` graphs are
+    kept, each for ``config.recall_graph.cache_ttl_seconds``.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.entries: OrderedDict[Any, tuple[int, float, Any]] = OrderedDict()
+        self.evictions = 0
+        self.hits = 0
+        self.lock = threading.Lock()
+        self.misses = 0
+
+    @property
+    def max_entries(self) -> int:
+        return self.config.recall_graph.cache_max_entities or 0
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.entries)
+
+    def clear(self) -> "EntityGraphCache":
+        with self.lock:
+            self.entries.clear()
+        return self
+
+    def get(self, entity_id):
+        if self.max_entries <= 0:
+            return None
+
+        version = entity_versions.get(entity_id)
+
+        with self.lock:
+            entry = self.entries.get(entity_id)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            entry_version, expires_at, graph = entry
+            if entry_version != version or time.monotonic() >= expires_at:
+                del self.entries[entity_id]
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(entity_id)
+            self.hits += 1
+            return graph
+
+    def put(self, entity_id, graph, version: int):
+        max_entries = self.max_entries
+        if max_entries <= 0:
+            return graph
+
+        expires_at = time.monotonic() + (
+            self.config.recall_graph.cache_ttl_seconds or 0
+        )
+
+        with self.lock:
+            self.entries[entity_id] = (version, expires_at, graph)
+            self.entries.move_to_end(entity_id)
+
+            while len(self.entries) > max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+        return graph
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "evictions": self.evictions,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
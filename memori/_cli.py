@@ -8,8 +8,6 @@ r"""
                        memorilabs.ai
 """
 
-import pyfiglet
-
 from memori._config import Config
 
 
@@ -18,6 +16,8 @@ class Cli:
         self.config = config
 
     def banner(self):
+        import pyfiglet
+
         self.print(pyfiglet.figlet_format("Memori", font="standard").rstrip())
         self.print(" " * 18 + "perfectam memoriam")
         self.print(" " * 23 + "memorilabs.ai")
@@ -12,6 +12,9 @@ import os
 from concurrent.futures import ThreadPoolExecutor
 from importlib.metadata import version
 
+from memori._cache import EntityGraphCache, EntityIndexCache, RecallResultCache
+from memori._metrics import Counters
+
 
 class Cache:
     def __init__(self):
@@ -26,10 +29,78 @@ class Storage:
         self.cockroachdb = False
 
 
+class RecallAnn:
+    def __init__(self):
+        self.embeddings_limit = 1_000_000
+        self.enabled = False
+        self.hnsw_ef_search = 64
+        self.hnsw_min_facts = 20_000
+        self.ivfpq_min_facts = 250_000
+        self.ivfpq_nprobe_divisor = 16
+        self.rescore_factor = 4
+
+
+class RecallGraph:
+    def __init__(self):
+        self.cache_max_entities = 256
+        self.cache_ttl_seconds = 300
+        self.enabled = False
+        self.max_edges = 10_000
+        self.max_facts = 5
+        self.max_fan_out = 5
+        self.max_hops = 2
+
+
+class RecallLexical:
+    def __init__(self):
+        self.candidates = 200
+        self.enabled = False
+        self.rrf_k = 60
+
+
+class RecallPrefilter:
+    def __init__(self):
+        self.candidates = 256
+        self.embeddings_limit = 1_000_000
+        self.enabled = False
+
+
+class EmbeddingsBatching:
+    def __init__(self):
+        self.enabled = False
+        self.max_batch_size = 64
+        self.max_wait_seconds = 0.005
+
+
+class EmbeddingsOnnx:
+    def __init__(self):
+        self.enabled = False
+        self.file_name = "onnx/model.onnx"
+        self.intra_op_num_threads = None
+        self.quantize = False
+
+
+class EmbeddingsProcessPool:
+    def __init__(self):
+        self.enabled = False
+        self.workers = 2
+
+
+class EmbeddingsStore:
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+
+
 class Embeddings:
     def __init__(self):
         self.model = "all-MiniLM-L6-v2"
         self.fallback_dimension = 768
+        self.storage_dtype = "float32"
+        self.batching = EmbeddingsBatching()
+        self.onnx = EmbeddingsOnnx()
+        self.process_pool = EmbeddingsProcessPool()
+        self.store = EmbeddingsStore()
 
 
 class Config:
@@ -45,9 +116,32 @@ class Config:
         self.entity_id = None
         self.process_id = None
         self.raise_final_request_attempt = True
+        self.recall_ann = RecallAnn()
+        self.recall_candidate_policy = "frequent"
+        self.recall_deadline_seconds = None
         self.recall_embeddings_limit = 1000
         self.recall_facts_limit = 5
+        self.recall_fetch_content = False
+        self.recall_graph = RecallGraph()
+        self.recall_graph_cache = EntityGraphCache(self)
+        self.recall_index_cache = EntityIndexCache(self)
+        self.recall_index_cache_max_bytes = 0
+        self.recall_lexical = RecallLexical()
+        self.recall_metrics = Counters(
+            "deadline_misses", "deadline_stale_results", "deadline_empty_results"
+        )
+        self.recall_native_vector = False
+        self.recall_prefetch = False
+        self.recall_prefilter = RecallPrefilter()
         self.recall_relevance_threshold = 0.1
+        self.recall_rescore_factor = 0
+        self.recall_rescore_max_candidates = 64
+        self.recall_result_cache = RecallResultCache(self)
+        self.recall_result_cache_max_entries = 0
+        self.recall_result_cache_ttl_seconds = 300
+        self.recall_thread_pool_executor = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="memori-recall"
+        )
         self.request_backoff_factor = 1
         self.request_num_backoff = 5
         self.request_secs_timeout = 5
@@ -0,0 +1,179 @@
+r"""
+ __  __                           _
+|  \/  | ___ _ __ ___   ___  _ __(_)
+| |\/| |/ _ \ '_ ` _ \ / _ \| '__| |
+| |  | |  __/ | | | | | (_) | |  | |
+|_|  |_|\___|_| |_| |_|\___/|_|  |_|
+                  perfectam memoriam
+                       memorilabs.ai
+"""
+
+import re
+
+from memori._cache import entity_versions
+
+
+def _node_key(name) -> str:
+    return " ".join(str(name).casefold().split())
+
+
+class EntityGraph:
+    """Adjacency lists of one entity's knowledge graph.
+
+    Nodes are subject and object names, normalized so that the same name used
+    as a subject in one triple and an object in another is a single node.
+    Each node lists the edges it takes part in, strongest first, in the order
+    the driver returned them.
+    """
+
+    def __init__(self, edges: list):
+        self.adjacency: dict[str, list[int]] = {}
+        self.edges: list[tuple[str, str, str]] = []
+
+        for edge in edges:
+            subject, predicate, obj = (
+                edge["subject_name"],
+                edge["predicate"],
+                edge["object_name"],
+            )
+            index = len(self.edges)
+            self.edges.append((subject, predicate, obj))
+
+            subject_key, object_key = _node_key(subject), _node_key(obj)
+            self.adjacency.setdefault(subject_key, []).append(index)
+            if object_key != subject_key:
+                self.adjacency.setdefault(object_key, []).append(index)
+
+    def __len__(self) -> int:
+        return len(self.edges)
+
+    def seeds(self, text: str) -> list[str]:
+        """Nodes whose name appears as whole words in ``text``."""
+        text = " ".join(text.casefold().split())
+        return [
+            key
+            for key in self.adjacency
+            if key
+            and key in text
+            and re.search(rf"(?<!\w){re.escape(key)}(?!\w)", text) is not None
+        ]
+
+    def expand(
+        self, seeds: dict[str, float], max_hops: int, max_fan_out: int, max_facts: int
+    ) -> list[tuple[str, int, float]]:
+        """Walk the graph breadth-first from ``seeds``.
+
+        ``seeds`` maps node keys to the similarity of the fact that matched
+        them. Every node follows at most ``max_fan_out`` of its edges per hop.
+        Returns (triple text, hop, similarity of the originating fact) for at
+        most ``max_facts`` edges.
+        """
+        facts: list[tuple[str, int, float]] = []
+        if max_facts <= 0:
+            return facts
+
+        visited = dict(seeds)
+        frontier = sorted(seeds, key=seeds.__getitem__, reverse=True)
+        seen_edges: set[int] = set()
+
+        for hop in range(1, max_hops + 1):
+            next_frontier = []
+            for node in frontier:
+                similarity = visited[node]
+                for index in self.adjacency.get(node, [])[:max_fan_out]:
+                    if index in seen_edges:
+                        continue
+                    seen_edges.add(index)
+
+                    subject, predicate, obj = self.edges[index]
+                    facts.append((f"{subject} {predicate} {obj}", hop, similarity))
+                    if len(facts) >= max_facts:
+                        return facts
+
+                    for neighbor in (_node_key(subject), _node_key(obj)):
+                        if neighbor not in visited:
+                            visited[neighbor] = similarity
+                            next_frontier.append(neighbor)
+
+            if not next_frontier:
+                break
+            frontier = next_frontier
+
+        return facts
+
+
+def load_entity_graph(
+    knowledge_graph_driver, entity_id: int, graph_config, graph_cache=None
+) -> EntityGraph:
+    graph = graph_cache.get(entity_id) if graph_cache is not None else None
+    if graph is not None:
+        return graph
+
+    version = entity_versions.get(entity_id)
+    graph = EntityGraph(
+        knowledge_graph_driver.get_edges(entity_id, graph_config.max_edges)
+    )
+
+    if graph_cache is not None:
+        graph_cache.put(entity_id, graph, version)
+
+    return graph
+
+
+def expand_facts_with_graph(
+    knowledge_graph_driver,
+    entity_id: int,
+    facts: list[dict],
+    graph_config,
+    graph_cache=None,
+) -> list[dict]:
+    """Append knowledge graph facts reachable from recalled facts.
+
+    Subjects and objects named in the recalled facts seed a bounded walk over
+    the entity's knowledge graph. Each edge reached becomes a fact with the
+    content "subject predicate object", no id, the number of ``hops`` it took
+    and the similarity of the recalled fact it was reached from. Facts whose
+    content was already recalled are skipped.
+    """
+    if not facts or graph_config is None or not graph_config.enabled:
+        return facts
+
+    try:
+        graph = load_entity_graph(
+            knowledge_graph_driver, entity_id, graph_config, graph_cache
+        )
+    except NotImplementedError:
+        return facts
+
+    if not len(graph):
+        return facts
+
+    seeds: dict[str, float] = {}
+    for fact in facts:
+        similarity = float(fact.get("similarity", 0.0))
+        for key in graph.seeds(fact["content"]):
+            seeds[key] = max(seeds.get(key, similarity), similarity)
+
+    if not seeds:
+        return facts
+
+    known = {_node_key(fact["content"]) for fact in facts}
+    expanded = list(facts)
+    for content, hops, similarity in graph.expand(
+        seeds,
+        graph_config.max_hops,
+        graph_config.max_fan_out,
+        graph_config.max_facts + len(facts),
+    ):
+        key = _node_key(content)
+        if key in known:
+            continue
+        known.add(key)
+
+        expanded.append(
+            {"id": None, "content": content, "similarity": similarity, "hops": hops}
+        )
+        if len(expanded) - len(facts) >= graph_config.max_facts:
+            break
+
+    return expanded
@@ -0,0 +1,32 @@
+r"""
+ __  __                           _
+|  \/  | ___ _ __ ___   ___  _ __(_)
+| |\/| |/ _ \ '_ ` _ \ / _ \| '__| |
+| |  | |  __/ | | | | | (_) | |  | |
+|_|  |_|\___|_| |_| |_|\___/|_|  |_|
+                  perfectam memoriam
+                       memorilabs.ai
+"""
+
+import threading
+
+
+class Counters:
+    """Thread-safe named counters, read with ``stats()``."""
+
+    def __init__(self, *names: str):
+        self.counts = dict.fromkeys(names, 0)
+        self.lock = threading.Lock()
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + value
+
+    def reset(self) -> "Counters":
+        with self.lock:
+            self.counts = dict.fromkeys(self.counts, 0)
+        return self
+
+    def stats(self) -> dict:
+        with self.lock:
+            return dict(self.counts)
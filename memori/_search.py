@@ -9,33 +9,652 @@ r"""
 """
 
 import json
+import threading
+from concurrent.futures import Future
 from typing import Any
 
-import faiss
 import numpy as np
 
+# Quantized embeddings start with a 4-byte little-endian marker that reads as
+# a float32 NaN, which never occurs in a real float32 embedding.
+EMBEDDING_MARKER_FLOAT16 = 0x7FC04D01
+EMBEDDING_MARKER_INT8 = 0x7FC04D02
+EMBEDDING_STORAGE_DTYPES = ("float32", "float16", "int8")
+
+
+def encode_embedding(embedding, dtype: str = "float32") -> bytes:
+    """Encode an embedding for storage.
+
+    float32 is stored as raw little-endian floats (4 bytes per dimension).
+    float16 is stored as a marker followed by half floats (2 bytes per
+    dimension). int8 is stored as a marker, a float32 scale and one signed
+    byte per dimension, with value = q * scale.
+    """
+    vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+
+    if dtype == "float32":
+        return vector.astype("<f4", copy=False).tobytes()
+
+    if dtype == "float16":
+        return (
+            np.uint32(EMBEDDING_MARKER_FLOAT16).astype("<u4").tobytes()
+            + vector.astype("<f2").tobytes()
+        )
+
+    if dtype == "int8":
+        peak = float(np.abs(vector).max()) if vector.size else 0.0
+        scale = peak / 127.0 if peak > 0.0 else 1.0
+        quantized = np.clip(np.rint(vector / scale), -127, 127).astype(np.int8)
+        return (
+            np.uint32(EMBEDDING_MARKER_INT8).astype("<u4").tobytes()
+            + np.float32(scale).astype("<f4").tobytes()
+            + quantized.tobytes()
+        )
+
+    raise ValueError(
+        f"Unsupported embedding dtype: {dtype}. "
+        f"Supported dtypes: {list(EMBEDDING_STORAGE_DTYPES)}."
+    )
+
+
+def _decode_embedding_bytes(raw) -> np.ndarray:
+    if len(raw) >= 4:
+        marker = int(np.frombuffer(raw, dtype="<u4", count=1)[0])
+        if marker == EMBEDDING_MARKER_FLOAT16:
+            return np.frombuffer(raw, dtype="<f2", offset=4).astype(np.float32)
+        if marker == EMBEDDING_MARKER_INT8:
+            scale = np.frombuffer(raw, dtype="<f4", count=1, offset=4)[0]
+            return np.frombuffer(raw, dtype=np.int8, offset=8) * scale
+
+    return np.frombuffer(raw, dtype="<f4")
+
 
 def parse_embedding(raw) -> np.ndarray:
     """Parse embedding from database format to numpy array.
 
     Handles multiple storage formats:
-    - Binary (BYTEA/BLOB/BinData): Most common, used by all databases
+    - Binary (BYTEA/BLOB/BinData): Most common, used by all databases.
+      float16 and int8 embeddings are recognized by their marker and
+      dequantized to float32
     - JSON string: Legacy format
     - Native array: Fallback
     """
     if isinstance(raw, bytes | memoryview):
-        return np.frombuffer(raw, dtype="<f4")
+        return _decode_embedding_bytes(raw)
     elif isinstance(raw, str):
         # Legacy JSON format
         return np.array(json.loads(raw), dtype=np.float32)
     else:
         # Try to extract bytes from bson.Binary or other wrappers
         if hasattr(raw, "__bytes__"):
-            return np.frombuffer(bytes(raw), dtype="<f4")
+            return _decode_embedding_bytes(bytes(raw))
         # Fallback to native array (MongoDB array format)
         return np.asarray(raw, dtype=np.float32)
 
 
+def _embedding_bytes(raw) -> bytes:
+    try:
+        parsed = parse_embedding(raw)
+    except Exception:
+        return b""
+
+    if parsed.ndim != 1:
+        return b""
+
+    return parsed.astype("<f4", copy=False).tobytes()
+
+
+def pack_embeddings(ids: list, raws: list) -> dict:
+    """Pack raw embeddings into the bulk format returned by get_embeddings_bulk.
+
+    The result holds the row ids, the byte size of every embedding and a single
+    contiguous buffer with all embeddings concatenated in row order. Binary
+    embeddings, including quantized ones, are joined without decoding them;
+    legacy JSON or native array rows are converted to little-endian float32
+    first and malformed rows are packed as zero-length entries so they are
+    filtered out on decode.
+    """
+    if not all(isinstance(raw, bytes | memoryview) for raw in raws):
+        raws = [
+            raw if isinstance(raw, bytes | memoryview) else _embedding_bytes(raw)
+            for raw in raws
+        ]
+
+    return {
+        "ids": list(ids),
+        "sizes": list(map(len, raws)),
+        "buffer": b"".join(raws),
+    }
+
+
+def pack_embedding_rows(rows, with_content: bool = False) -> dict:
+    """Pack get_embeddings rows (id, content_embedding) into the bulk format.
+
+    With ``with_content`` the rows also carry the fact content, which is
+    returned as a ``contents`` list aligned with ``ids``.
+    """
+    bulk = pack_embeddings(
+        [row["id"] for row in rows], [row["content_embedding"] for row in rows]
+    )
+    if with_content:
+        bulk["contents"] = [row["content"] for row in rows]
+    return bulk
+
+
+def _code_bytes(raw) -> bytes | memoryview:
+    if raw is None:
+        return b""
+    if isinstance(raw, bytes | memoryview):
+        return raw
+    if hasattr(raw, "read"):
+        return raw.read()
+    return bytes(raw)
+
+
+def pack_code_rows(rows) -> dict:
+    """Pack (id, content_embedding_code) rows into the bulk format.
+
+    Facts stored before binary codes existed have no code and are packed as
+    zero-length entries.
+    """
+    codes = [_code_bytes(row["content_embedding_code"]) for row in rows]
+
+    return {
+        "ids": [row["id"] for row in rows],
+        "sizes": list(map(len, codes)),
+        "buffer": b"".join(codes),
+    }
+
+
+def decode_embeddings_bulk(bulk: dict, dim: int) -> tuple[list, np.ndarray | None]:
+    """View a packed embeddings buffer as an (N, dim) float32 matrix.
+
+    When every row is a float32 embedding of the expected dimension the buffer
+    is reinterpreted in place without copying. Otherwise float32, float16 and
+    int8 rows are gathered into a new matrix with vectorized indexing, and rows
+    of the wrong size are dropped.
+    """
+    if not bulk or not bulk.get("ids") or dim == 0:
+        return [], None
+
+    sizes = np.asarray(bulk["sizes"], dtype=np.int64)
+    buffer = np.frombuffer(bulk["buffer"], dtype=np.uint8)
+    offsets = np.zeros(len(sizes), dtype=np.int64)
+    np.cumsum(sizes[:-1], out=offsets[1:])
+
+    markers = np.zeros(len(sizes), dtype=np.uint32)
+    has_marker = sizes >= 4
+    if has_marker.any():
+        marker_bytes = buffer[offsets[has_marker, None] + np.arange(4)]
+        markers[has_marker] = marker_bytes.view("<u4").reshape(-1)
+
+    is_float16 = (markers == EMBEDDING_MARKER_FLOAT16) & (sizes == 4 + dim * 2)
+    is_int8 = (markers == EMBEDDING_MARKER_INT8) & (sizes == 8 + dim)
+    is_float32 = (
+        (sizes == dim * 4)
+        & (markers != EMBEDDING_MARKER_FLOAT16)
+        & (markers != EMBEDDING_MARKER_INT8)
+    )
+
+    if is_float32.all():
+        return list(bulk["ids"]), buffer.view("<f4").reshape(-1, dim)
+
+    keep = np.flatnonzero(is_float32 | is_float16 | is_int8)
+    if len(keep) == 0:
+        return [], None
+
+    matrix = np.empty((len(keep), dim), dtype=np.float32)
+    position = np.empty(len(sizes), dtype=np.int64)
+    position[keep] = np.arange(len(keep))
+
+    rows = np.flatnonzero(is_float32)
+    if len(rows):
+        matrix[position[rows]] = buffer[offsets[rows, None] + np.arange(dim * 4)].view(
+            "<f4"
+        )
+
+    rows = np.flatnonzero(is_float16)
+    if len(rows):
+        matrix[position[rows]] = buffer[
+            offsets[rows, None] + 4 + np.arange(dim * 2)
+        ].view("<f2")
+
+    rows = np.flatnonzero(is_int8)
+    if len(rows):
+        scales = buffer[offsets[rows, None] + 4 + np.arange(4)].view("<f4")
+        quantized = buffer[offsets[rows, None] + 8 + np.arange(dim)].view(np.int8)
+        matrix[position[rows]] = quantized * scales
+
+    ids = bulk["ids"]
+    return [ids[i] for i in keep], matrix
+
+
+def _parse_embeddings(
+    embeddings: list[tuple[Any, Any]], dim: int
+) -> tuple[list, np.ndarray | None]:
+    """Parse raw embeddings into a float32 matrix, skipping malformed rows.
+
+    Rows that cannot be parsed or whose dimension differs from ``dim`` are
+    dropped so a single bad row never fails the whole recall.
+    """
+    if not embeddings:
+        return [], None
+
+    ids, raws = zip(*embeddings, strict=True)
+    return decode_embeddings_bulk(pack_embeddings(list(ids), list(raws)), dim)
+
+
+ANN_HNSW_M = 32
+ANN_IVFPQ_NBITS = 8
+ANN_IVFPQ_SUBQUANTIZERS = (64, 48, 32, 24, 16, 8)
+
+
+def _ann_kind(count: int, ann_config) -> str | None:
+    if ann_config is None or not ann_config.enabled:
+        return None
+    if count >= ann_config.ivfpq_min_facts:
+        return "ivfpq"
+    if count >= ann_config.hnsw_min_facts:
+        return "hnsw"
+    return None
+
+
+def _faiss():
+    # faiss is imported on first use so that importing memori stays cheap.
+    import faiss
+
+    return faiss
+
+
+def _build_ann_index(kind: str, vectors: np.ndarray, ann_config):
+    faiss = _faiss()
+    dim = vectors.shape[1]
+
+    if kind == "ivfpq":
+        m = next((m for m in ANN_IVFPQ_SUBQUANTIZERS if dim % m == 0), None)
+        if m is not None:
+            nlist = max(1, int(4 * np.sqrt(len(vectors))))
+            quantizer = faiss.IndexFlatIP(dim)
+            index = faiss.IndexIVFPQ(
+                quantizer, dim, nlist, m, ANN_IVFPQ_NBITS, faiss.METRIC_INNER_PRODUCT
+            )
+            index.train(vectors)  # type: ignore[call-arg]
+            index.add(vectors)  # type: ignore[call-arg]
+            index.nprobe = max(1, nlist // ann_config.ivfpq_nprobe_divisor)
+            return index, len(vectors) * (m + 8)
+
+    index = faiss.IndexHNSWSQ(
+        dim, faiss.ScalarQuantizer.QT_8bit, ANN_HNSW_M, faiss.METRIC_INNER_PRODUCT
+    )
+    index.train(vectors)  # type: ignore[call-arg]
+    index.add(vectors)  # type: ignore[call-arg]
+    index.hnsw.efSearch = ann_config.hnsw_ef_search
+    return index, len(vectors) * (dim + ANN_HNSW_M * 8)
+
+
+class EntityIndex:
+    """Normalized fact vectors for a single entity.
+
+    Instances are kept in the recall index cache so that repeated recalls for
+    the same entity search an already built FAISS index instead of re-parsing
+    and re-normalizing every embedding. Rows can be appended incrementally as
+    new facts are written.
+
+    The exact ``IndexFlatIP`` is always kept as the source of truth. Large
+    entities can additionally get an approximate index (HNSW or IVF-PQ) built
+    in the background; once it is ready it generates candidates which are then
+    rescored exactly against the flat vectors, so similarities stay cosine.
+
+    When built from a bulk fetched with content, the index also keeps every
+    fact's content so recall can answer without another database query.
+    """
+
+    def __init__(self, dim: int):
+        self.ann = None
+        self.ann_future: Future | None = None
+        self.ann_kind: str | None = None
+        self.ann_nbytes = 0
+        self.ann_rescore_factor = 1
+        self.ann_size = 0
+        self.contents: dict | None = None
+        self.contents_nbytes = 0
+        self.dim = dim
+        self.ids: list = []
+        self.index = _faiss().IndexFlatIP(dim)
+        self.lock = threading.Lock()
+        self.positions: dict = {}
+        self.positions_size = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            len(self.ids) * (self.dim * 4 + 8) + self.ann_nbytes + self.contents_nbytes
+        )
+
+    def add(
+        self, ids: list, vectors: np.ndarray, contents: list | None = None
+    ) -> "EntityIndex":
+        if not ids:
+            return self
+
+        vectors = np.array(vectors, dtype=np.float32, copy=True)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            return self
+
+        _faiss().normalize_L2(vectors)
+
+        with self.lock:
+            self.index.add(vectors)  # type: ignore[call-arg]
+            if self.ann is not None:
+                self.ann.add(vectors)  # type: ignore[call-arg]
+            self.ids.extend(ids)
+            if contents is not None:
+                self._add_contents(ids, contents)
+
+        return self
+
+    def add_contents(self, ids: list, contents: list) -> "EntityIndex":
+        with self.lock:
+            self._add_contents(ids, contents)
+        return self
+
+    def _add_contents(self, ids: list, contents: list) -> None:
+        if self.contents is None:
+            self.contents = {}
+        for fact_id, content in zip(ids, contents, strict=True):
+            if fact_id not in self.contents:
+                self.contents[fact_id] = content
+                self.contents_nbytes += len(content) + 8
+
+    def build_ann(self, ann_config, executor) -> Future | None:
+        """Schedule a background (re)build of the approximate index.
+
+        A build is started when the entity crosses one of the configured size
+        thresholds, or when it has doubled in size since the last build so
+        that IVF centroids stay representative.
+        """
+        kind = _ann_kind(len(self), ann_config)
+        if kind is None or executor is None:
+            return None
+
+        with self.lock:
+            if self.ann_future is not None and not self.ann_future.done():
+                return None
+            if (
+                self.ann is not None
+                and kind == self.ann_kind
+                and len(self.ids) < 2 * self.ann_size
+            ):
+                return None
+
+            self.ann_future = executor.submit(self._build_ann, kind, ann_config)
+            return self.ann_future
+
+    def search(
+        self, query_embedding: list[float], limit: int
+    ) -> list[tuple[Any, float]]:
+        return self.search_many([query_embedding], limit)[0]
+
+    def search_many(
+        self, query_embeddings: list[list[float]], limit: int
+    ) -> list[list[tuple[Any, float]]]:
+        """Search the index for several queries with one (nq, d) FAISS call."""
+        empty: list[list[tuple[Any, float]]] = [[] for _ in query_embeddings]
+        if len(query_embeddings) == 0:
+            return empty
+
+        query_array = np.array(query_embeddings, dtype=np.float32)
+        if query_array.ndim != 2 or query_array.shape[1] != self.dim:
+            return empty
+
+        _faiss().normalize_L2(query_array)
+
+        with self.lock:
+            if self.index.ntotal == 0:
+                return empty
+
+            k = min(limit, self.index.ntotal)
+            if self.ann is not None:
+                similarities, indices = self._search_ann(query_array, k)
+            else:
+                similarities, indices = self.index.search(query_array, k)  # type: ignore[call-arg]
+            id_list = self.ids
+
+        return [
+            [
+                (id_list[embedding_idx], float(similarity))
+                for embedding_idx, similarity in zip(
+                    row_indices, row_similarities, strict=True
+                )
+                if 0 <= embedding_idx < len(id_list)
+            ]
+            for row_indices, row_similarities in zip(indices, similarities, strict=True)
+        ]
+
+    def similarities(self, query_embedding: list[float], ids: list) -> dict:
+        """Exact cosine similarity of the query to the given rows.
+
+        Ids that are not part of the index are left out of the result.
+        """
+        query = np.array([query_embedding], dtype=np.float32)
+        if query.shape[1] != self.dim or not ids:
+            return {}
+
+        _faiss().normalize_L2(query)
+
+        with self.lock:
+            for position in range(self.positions_size, len(self.ids)):
+                self.positions.setdefault(self.ids[position], position)
+            self.positions_size = len(self.ids)
+            found = [fact_id for fact_id in ids if fact_id in self.positions]
+            if not found:
+                return {}
+            vectors = np.vstack(
+                [self.index.reconstruct(self.positions[fact_id]) for fact_id in found]
+            )
+
+        return {
+            fact_id: float(similarity)
+            for fact_id, similarity in zip(found, vectors @ query[0], strict=True)
+        }
+
+    def _build_ann(self, kind: str, ann_config) -> None:
+        with self.lock:
+            size = self.index.ntotal
+            vectors = self.index.reconstruct_n(0, size)
+
+        ann, ann_nbytes = _build_ann_index(kind, vectors, ann_config)
+
+        with self.lock:
+            if self.index.ntotal > size:
+                ann.add(self.index.reconstruct_n(size, self.index.ntotal - size))  # type: ignore[call-arg]
+
+            self.ann = ann
+            self.ann_kind = kind
+            self.ann_nbytes = ann_nbytes
+            self.ann_rescore_factor = ann_config.rescore_factor
+            self.ann_size = size
+
+    def _search_ann(self, query_array: np.ndarray, k: int):
+        candidates = min(k * self.ann_rescore_factor, self.index.ntotal)
+        _, candidate_indices = self.ann.search(query_array, candidates)  # type: ignore[union-attr]
+
+        similarities = np.zeros((len(query_array), k), dtype=np.float32)
+        indices = np.full((len(query_array), k), -1, dtype=np.int64)
+        for row, row_candidates in enumerate(candidate_indices):
+            row_candidates = row_candidates[row_candidates >= 0]
+            if len(row_candidates) == 0:
+                continue
+
+            exact = self.index.reconstruct_batch(row_candidates) @ query_array[row]
+            order = np.argsort(-exact)[:k]
+            similarities[row, : len(order)] = exact[order]
+            indices[row, : len(order)] = row_candidates[order]
+
+        return similarities, indices
+
+
+def build_entity_index(
+    embeddings: list[tuple[Any, Any]], dim: int
+) -> EntityIndex | None:
+    """Build an EntityIndex from (id, embedding_raw) tuples.
+
+    Returns None when no embedding matches the requested dimension.
+    """
+    if dim == 0:
+        return None
+
+    id_list, embeddings_array = _parse_embeddings(embeddings, dim)
+    if embeddings_array is None:
+        return None
+
+    return EntityIndex(dim).add(id_list, embeddings_array)
+
+
+def build_entity_index_from_bulk(bulk: dict, dim: int) -> EntityIndex | None:
+    """Build an EntityIndex from the packed get_embeddings_bulk format."""
+    id_list, embeddings_array = decode_embeddings_bulk(bulk, dim)
+    if embeddings_array is None:
+        return None
+
+    contents = None
+    if bulk.get("contents") is not None:
+        content_map = dict(zip(bulk["ids"], bulk["contents"], strict=True))
+        contents = [content_map[fact_id] for fact_id in id_list]
+
+    return EntityIndex(dim).add(id_list, embeddings_array, contents)
+
+
+def binary_codes(vectors) -> np.ndarray:
+    """Sign-bit codes of float vectors, one bit per dimension packed into bytes."""
+    return np.packbits(np.asarray(vectors, dtype=np.float32) > 0, axis=-1)
+
+
+def encode_binary_code(embedding) -> bytes:
+    """Encode the sign-bit code stored next to a fact's embedding."""
+    if len(embedding) == 0:
+        return b""
+
+    return binary_codes(embedding).tobytes()
+
+
+class BinaryEntityIndex:
+    """Sign-bit codes of fact vectors for a single entity.
+
+    Stage one of prefiltered recall: every fact is scored by Hamming distance
+    between its code and the query's with ``IndexBinaryFlat``, which costs
+    d/8 bytes per fact instead of 4*d. Full vectors are not kept; the best
+    candidates are fetched by id and rescored exactly.
+    """
+
+    def __init__(self, dim: int):
+        self.code_size = (dim + 7) // 8
+        self.dim = dim
+        self.ids: list = []
+        self.index = _faiss().IndexBinaryFlat(self.code_size * 8)
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.ids) * (self.code_size + 8)
+
+    def add(
+        self, ids: list, vectors: np.ndarray, contents: list | None = None
+    ) -> "BinaryEntityIndex":
+        """Add the codes of ``vectors``; ``contents`` is accepted so the index
+        can stand in for an EntityIndex, but is not kept."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not ids or vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            return self
+
+        return self.add_codes(ids, binary_codes(vectors))
+
+    def add_codes(self, ids: list, codes: np.ndarray) -> "BinaryEntityIndex":
+        if not ids:
+            return self
+
+        codes = np.ascontiguousarray(codes, dtype=np.uint8)
+
+        with self.lock:
+            self.index.add(codes)  # type: ignore[call-arg]
+            self.ids.extend(ids)
+
+        return self
+
+    def build_ann(self, ann_config, executor) -> Future | None:
+        return None
+
+    def candidates(self, query_embedding: list[float], k: int) -> list:
+        if len(query_embedding) != self.dim:
+            return []
+
+        query_code = binary_codes([query_embedding])
+
+        with self.lock:
+            if self.index.ntotal == 0:
+                return []
+
+            _, indices = self.index.search(query_code, min(k, self.index.ntotal))  # type: ignore[call-arg]
+            id_list = self.ids
+
+        return [id_list[i] for i in indices[0] if 0 <= i < len(id_list)]
+
+
+def build_binary_entity_index_from_bulk(
+    bulk: dict, dim: int
+) -> tuple[BinaryEntityIndex, list]:
+    """Build a BinaryEntityIndex from the packed get_embedding_codes_bulk format.
+
+    Returns the index and the ids of facts stored without a code of the
+    expected size (written before codes existed), which the caller has to add
+    from their full embeddings.
+    """
+    index = BinaryEntityIndex(dim)
+
+    sizes = np.asarray(bulk["sizes"], dtype=np.int64)
+    buffer = np.frombuffer(bulk["buffer"], dtype=np.uint8)
+    keep = sizes == index.code_size
+    ids = bulk["ids"]
+
+    if keep.all():
+        index.add_codes(list(ids), buffer.reshape(-1, index.code_size))
+        return index, []
+
+    if keep.any():
+        index.add_codes(
+            [ids[i] for i in np.flatnonzero(keep)],
+            buffer[np.repeat(keep, sizes)].reshape(-1, index.code_size),
+        )
+
+    return index, [ids[i] for i in np.flatnonzero(~keep)]
+
+
+def _get_embeddings_by_ids(
+    entity_fact_driver, fact_ids: list, dim: int, chunk_size: int = 500
+) -> tuple[list, np.ndarray | None]:
+    id_list: list = []
+    matrices = []
+    for start in range(0, len(fact_ids), chunk_size):
+        rows = entity_fact_driver.get_embeddings_by_ids(
+            fact_ids[start : start + chunk_size]
+        )
+        ids, vectors = decode_embeddings_bulk(pack_embedding_rows(rows), dim)
+        if vectors is not None:
+            id_list.extend(ids)
+            matrices.append(vectors)
+
+    if not matrices:
+        return [], None
+
+    return id_list, np.vstack(matrices)
+
+
 def find_similar_embeddings(
     embeddings: list[tuple[int, Any]],
     query_embedding: list[float],
@@ -54,51 +673,164 @@ def find_similar_embeddings(
     if not embeddings:
         return []
 
-    query_dim = len(query_embedding)
-    if query_dim == 0:
+    index = build_entity_index(embeddings, len(query_embedding))
+    if index is None:
         return []
 
-    embeddings_list = []
-    id_list = []
+    return index.search(query_embedding, limit)
 
-    for fact_id, raw in embeddings:
-        try:
-            parsed = parse_embedding(raw)
-            if parsed.ndim != 1 or parsed.shape[0] != query_dim:
-                continue
-            embeddings_list.append(parsed)
-            id_list.append(fact_id)
-        except Exception:
-            continue
 
-    if not embeddings_list:
-        return []
+def refresh_entity_index(
+    index_cache,
+    entity_fact_driver,
+    entity_id: int,
+    facts: list,
+    fact_embeddings: list | None,
+) -> None:
+    """Append newly written facts to a cached EntityIndex or BinaryEntityIndex.
 
-    try:
-        embeddings_array = np.stack(embeddings_list, axis=0)
-    except ValueError:
-        return []
+    Called after the DB writer commits ``entity_fact.create``. Only entities
+    that are already cached are touched, and facts whose row is already part
+    of the index (upserts of existing facts) are skipped.
+    """
+    if (
+        index_cache is None
+        or not facts
+        or fact_embeddings is None
+        or len(fact_embeddings) == 0
+    ):
+        return
+
+    index = index_cache.peek(entity_id)
+    if index is None:
+        return
 
-    faiss.normalize_L2(embeddings_array)
-    query_array = np.asarray([query_embedding], dtype=np.float32)
+    from memori._utils import generate_uniq
 
-    if embeddings_array.shape[1] != query_array.shape[1]:
+    uniq_to_embedding = {}
+    uniq_to_fact = {}
+    for fact, embedding in zip(facts, fact_embeddings, strict=False):
+        uniq = generate_uniq([fact])
+        uniq_to_embedding[uniq] = embedding
+        uniq_to_fact[uniq] = fact
+
+    rows = entity_fact_driver.get_ids_by_uniqs(entity_id, list(uniq_to_embedding))
+    if not rows:
+        return
+
+    with index.lock:
+        known_ids = set(index.ids)
+
+    new_rows = [
+        row
+        for row in rows
+        if row["id"] not in known_ids and row["uniq"] in uniq_to_embedding
+    ]
+    if not new_rows:
+        return
+
+    id_list, embeddings_array = _parse_embeddings(
+        [(row["id"], uniq_to_embedding[row["uniq"]]) for row in new_rows], index.dim
+    )
+    if embeddings_array is None:
+        return
+
+    contents = None
+    if isinstance(index, EntityIndex) and index.contents is not None:
+        content_map = {row["id"]: uniq_to_fact[row["uniq"]] for row in new_rows}
+        contents = [content_map[fact_id] for fact_id in id_list]
+
+    index_cache.append(entity_id, id_list, embeddings_array, contents)
+
+    config = index_cache.config
+    index.build_ann(config.recall_ann, config.thread_pool_executor)
+
+
+def rescore_facts(
+    facts: list[dict], query_embedding, fact_embeddings, limit: int
+) -> list[dict]:
+    """Re-rank candidate facts by exact cosine similarity.
+
+    Used after a coarse search over quantized embeddings: ``fact_embeddings``
+    holds full-precision embeddings of the candidates' content, in the same
+    order as ``facts``.
+    """
+    if not facts:
         return []
 
-    faiss.normalize_L2(query_array)
+    matrix = np.asarray(fact_embeddings, dtype=np.float32)
+    query = np.asarray(query_embedding, dtype=np.float32)
 
-    index = faiss.IndexFlatIP(embeddings_array.shape[1])
-    index.add(embeddings_array)  # type: ignore[call-arg]
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    scores = np.divide(
+        matrix @ query,
+        norms,
+        out=np.zeros(len(facts), dtype=np.float32),
+        where=norms > 0,
+    )
+    order = np.argsort(-scores, kind="stable")[:limit]
 
-    k = min(limit, len(embeddings_array))
-    similarities, indices = index.search(query_array, k)  # type: ignore[call-arg]
+    return [{**facts[i], "similarity": float(scores[i])} for i in order]
 
-    results = []
-    for result_idx, embedding_idx in enumerate(indices[0]):
-        if embedding_idx >= 0 and embedding_idx < len(id_list):
-            results.append((id_list[embedding_idx], float(similarities[0][result_idx])))
 
-    return results
+def load_entity_index(
+    entity_fact_driver,
+    entity_id: int,
+    embeddings_limit: int,
+    index_cache=None,
+    candidate_policy: str = "frequent",
+    fetch_content: bool = False,
+    dim: int | None = None,
+) -> EntityIndex | None:
+    """Return the entity's EntityIndex, loading and caching it on a miss.
+
+    Without ``dim`` any cached index is accepted and a new one takes the
+    dimension of the first stored embedding, which lets the index be warmed
+    before the first query is embedded.
+    """
+    index = index_cache.get(entity_id) if index_cache is not None else None
+    if (
+        not isinstance(index, EntityIndex)
+        or (dim is not None and index.dim != dim)
+        or (fetch_content and index.contents is None)
+    ):
+        if fetch_content:
+            bulk = entity_fact_driver.get_embeddings_bulk(
+                entity_id, embeddings_limit, policy=candidate_policy, with_content=True
+            )
+        else:
+            bulk = entity_fact_driver.get_embeddings_bulk(
+                entity_id, embeddings_limit, policy=candidate_policy
+            )
+
+        if not bulk or not bulk.get("ids"):
+            return None
+
+        if dim is None:
+            dim = _bulk_dimension(bulk)
+
+        index = build_entity_index_from_bulk(bulk, dim)
+        if index is None:
+            return None
+
+        if index_cache is not None:
+            index_cache.put(entity_id, index)
+
+    if index_cache is not None:
+        config = index_cache.config
+        index.build_ann(config.recall_ann, config.thread_pool_executor)
+
+    return index
+
+
+def _bulk_dimension(bulk: dict) -> int:
+    offset = 0
+    for size in bulk["sizes"]:
+        if size:
+            return len(parse_embedding(bytes(bulk["buffer"][offset : offset + size])))
+        offset += size
+
+    return 0
 
 
 def search_entity_facts(
@@ -107,45 +839,385 @@ def search_entity_facts(
     query_embedding: list[float],
     limit: int,
     embeddings_limit: int,
+    index_cache=None,
+    native_vector: bool = False,
+    prefilter=None,
+    candidate_policy: str = "frequent",
+    fetch_content: bool = False,
+    query_text: str | None = None,
+    lexical=None,
 ) -> list[dict]:
     """Search entity facts by embedding similarity.
 
     Args:
-        entity_fact_driver: Driver instance with get_embeddings and get_facts_by_ids methods
+        entity_fact_driver: Driver instance with get_embeddings_bulk and get_facts_by_ids methods
         entity_id: Entity ID to search within
         query_embedding: Query embedding as list of floats
         limit: Number of results to return
         embeddings_limit: Number of embeddings to retrieve from database
+        index_cache: Optional EntityIndexCache used to reuse the entity's index
+            across calls
+        native_vector: Rank facts inside the database with the driver's
+            search_embeddings when it is supported, falling back to client-side
+            scoring otherwise
+        prefilter: Optional RecallPrefilter config; when enabled, facts are
+            first ranked by sign-bit Hamming distance and only the best
+            candidates are fetched and rescored with full vectors
+        candidate_policy: Which facts fill the embeddings limit when the entity
+            has more: "frequent", "recent" or "blended"
+        fetch_content: Load fact content together with the embeddings and keep
+            it in the entity index, so recall needs no second query for it
+        query_text: The query the embedding was computed from, used for the
+            lexical stage
+        lexical: Optional RecallLexical config; when enabled, the driver's
+            full-text search supplies candidates that are fused with the
+            vector ranking by reciprocal rank
 
     Returns:
         List of dicts with keys: id, content, similarity
     """
-    results = entity_fact_driver.get_embeddings(entity_id, embeddings_limit)
+    return search_entity_facts_many(
+        entity_fact_driver,
+        entity_id,
+        [query_embedding],
+        limit,
+        embeddings_limit,
+        index_cache=index_cache,
+        native_vector=native_vector,
+        prefilter=prefilter,
+        candidate_policy=candidate_policy,
+        fetch_content=fetch_content,
+        query_texts=None if query_text is None else [query_text],
+        lexical=lexical,
+    )[0]
 
-    if not results:
-        return []
 
-    embeddings = [(row["id"], row["content_embedding"]) for row in results]
-    similar = find_similar_embeddings(embeddings, query_embedding, limit)
+def search_entity_facts_many(
+    entity_fact_driver,
+    entity_id: int,
+    query_embeddings: list[list[float]],
+    limit: int,
+    embeddings_limit: int,
+    index_cache=None,
+    native_vector: bool = False,
+    prefilter=None,
+    candidate_policy: str = "frequent",
+    fetch_content: bool = False,
+    query_texts: list[str] | None = None,
+    lexical=None,
+) -> list[list[dict]]:
+    """Search entity facts for several queries at once.
+
+    The entity's embeddings are loaded (or taken from the index cache) once,
+    all queries are ranked with a single FAISS search and the contents of
+    every returned fact are resolved with one get_facts_by_ids call, or taken
+    from the index when it was built with ``fetch_content``. Takes
+    the same arguments as search_entity_facts, with a list of query
+    embeddings.
 
-    if not similar:
+    Returns:
+        One list of dicts with keys id, content, similarity per query
+    """
+    if len(query_embeddings) == 0:
         return []
 
-    top_ids = [fact_id for fact_id, _ in similar]
-    similarities_map = dict(similar)
+    lexical_lists = _search_lexical(entity_fact_driver, entity_id, query_texts, lexical)
+    depth = limit if lexical_lists is None else max(limit, lexical.candidates)
+
+    if native_vector:
+        native_results = _search_entity_facts_native(
+            entity_fact_driver, entity_id, query_embeddings, depth
+        )
+        if native_results is not None:
+            if lexical_lists is None:
+                return native_results
+
+            return _facts_with_content(
+                entity_fact_driver,
+                _fuse_lexical(
+                    entity_fact_driver,
+                    [
+                        [(fact["id"], fact["similarity"]) for fact in facts]
+                        for facts in native_results
+                    ],
+                    lexical_lists,
+                    query_embeddings,
+                    limit,
+                    lexical,
+                ),
+                {
+                    fact["id"]: fact["content"]
+                    for facts in native_results
+                    for fact in facts
+                },
+            )
+
+    if prefilter is not None and prefilter.enabled:
+        return _search_entity_facts_prefiltered(
+            entity_fact_driver,
+            entity_id,
+            query_embeddings,
+            limit,
+            prefilter,
+            index_cache,
+            candidate_policy,
+            lexical_lists,
+            lexical,
+        )
+
+    index = load_entity_index(
+        entity_fact_driver,
+        entity_id,
+        embeddings_limit,
+        index_cache,
+        candidate_policy,
+        fetch_content,
+        dim=len(query_embeddings[0]),
+    )
+    if index is None:
+        return [[] for _ in query_embeddings]
+
+    similar_lists = index.search_many(query_embeddings, depth)
+    if lexical_lists is not None:
+        similar_lists = _fuse_lexical(
+            entity_fact_driver,
+            similar_lists,
+            lexical_lists,
+            query_embeddings,
+            limit,
+            lexical,
+            index,
+        )
+
+    return _facts_with_content(entity_fact_driver, similar_lists, index.contents)
+
+
+def _search_entity_facts_native(
+    entity_fact_driver,
+    entity_id: int,
+    query_embeddings: list[list[float]],
+    limit: int,
+) -> list[list[dict]] | None:
+    results = []
+    for query_embedding in query_embeddings:
+        try:
+            rows = entity_fact_driver.search_embeddings(
+                entity_id, query_embedding, limit
+            )
+        except NotImplementedError:
+            rows = None
 
-    content_results = entity_fact_driver.get_facts_by_ids(top_ids)
-    content_map = {row["id"]: row["content"] for row in content_results}
+        if not rows:
+            return None
 
-    facts_with_similarity = []
-    for fact_id in top_ids:
-        if fact_id in content_map:
-            facts_with_similarity.append(
+        results.append(
+            [
                 {
-                    "id": fact_id,
-                    "content": content_map[fact_id],
-                    "similarity": similarities_map[fact_id],
+                    "id": row["id"],
+                    "content": row["content"],
+                    "similarity": float(row["similarity"]),
                 }
+                for row in rows
+            ]
+        )
+
+    return results
+
+
+def _search_entity_facts_prefiltered(
+    entity_fact_driver,
+    entity_id: int,
+    query_embeddings: list[list[float]],
+    limit: int,
+    prefilter,
+    index_cache=None,
+    candidate_policy: str = "frequent",
+    lexical_lists: list[list] | None = None,
+    lexical=None,
+) -> list[list[dict]]:
+    empty: list[list[dict]] = [[] for _ in query_embeddings]
+    query_dim = len(query_embeddings[0])
+
+    index = index_cache.get(entity_id) if index_cache is not None else None
+    if not isinstance(index, BinaryEntityIndex) or index.dim != query_dim:
+        bulk = entity_fact_driver.get_embedding_codes_bulk(
+            entity_id, prefilter.embeddings_limit, policy=candidate_policy
+        )
+        if not bulk or not bulk.get("ids"):
+            return empty
+
+        index, missing_ids = build_binary_entity_index_from_bulk(bulk, query_dim)
+        if missing_ids:
+            index.add(
+                *_get_embeddings_by_ids(entity_fact_driver, missing_ids, query_dim)
+            )
+
+        if index_cache is not None:
+            index_cache.put(entity_id, index)
+
+    candidate_ids = list(
+        dict.fromkeys(
+            fact_id
+            for query_embedding in query_embeddings
+            for fact_id in index.candidates(
+                query_embedding, max(prefilter.candidates, limit)
+            )
+        )
+    )
+    if lexical_lists is not None:
+        candidate_ids = list(
+            dict.fromkeys(
+                candidate_ids
+                + [fact_id for lexical_ids in lexical_lists for fact_id in lexical_ids]
+            )
+        )
+    if not candidate_ids:
+        return empty
+
+    id_list, vectors = _get_embeddings_by_ids(
+        entity_fact_driver, candidate_ids, query_dim
+    )
+    if vectors is None:
+        return empty
+
+    candidates = EntityIndex(query_dim).add(id_list, vectors)
+    if lexical_lists is None:
+        return _facts_with_content(
+            entity_fact_driver, candidates.search_many(query_embeddings, limit)
+        )
+
+    return _facts_with_content(
+        entity_fact_driver,
+        _fuse_lexical(
+            entity_fact_driver,
+            candidates.search_many(query_embeddings, max(limit, lexical.candidates)),
+            lexical_lists,
+            query_embeddings,
+            limit,
+            lexical,
+            candidates,
+        ),
+    )
+
+
+def _search_lexical(
+    entity_fact_driver, entity_id: int, query_texts: list[str] | None, lexical
+) -> list[list] | None:
+    if lexical is None or not lexical.enabled or not query_texts:
+        return None
+
+    lexical_lists = []
+    for query_text in query_texts:
+        try:
+            fact_ids = entity_fact_driver.search_lexical(
+                entity_id, query_text or "", lexical.candidates
+            )
+        except NotImplementedError:
+            fact_ids = None
+
+        if fact_ids is None:
+            return None
+
+        lexical_lists.append(list(fact_ids))
+
+    if not any(lexical_lists):
+        return None
+
+    return lexical_lists
+
+
+def reciprocal_rank_fusion(rankings: list[list], k: int, limit: int) -> list:
+    """Merge ranked id lists by reciprocal rank fusion.
+
+    Each id scores ``1 / (k + rank)`` per list it appears in. Ties keep the
+    order in which ids were first seen, so the first ranking wins them.
+    """
+    scores: dict = {}
+    for ranking in rankings:
+        for rank, fact_id in enumerate(ranking, start=1):
+            scores[fact_id] = scores.get(fact_id, 0.0) + 1.0 / (k + rank)
+
+    return sorted(scores, key=scores.__getitem__, reverse=True)[:limit]
+
+
+def _fuse_lexical(
+    entity_fact_driver,
+    similar_lists: list,
+    lexical_lists: list[list],
+    query_embeddings: list[list[float]],
+    limit: int,
+    lexical,
+    index: EntityIndex | None = None,
+) -> list[list[tuple[Any, float]]]:
+    fused_lists = []
+    for similar, lexical_ids, query_embedding in zip(
+        similar_lists, lexical_lists, query_embeddings, strict=True
+    ):
+        top_ids = reciprocal_rank_fusion(
+            [[fact_id for fact_id, _ in similar], lexical_ids], lexical.rrf_k, limit
+        )
+
+        # Facts found only by the lexical stage still report their cosine
+        # similarity, so the recall relevance threshold applies to them too.
+        similarities = dict(similar)
+        missing_ids = [fact_id for fact_id in top_ids if fact_id not in similarities]
+        if missing_ids and index is not None:
+            similarities.update(index.similarities(query_embedding, missing_ids))
+            missing_ids = [
+                fact_id for fact_id in missing_ids if fact_id not in similarities
+            ]
+        if missing_ids:
+            dim = len(query_embedding)
+            id_list, vectors = _get_embeddings_by_ids(
+                entity_fact_driver, missing_ids, dim
             )
+            if vectors is not None:
+                similarities.update(
+                    EntityIndex(dim)
+                    .add(id_list, vectors)
+                    .similarities(query_embedding, id_list)
+                )
+
+        fused_lists.append(
+            [
+                (fact_id, similarities[fact_id])
+                for fact_id in top_ids
+                if fact_id in similarities
+            ]
+        )
+
+    return fused_lists
+
+
+def _facts_with_content(
+    entity_fact_driver, similar_lists: list, contents: dict | None = None
+) -> list[list[dict]]:
+    top_ids = list(
+        dict.fromkeys(fact_id for similar in similar_lists for fact_id, _ in similar)
+    )
+    if not top_ids:
+        return [[] for _ in similar_lists]
+
+    content_map = {}
+    if contents is not None:
+        content_map = {
+            fact_id: contents[fact_id] for fact_id in top_ids if fact_id in contents
+        }
+
+    missing_ids = [fact_id for fact_id in top_ids if fact_id not in content_map]
+    if missing_ids:
+        content_results = entity_fact_driver.get_facts_by_ids(missing_ids)
+        content_map.update({row["id"]: row["content"] for row in content_results})
 
-    return facts_with_similarity
+    return [
+        [
+            {
+                "id": fact_id,
+                "content": content_map[fact_id],
+                "similarity": similarity,
+            }
+            for fact_id, similarity in similar
+            if fact_id in content_map
+        ]
+        for similar in similar_lists
+    ]
@@ -13,10 +13,9 @@ import copy
 import json
 from typing import TYPE_CHECKING
 
-from google.protobuf import json_format
-
 from memori._config import Config
 from memori._utils import merge_chunk
+from memori.storage._connection import connection_context
 
 if TYPE_CHECKING:
     pass
@@ -129,6 +128,8 @@ class BaseInvoke:
 
     def _format_kwargs(self, kwargs):
         if self._uses_protobuf:
+            from google.protobuf import json_format
+
             if "request" in kwargs:
                 formatted_kwargs = json.loads(
                     json_format.MessageToJson(kwargs["request"].__dict__["_pb"])
@@ -202,6 +203,8 @@ class BaseInvoke:
     def _format_response(self, raw_response):
         formatted_response = copy.deepcopy(raw_response)
         if self._uses_protobuf:
+            from google.protobuf import json_format
+
             if not isinstance(formatted_response, list):
                 if (
                     hasattr(formatted_response, "__dict__")
@@ -274,6 +277,8 @@ class BaseInvoke:
                 return result
 
         if "request" in kwargs:
+            from google.protobuf import json_format
+
             try:
                 formatted_kwargs = json.loads(
                     json_format.MessageToJson(kwargs["request"].__dict__["_pb"])
@@ -383,6 +388,8 @@ class BaseInvoke:
 
     def _inject_google_system_instruction(self, kwargs: dict, context: str):
         """Inject recall context into Google/Gemini system_instruction."""
+        from google.protobuf import json_format
+
         if "request" in kwargs:
             formatted_kwargs = json.loads(
                 json_format.MessageToJson(kwargs["request"].__dict__["_pb"])
@@ -404,6 +411,15 @@ class BaseInvoke:
             else:
                 self._append_to_google_system_instruction_obj(config, context)
 
+    def _recall_query(self, kwargs: dict) -> str | None:
+        if self.config.storage is None or self.config.storage.driver is None:
+            return None
+
+        if self.config.entity_id is None:
+            return None
+
+        return self._extract_user_query(kwargs) or None
+
     def inject_recalled_facts(self, kwargs: dict) -> dict:
         if self.config.storage is None or self.config.storage.driver is None:
             return kwargs
@@ -411,7 +427,10 @@ class BaseInvoke:
         if self.config.entity_id is None:
             return kwargs
 
-        entity_id = self.config.storage.driver.entity.create(self.config.entity_id)
+        from memori.memory.recall import Recall
+
+        recall = Recall(self.config)
+        entity_id = recall.resolve_entity_id()
         if entity_id is None:
             return kwargs
 
@@ -419,10 +438,27 @@ class BaseInvoke:
         if not user_query:
             return kwargs
 
+        facts = recall.search_facts(user_query, entity_id=entity_id)
+
+        return self._inject_recall_context(kwargs, facts)
+
+    async def inject_recalled_facts_async(self, kwargs: dict) -> dict:
+        """Async counterpart of inject_recalled_facts.
+
+        The entity lookup and the recall itself run on the recall executor,
+        on a connection of their own, instead of the caller's event loop.
+        """
+        user_query = self._recall_query(kwargs)
+        if user_query is None:
+            return kwargs
+
         from memori.memory.recall import Recall
 
-        facts = Recall(self.config).search_facts(user_query, entity_id=entity_id)
+        facts = await Recall(self.config).search_facts_async(user_query)
+
+        return self._inject_recall_context(kwargs, facts)
 
+    def _inject_recall_context(self, kwargs: dict, facts: list[dict]) -> dict:
         if not facts:
             return kwargs
 
@@ -466,6 +502,34 @@ class BaseInvoke:
 
         return kwargs
 
+    async def inject_conversation_messages_async(self, kwargs: dict) -> dict:
+        """Async counterpart of inject_conversation_messages.
+
+        The conversation history is read on the recall executor, on a
+        connection of its own, instead of the caller's event loop.
+        """
+        conversation_id = self.config.cache.conversation_id
+        if conversation_id is None:
+            return kwargs
+
+        storage = self.config.storage
+        if storage is None or storage.conn_factory is None:
+            return kwargs
+
+        messages = await asyncio.get_running_loop().run_in_executor(
+            self.config.recall_thread_pool_executor,
+            self._read_conversation_messages,
+            storage.conn_factory,
+            conversation_id,
+        )
+
+        return self._inject_conversation_messages(kwargs, messages)
+
+    @staticmethod
+    def _read_conversation_messages(conn_factory, conversation_id) -> list:
+        with connection_context(conn_factory) as (conn, adapter, driver):
+            return driver.conversation.messages.read(conversation_id)
+
     def inject_conversation_messages(self, kwargs: dict) -> dict:
         if self.config.cache.conversation_id is None:
             return kwargs
@@ -476,6 +540,10 @@ class BaseInvoke:
         messages = self.config.storage.driver.conversation.messages.read(
             self.config.cache.conversation_id
         )
+
+        return self._inject_conversation_messages(kwargs, messages)
+
+    def _inject_conversation_messages(self, kwargs: dict, messages: list) -> dict:
         if not messages:
             return kwargs
 
@@ -520,6 +588,8 @@ class BaseInvoke:
                 contents.append({"parts": [{"text": message["content"]}], "role": role})
 
             if "request" in kwargs:
+                from google.protobuf import json_format
+
                 formatted_kwargs = json.loads(
                     json_format.MessageToJson(kwargs["request"].__dict__["_pb"])
                 )
@@ -700,6 +770,8 @@ class BaseIterator:
 
     def process_chunk(self, chunk):
         if self.invoke._uses_protobuf is True:
+            from google.protobuf import json_format
+
             formatted_chunk = copy.deepcopy(chunk)
             if isinstance(self.raw_response, list):
                 if "_pb" in formatted_chunk.__dict__:
@@ -0,0 +1,171 @@
+r"""
+ __  __                           _
+|  \/  | ___ _ __ ___   ___  _ __(_)
+| |\/| |/ _ \ '_ ` _ \ / _ \| '__| |
+| |  | |  __/ | | | | | (_) | |  | |
+|_|  |_|\___|_| |_| |_|\___/|_|  |_|
+                 perfectam memoriam
+                      memorilabs.ai
+"""
+
+import asyncio
+import atexit
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from memori.llm._embeddings import _encode_array
+
+logger = logging.getLogger(__name__)
+
+SHARED_MEMORY_MIN_BYTES = 64 * 1024
+
+
+def _encode_in_worker(
+    texts: list[str], model: str, fallback_dimension: int, onnx=None
+) -> np.ndarray | tuple[str, tuple[int, ...]]:
+    """Encode ``texts`` in a pool worker.
+
+    Models are cached per worker process. Results of at least
+    SHARED_MEMORY_MIN_BYTES are written to a shared memory block whose name
+    and shape are returned instead of the array; the caller unlinks it.
+    """
+    vectors = _encode_array(texts, model, fallback_dimension, onnx)
+    if vectors.nbytes < SHARED_MEMORY_MIN_BYTES:
+        return vectors
+
+    block = shared_memory.SharedMemory(create=True, size=vectors.nbytes)
+    try:
+        np.ndarray(vectors.shape, dtype=np.float32, buffer=block.buf)[:] = vectors
+    finally:
+        block.close()
+
+    return block.name, vectors.shape
+
+
+def _read_result(result) -> np.ndarray:
+    if isinstance(result, np.ndarray):
+        return result
+
+    name, shape = result
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        return np.ndarray(shape, dtype=np.float32, buffer=block.buf).copy()
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _discard_result(future) -> None:
+    """Unlink the shared memory block of a result nobody awaits any more."""
+    if future.cancelled() or future.exception() is not None:
+        return
+
+    result = future.result()
+    if isinstance(result, np.ndarray):
+        return
+
+    block = shared_memory.SharedMemory(name=result[0])
+    block.close()
+    block.unlink()
+
+
+class EmbeddingProcessPool:
+    """Process pool that encodes embeddings outside the calling process.
+
+    Workers are spawned on first use, so tokenization and pre/post-processing
+    do not contend for the GIL with the caller's threads. Each worker loads a
+    model once and keeps it. Changing the worker count replaces the pool;
+    ``shutdown`` stops the workers and also runs at interpreter exit.
+    """
+
+    def __init__(self):
+        self.executor: ProcessPoolExecutor | None = None
+        self.lock = threading.Lock()
+        self.workers = 0
+
+    def get_executor(self, workers: int) -> ProcessPoolExecutor:
+        with self.lock:
+            if self.executor is not None and self.workers != workers:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = None
+
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                self.workers = workers
+
+            return self.executor
+
+    def _reset(self, executor: ProcessPoolExecutor) -> None:
+        with self.lock:
+            if self.executor is executor:
+                self.executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def embed(
+        self,
+        texts: list[str],
+        model: str,
+        fallback_dimension: int,
+        workers: int,
+        onnx=None,
+    ) -> np.ndarray:
+        executor = self.get_executor(workers)
+        try:
+            result = executor.submit(
+                _encode_in_worker, texts, model, fallback_dimension, onnx
+            ).result()
+        except BrokenProcessPool as e:
+            logger.warning(f"Embedding process pool failed, encoding in-process: {e}")
+            self._reset(executor)
+            return _encode_array(texts, model, fallback_dimension, onnx)
+
+        return _read_result(result)
+
+    async def embed_async(
+        self,
+        texts: list[str],
+        model: str,
+        fallback_dimension: int,
+        workers: int,
+        onnx=None,
+    ) -> np.ndarray:
+        executor = self.get_executor(workers)
+        loop = asyncio.get_running_loop()
+        try:
+            future = executor.submit(
+                _encode_in_worker, texts, model, fallback_dimension, onnx
+            )
+            try:
+                result = await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                future.add_done_callback(_discard_result)
+                raise
+        except BrokenProcessPool as e:
+            logger.warning(f"Embedding process pool failed, encoding in-process: {e}")
+            self._reset(executor)
+            return await loop.run_in_executor(
+                None, _encode_array, texts, model, fallback_dimension, onnx
+            )
+
+        return _read_result(result)
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self.lock:
+            executor, self.executor = self.executor, None
+            self.workers = 0
+
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+embedding_process_pool = EmbeddingProcessPool()
+atexit.register(embedding_process_pool.shutdown)
@@ -0,0 +1,197 @@
+r"""
+ __  __                           _
+|  \/  | ___ _ __ ___   ___  _ __(_)
+| |\/| |/ _ \ '_ ` _ \ / _ \| '__| |
+| |  | |  __/ | | | | | (_) | |  | |
+|_|  |_|\___|_| |_| |_|\___/|_|  |_|
+                 perfectam memoriam
+                      memorilabs.ai
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+INDEX_RECORD = struct.Struct("<32sQI")
+
+
+def default_store_path() -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache_home, "memori", "embeddings")
+
+
+class _ModelFiles:
+    """The vector and index files holding one model's embeddings.
+
+    ``.vec`` is an append-only file of little-endian float32 vectors, read
+    through a memory map. ``.idx`` is an append log of (text digest, offset,
+    dimension) records pointing into it. A vector is written before its
+    index record, so readers never see a record for a partial vector.
+    """
+
+    def __init__(self, base: Path):
+        self.index: dict[bytes, tuple[int, int]] = {}
+        self.index_offset = 0
+        self.index_path = base.with_suffix(".idx")
+        self.map: mmap.mmap | None = None
+        self.map_size = 0
+        self.vectors_path = base.with_suffix(".vec")
+
+    def refresh(self) -> None:
+        """Read index records appended since the last refresh, by any process."""
+        try:
+            with open(self.index_path, "rb") as f:
+                f.seek(self.index_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        usable = len(data) - len(data) % INDEX_RECORD.size
+        for digest, offset, dim in INDEX_RECORD.iter_unpack(data[:usable]):
+            self.index[digest] = (offset, dim)
+        self.index_offset += usable
+
+    def read(self, digest: bytes) -> np.ndarray | None:
+        location = self.index.get(digest)
+        if location is None:
+            return None
+
+        offset, dim = location
+        end = offset + dim * 4
+        if self.map is None or self.map_size < end:
+            with open(self.vectors_path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < end:
+                    return None
+                if self.map is not None:
+                    self.map.close()
+                self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self.map_size = size
+
+        return np.frombuffer(self.map, dtype="<f4", count=dim, offset=offset).copy()
+
+    def append(self, records: list[tuple[bytes, np.ndarray]]) -> None:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(self.index_path, "ab") as index_file:
+            if fcntl is not None:
+                fcntl.flock(index_file.fileno(), fcntl.LOCK_EX)
+
+            # Drop a record torn by a writer that died mid-append.
+            size = os.fstat(index_file.fileno()).st_size
+            if size % INDEX_RECORD.size:
+                index_file.truncate(size - size % INDEX_RECORD.size)
+
+            self.refresh()
+            records = [
+                (digest, vector)
+                for digest, vector in dict(records).items()
+                if digest not in self.index
+            ]
+            if not records:
+                return
+
+            entries = []
+            payload = bytearray()
+            with open(self.vectors_path, "ab") as vectors_file:
+                offset = vectors_file.seek(0, os.SEEK_END)
+                for digest, vector in records:
+                    entries.append((digest, offset + len(payload), vector.size))
+                    payload += vector.astype("<f4", copy=False).tobytes()
+                vectors_file.write(payload)
+
+            index_file.write(b"".join(INDEX_RECORD.pack(*entry) for entry in entries))
+            index_file.flush()
+
+            for digest, offset, dim in entries:
+                self.index[digest] = (offset, dim)
+            self.index_offset += len(entries) * INDEX_RECORD.size
+
+
+class EmbeddingStore:
+    """Content-addressed embedding store on disk.
+
+    Embeddings are keyed by model and the SHA-256 of the exact text, so a
+    text is embedded once per host no matter how many entities or processes
+    write it. Each model has its own vector file and index (see _ModelFiles)
+    under ``path``. Writers serialize on a lock of the index file.
+    """
+
+    def __init__(self, path: str):
+        self.files: dict[str, _ModelFiles] = {}
+        self.hits = 0
+        self.lock = threading.Lock()
+        self.misses = 0
+        self.path = Path(path)
+
+    def _files(self, model: str) -> _ModelFiles:
+        files = self.files.get(model)
+        if files is None:
+            name = hashlib.sha256(model.encode("utf-8")).hexdigest()[:32]
+            files = self.files[model] = _ModelFiles(self.path / name)
+            files.refresh()
+        return files
+
+    @staticmethod
+    def digest(text: str) -> bytes:
+        return hashlib.sha256(text.encode("utf-8")).digest()
+
+    def get_many(self, model: str, texts: list[str]) -> list[np.ndarray | None]:
+        digests = [self.digest(text) for text in texts]
+
+        with self.lock:
+            files = self._files(model)
+            if any(digest not in files.index for digest in digests):
+                files.refresh()
+
+            vectors = [files.read(digest) for digest in digests]
+            found = sum(vector is not None for vector in vectors)
+            self.hits += found
+            self.misses += len(vectors) - found
+            return vectors
+
+    def put_many(self, model: str, texts: list[str], embeddings) -> None:
+        records = [
+            (self.digest(text), np.asarray(embedding, dtype=np.float32))
+            for text, embedding in zip(texts, embeddings, strict=True)
+        ]
+        if not records:
+            return
+
+        with self.lock:
+            self._files(model).append(records)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "entries": sum(len(files.index) for files in self.files.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_STORES: dict[str, EmbeddingStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def open_embedding_store(store_config) -> EmbeddingStore | None:
+    """Return the process-wide EmbeddingStore for ``store_config``, if enabled."""
+    if store_config is None or not store_config.enabled:
+        return None
+
+    path = os.path.abspath(store_config.path or default_store_path())
+    with _STORES_LOCK:
+        store = _STORES.get(path)
+        if store is None:
+            store = _STORES[path] = EmbeddingStore(path)
+        return store
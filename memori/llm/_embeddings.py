@@ -9,22 +9,280 @@ r"""
 """
 
 import asyncio
+import hashlib
 import os
-import struct
+import threading
+import time
+from collections import OrderedDict, deque
 from collections.abc import Iterable
+from concurrent.futures import Future
 from typing import Any
 
+import numpy as np
+
+from memori.llm._embedding_store import open_embedding_store
+
 os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
 
-from sentence_transformers import SentenceTransformer
+_MODEL_CACHE: dict[str, Any] = {}
+_MODEL_LOCKS: dict[str, threading.Lock] = {}
+_MODEL_LOCKS_LOCK = threading.Lock()
+
+
+class QueryEmbeddingCache:
+    """Thread-safe LRU cache of query embeddings.
+
+    Entries are keyed by model name and a SHA-256 of the text, and hold the
+    embedding as a float32 array. Shared by every Recall in the process, so
+    the same query embedded by retries, fallbacks or tool loops is encoded
+    once. A second instance holds the fact contents recall rescores. Setting
+    ``max_entries`` to 0 disables caching.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.entries: OrderedDict[tuple[str, str], np.ndarray] = OrderedDict()
+        self.evictions = 0
+        self.hits = 0
+        self.lock = threading.Lock()
+        self.max_entries = max_entries
+        self.misses = 0
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.entries)
+
+    @staticmethod
+    def key(model: str, text: str) -> tuple[str, str]:
+        return model, hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def clear(self) -> "QueryEmbeddingCache":
+        with self.lock:
+            self.entries.clear()
+        return self
+
+    def get(self, model: str, text: str) -> np.ndarray | None:
+        key = self.key(model, text)
+
+        with self.lock:
+            vector = self.entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, model: str, text: str, embedding) -> None:
+        if self.max_entries <= 0:
+            return
+
+        vector = np.array(embedding, dtype=np.float32)
+        vector.flags.writeable = False
+        key = self.key(model, text)
+
+        with self.lock:
+            self.entries[key] = vector
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "evictions": self.evictions,
+                "hits": self.hits,
+                "misses": self.misses,
+                "nbytes": sum(vector.nbytes for vector in self.entries.values()),
+            }
+
+
+query_embedding_cache = QueryEmbeddingCache()
+rescore_embedding_cache = QueryEmbeddingCache()
+
+
+class _EmbeddingRequest:
+    __slots__ = (
+        "fallback_dimension",
+        "future",
+        "max_batch_size",
+        "max_wait_seconds",
+        "model",
+        "onnx",
+        "texts",
+    )
+
+    def __init__(
+        self,
+        texts,
+        model,
+        fallback_dimension,
+        max_batch_size,
+        max_wait_seconds,
+        onnx=None,
+    ):
+        self.fallback_dimension = fallback_dimension
+        self.future: Future = Future()
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self.model = model
+        self.onnx = onnx
+        self.texts = texts
+
+    def key(self) -> tuple[str, int]:
+        return _model_key(self.model, self.onnx), self.fallback_dimension
+
+
+class EmbeddingScheduler:
+    """Coalesces concurrent embed_texts calls into shared encode batches.
+
+    Callers queue their texts and wait on a future. A single worker thread
+    takes the oldest request, waits up to its ``max_wait_seconds`` for other
+    requests for the same model, then encodes up to ``max_batch_size`` texts
+    in one call, each distinct text once. Requests that do not fit wait for
+    the next batch. The worker is started on first use and is a daemon.
+    """
+
+    def __init__(self):
+        self.batches = 0
+        self.condition = threading.Condition()
+        self.pending: deque[_EmbeddingRequest] = deque()
+        self.requests = 0
+        self.texts = 0
+        self.worker: threading.Thread | None = None
+
+    def submit(
+        self,
+        texts: list[str],
+        model: str,
+        fallback_dimension: int,
+        max_batch_size: int,
+        max_wait_seconds: float,
+        onnx=None,
+    ) -> Future:
+        request = _EmbeddingRequest(
+            texts, model, fallback_dimension, max_batch_size, max_wait_seconds, onnx
+        )
+
+        with self.condition:
+            self.pending.append(request)
+            if self.worker is None or not self.worker.is_alive():
+                self.worker = threading.Thread(
+                    target=self._run, name="memori-embed", daemon=True
+                )
+                self.worker.start()
+            self.condition.notify()
+
+        return request.future
 
-_MODEL_CACHE: dict[str, SentenceTransformer] = {}
+    def _pending_size(self, key: tuple[str, int]) -> int:
+        return sum(len(r.texts) for r in self.pending if r.key() == key)
 
+    def _next_batch(self) -> list[_EmbeddingRequest]:
+        with self.condition:
+            while not self.pending:
+                self.condition.wait()
 
-def _get_model(model_name: str) -> SentenceTransformer:
-    if model_name not in _MODEL_CACHE:
-        _MODEL_CACHE[model_name] = SentenceTransformer(model_name)
-    return _MODEL_CACHE[model_name]
+            first = self.pending[0]
+            key = first.key()
+            deadline = time.monotonic() + first.max_wait_seconds
+            while self._pending_size(key) < first.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+
+            batch: list[_EmbeddingRequest] = []
+            rest: deque[_EmbeddingRequest] = deque()
+            size = 0
+            for request in self.pending:
+                if request.key() == key and (
+                    not batch or size + len(request.texts) <= first.max_batch_size
+                ):
+                    batch.append(request)
+                    size += len(request.texts)
+                else:
+                    rest.append(request)
+            self.pending = rest
+
+            self.batches += 1
+            self.requests += len(batch)
+            self.texts += size
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            first = batch[0]
+            texts = list(dict.fromkeys(text for r in batch for text in r.texts))
+
+            try:
+                vectors = _encode_array(
+                    texts, first.model, first.fallback_dimension, first.onnx
+                )
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+
+            rows = {text: row for row, text in enumerate(texts)}
+            for request in batch:
+                request.future.set_result(
+                    vectors[[rows[text] for text in request.texts]]
+                )
+
+    def stats(self) -> dict:
+        with self.condition:
+            return {
+                "batches": self.batches,
+                "pending": len(self.pending),
+                "requests": self.requests,
+                "texts": self.texts,
+            }
+
+
+embedding_scheduler = EmbeddingScheduler()
+
+
+def _model_key(model_name: str, onnx=None) -> str:
+    if onnx is None or not onnx.enabled:
+        return model_name
+
+    quantized = ":qint8" if onnx.quantize else ""
+    return f"{model_name}@onnx:{onnx.file_name}{quantized}"
+
+
+def _sentence_transformer() -> Any:
+    # sentence_transformers pulls in torch and transformers, so it is imported
+    # on first use rather than with this module.
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer
+
+
+def _get_model(model_name: str, onnx=None) -> Any:
+    key = _model_key(model_name, onnx)
+    model = _MODEL_CACHE.get(key)
+    if model is not None:
+        return model
+
+    # One lock per model, so a warmup racing the first recall loads it once
+    # while other models can still load concurrently.
+    with _MODEL_LOCKS_LOCK:
+        lock = _MODEL_LOCKS.setdefault(key, threading.Lock())
+
+    with lock:
+        if key not in _MODEL_CACHE:
+            if key == model_name:
+                _MODEL_CACHE[key] = _sentence_transformer()(model_name)
+            else:
+                from memori.llm._onnx import load_onnx_encoder
+
+                _MODEL_CACHE[key] = load_onnx_encoder(model_name, onnx)
+        return _MODEL_CACHE[key]
 
 
 def _prepare_text_inputs(texts: str | Iterable[str]) -> list[str]:
@@ -41,13 +299,22 @@ def _embedding_dimension(model: Any, default: int) -> int:
         return default
 
 
-def _zero_vectors(count: int, dim: int) -> list[list[float]]:
-    return [[0.0] * dim for _ in range(count)]
+def _zero_array(count: int, dim: int) -> np.ndarray:
+    return np.zeros((count, dim), dtype=np.float32)
+
 
+def format_embedding_for_db(embedding, dialect: str, dtype: str = "float32") -> Any:
+    """Serialize ``embedding``, a float32 array or a list of floats.
 
-def format_embedding_for_db(embedding: list[float], dialect: str) -> Any:
-    binary_data = struct.pack(f"<{len(embedding)}f", *embedding)
+    float32 arrays, such as the rows returned by embed_texts_array, are
+    written with a single ``tobytes`` copy.
+    """
+    from memori._search import encode_embedding
 
+    return format_binary_for_db(encode_embedding(embedding, dtype), dialect)
+
+
+def format_binary_for_db(binary_data: bytes, dialect: str) -> Any:
     if dialect == "mongodb":
         try:
             import bson
@@ -58,23 +325,76 @@ def format_embedding_for_db(embedding: list[float], dialect: str) -> Any:
     return binary_data
 
 
+def format_embedding_code_for_db(embedding: list[float], dialect: str) -> Any:
+    if len(embedding) == 0:
+        return None
+
+    from memori._search import encode_binary_code
+
+    return format_binary_for_db(encode_binary_code(embedding), dialect)
+
+
+def format_embedding_for_vector(embedding) -> str:
+    return "[" + ",".join(str(float(value)) for value in embedding) + "]"
+
+
 def embed_texts(
     texts: str | list[str],
     model: str,
     fallback_dimension: int,
+    batching=None,
+    onnx=None,
 ) -> list[list[float]]:
+    """embed_texts_array, returned as lists of Python floats."""
+    return embed_texts_array(texts, model, fallback_dimension, batching, onnx).tolist()
+
+
+def embed_texts_array(
+    texts: str | list[str],
+    model: str,
+    fallback_dimension: int,
+    batching=None,
+    onnx=None,
+) -> np.ndarray:
+    """Encode ``texts`` with ``model`` into a (len(texts), dim) float32 array.
+
+    With ``batching`` enabled, calls with fewer than its ``max_batch_size``
+    texts are encoded together with concurrent calls by embedding_scheduler.
+    With ``onnx`` enabled, the model runs through onnxruntime instead of
+    PyTorch.
+    """
     inputs = _prepare_text_inputs(texts)
     if not inputs:
-        return []
+        return _zero_array(0, fallback_dimension)
+
+    if (
+        batching is not None
+        and batching.enabled
+        and len(inputs) < batching.max_batch_size
+    ):
+        return embedding_scheduler.submit(
+            inputs,
+            model,
+            fallback_dimension,
+            batching.max_batch_size,
+            batching.max_wait_seconds,
+            onnx,
+        ).result()
 
+    return _encode_array(inputs, model, fallback_dimension, onnx)
+
+
+def _encode_array(
+    inputs: list[str], model: str, fallback_dimension: int, onnx=None
+) -> np.ndarray:
     try:
-        encoder = _get_model(model)
+        encoder = _get_model(model, onnx)
     except (OSError, RuntimeError, ValueError):
-        return _zero_vectors(len(inputs), fallback_dimension)
+        return _zero_array(len(inputs), fallback_dimension)
 
     try:
         embeddings = encoder.encode(inputs, convert_to_numpy=True)
-        return embeddings.tolist()
+        return np.asarray(embeddings, dtype=np.float32)
     except ValueError as e:
         # Some models can raise "all input arrays must have the same shape" when
         # encoding batches. Retry one-by-one to avoid internal stacking.
@@ -82,30 +402,229 @@ def embed_texts(
             raise
 
         try:
-            vectors: list[list[float]] = []
-            for text in inputs:
-                single = encoder.encode([text], convert_to_numpy=True)
-                vectors.append(single[0].tolist())
+            vectors = [
+                np.asarray(encoder.encode([text], convert_to_numpy=True)[0])
+                for text in inputs
+            ]
 
             dim_set = {len(v) for v in vectors}
             if len(dim_set) != 1:
                 raise ValueError("all input arrays must have the same shape") from e
 
-            return vectors
+            return np.vstack(vectors).astype(np.float32, copy=False)
         except Exception:
             dim = _embedding_dimension(encoder, default=fallback_dimension)
-            return _zero_vectors(len(inputs), dim)
+            return _zero_array(len(inputs), dim)
     except RuntimeError:
         dim = _embedding_dimension(encoder, default=fallback_dimension)
-        return _zero_vectors(len(inputs), dim)
+        return _zero_array(len(inputs), dim)
+
+
+def embed_queries(
+    texts: str | list[str],
+    model: str,
+    fallback_dimension: int,
+    batching=None,
+    onnx=None,
+) -> list[list[float]]:
+    """embed_queries_array, returned as lists of Python floats."""
+    return embed_queries_array(
+        texts, model, fallback_dimension, batching, onnx
+    ).tolist()
+
+
+def embed_queries_array(
+    texts: str | list[str],
+    model: str,
+    fallback_dimension: int,
+    batching=None,
+    onnx=None,
+) -> np.ndarray:
+    """embed_texts_array for recall queries, served from query_embedding_cache.
+
+    Only texts missing from the cache are encoded, in a single batch.
+    Fallback zero vectors returned when the model is unavailable are not
+    cached.
+    """
+    return _embed_cached(
+        texts, model, fallback_dimension, batching, onnx, query_embedding_cache
+    )
+
+
+def embed_rescore_array(
+    texts: str | list[str],
+    model: str,
+    fallback_dimension: int,
+    batching=None,
+    onnx=None,
+    store=None,
+) -> np.ndarray:
+    """embed_texts_array for the fact contents recall rescores.
+
+    Served from rescore_embedding_cache and, with ``store`` enabled, from the
+    on-disk EmbeddingStore, so a fact that keeps ranking among the
+    candidates is encoded once rather than on every recall.
+    """
+    return _embed_cached(
+        texts,
+        model,
+        fallback_dimension,
+        batching,
+        onnx,
+        rescore_embedding_cache,
+        open_embedding_store(store),
+    )
+
+
+def _embed_cached(
+    texts: str | list[str],
+    model: str,
+    fallback_dimension: int,
+    batching,
+    onnx,
+    cache: QueryEmbeddingCache,
+    embedding_store=None,
+) -> np.ndarray:
+    inputs = _prepare_text_inputs(texts)
+    if not inputs or not all(inputs):
+        return embed_texts_array(texts, model, fallback_dimension, batching, onnx)
+
+    model_key = _model_key(model, onnx)
+    vectors: list = [cache.get(model_key, text) for text in inputs]
+    missing = list(
+        dict.fromkeys(
+            text for text, vector in zip(inputs, vectors, strict=True) if vector is None
+        )
+    )
+
+    if missing and embedding_store is not None:
+        found = dict(
+            zip(missing, embedding_store.get_many(model_key, missing), strict=True)
+        )
+        for text, embedding in found.items():
+            if embedding is not None:
+                cache.put(model_key, text, embedding)
+
+        vectors = [
+            found.get(text) if vector is None else vector
+            for text, vector in zip(inputs, vectors, strict=True)
+        ]
+        missing = [text for text in missing if found[text] is None]
+
+    if missing:
+        encoded = dict(
+            zip(
+                missing,
+                embed_texts_array(missing, model, fallback_dimension, batching, onnx),
+                strict=False,
+            )
+        )
+        stored = [text for text, embedding in encoded.items() if embedding.any()]
+        for text in stored:
+            cache.put(model_key, text, encoded[text])
+        if embedding_store is not None and stored:
+            embedding_store.put_many(model_key, stored, [encoded[t] for t in stored])
+
+        vectors = [
+            encoded[text] if vector is None else vector
+            for text, vector in zip(inputs, vectors, strict=True)
+        ]
+
+    return np.vstack(vectors)
 
 
 async def embed_texts_async(
     texts: str | list[str],
     model: str,
     fallback_dimension: int,
+    batching=None,
+    onnx=None,
+    process_pool=None,
+    store=None,
 ) -> list[list[float]]:
+    """embed_texts_array_async, returned as lists of Python floats."""
+    embeddings = await embed_texts_array_async(
+        texts, model, fallback_dimension, batching, onnx, process_pool, store
+    )
+    return embeddings.tolist()
+
+
+async def embed_texts_array_async(
+    texts: str | list[str],
+    model: str,
+    fallback_dimension: int,
+    batching=None,
+    onnx=None,
+    process_pool=None,
+    store=None,
+) -> np.ndarray:
+    """embed_texts_array off the event loop.
+
+    With ``process_pool`` enabled, texts are encoded by
+    embedding_process_pool workers instead of a thread of this process. With
+    ``store`` enabled, texts already in the on-disk EmbeddingStore are not
+    encoded again, and newly encoded ones are added to it. Fallback zero
+    vectors are not stored.
+    """
+    embedding_store = open_embedding_store(store)
+    if embedding_store is None:
+        return await _encode_async(
+            texts, model, fallback_dimension, batching, onnx, process_pool
+        )
+
+    inputs = _prepare_text_inputs(texts)
+    if not inputs:
+        return _zero_array(0, fallback_dimension)
+
+    model_key = _model_key(model, onnx)
+    vectors: list = embedding_store.get_many(model_key, inputs)
+    missing = list(
+        dict.fromkeys(
+            text for text, vector in zip(inputs, vectors, strict=True) if vector is None
+        )
+    )
+
+    if missing:
+        encoded = dict(
+            zip(
+                missing,
+                await _encode_async(
+                    missing, model, fallback_dimension, batching, onnx, process_pool
+                ),
+                strict=False,
+            )
+        )
+        stored = [text for text, embedding in encoded.items() if embedding.any()]
+        embedding_store.put_many(model_key, stored, [encoded[t] for t in stored])
+
+        vectors = [
+            encoded[text] if vector is None else vector
+            for text, vector in zip(inputs, vectors, strict=True)
+        ]
+
+    return np.vstack(vectors)
+
+
+async def _encode_async(
+    texts: str | list[str],
+    model: str,
+    fallback_dimension: int,
+    batching=None,
+    onnx=None,
+    process_pool=None,
+) -> np.ndarray:
+    if process_pool is not None and process_pool.enabled:
+        inputs = _prepare_text_inputs(texts)
+        if not inputs:
+            return _zero_array(0, fallback_dimension)
+
+        from memori.llm._embedding_pool import embedding_process_pool
+
+        return await embedding_process_pool.embed_async(
+            inputs, model, fallback_dimension, process_pool.workers, onnx
+        )
+
     loop = asyncio.get_event_loop()
     return await loop.run_in_executor(
-        None, embed_texts, texts, model, fallback_dimension
+        None, embed_texts_array, texts, model, fallback_dimension, batching, onnx
     )
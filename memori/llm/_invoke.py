@@ -12,9 +12,6 @@ import inspect
 import time
 from collections.abc import AsyncIterator, Iterator
 
-from botocore.eventstream import EventStream
-from grpc.experimental.aio import UnaryStreamCall
-
 from memori._utils import merge_chunk
 from memori.llm._base import BaseInvoke
 from memori.llm._iterable import Iterable as MemoriIterable
@@ -43,6 +40,8 @@ class Invoke(BaseInvoke):
         elif client_is_bedrock(
             self.config.framework.provider, self.config.llm.provider
         ):
+            from botocore.eventstream import EventStream
+
             if isinstance(raw_response["body"], EventStream):
                 raw_response["body"] = (
                     MemoriIterable(self.config, raw_response["body"])
@@ -66,8 +65,10 @@ class InvokeAsync(BaseInvoke):
     async def invoke(self, **kwargs):
         start = time.time()
 
-        kwargs = self.inject_conversation_messages(
-            self.inject_recalled_facts(self.configure_for_streaming_usage(kwargs))
+        kwargs = await self.inject_conversation_messages_async(
+            await self.inject_recalled_facts_async(
+                self.configure_for_streaming_usage(kwargs)
+            )
         )
 
         raw_response = await self._method(**kwargs)
@@ -79,11 +80,16 @@ class InvokeAsyncIterator(BaseInvoke):
     async def invoke(self, **kwargs):
         start = time.time()
 
-        kwargs = self.inject_conversation_messages(
-            self.inject_recalled_facts(self.configure_for_streaming_usage(kwargs))
+        kwargs = await self.inject_conversation_messages_async(
+            await self.inject_recalled_facts_async(
+                self.configure_for_streaming_usage(kwargs)
+            )
         )
 
         raw_response = await self._method(**kwargs)
+
+        from grpc.experimental.aio import UnaryStreamCall
+
         if isinstance(raw_response, AsyncIterator) or isinstance(
             raw_response, UnaryStreamCall
         ):
@@ -101,8 +107,10 @@ class InvokeAsyncStream(BaseInvoke):
     async def invoke(self, **kwargs):
         start = time.time()
 
-        kwargs = self.inject_conversation_messages(
-            self.inject_recalled_facts(self.configure_for_streaming_usage(kwargs))
+        kwargs = await self.inject_conversation_messages_async(
+            await self.inject_recalled_facts_async(
+                self.configure_for_streaming_usage(kwargs)
+            )
         )
 
         stream = await self._method(**kwargs)
@@ -119,8 +127,10 @@ class InvokeStream(BaseInvoke):
     async def invoke(self, **kwargs):
         start = time.time()
 
-        kwargs = self.inject_conversation_messages(
-            self.inject_recalled_facts(self.configure_for_streaming_usage(kwargs))
+        kwargs = await self.inject_conversation_messages_async(
+            await self.inject_recalled_facts_async(
+                self.configure_for_streaming_usage(kwargs)
+            )
         )
 
         raw_response = await self._method(**kwargs)
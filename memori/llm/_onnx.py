@@ -0,0 +1,210 @@
+r"""
+ __  __                           _
+|  \/  | ___ _ __ ___   ___  _ __(_)
+| |\/| |/ _ \ '_ ` _ \ / _ \| '__| |
+| |  | |  __/ | | | | | (_) | |  | |
+|_|  |_|\___|_| |_| |_|\___/|_|  |_|
+                 perfectam memoriam
+                      memorilabs.ai
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_MAX_SEQ_LENGTH = 512
+QUANTIZED_SUFFIX = "_qint8_dynamic"
+
+
+class OnnxEncoder:
+    """Sentence encoder running an exported transformer through onnxruntime.
+
+    Mirrors the sentence-transformers pipeline of the model it was exported
+    from: the model's own tokenizer, the transformer, the pooling configured
+    for the model and, when the model has a Normalize module, L2
+    normalization. Vectors are therefore interchangeable with the ones the
+    PyTorch model produces, up to floating point rounding (or quantization
+    error for int8 models).
+    """
+
+    def __init__(
+        self,
+        session,
+        tokenizer,
+        pooling: str = "mean",
+        normalize: bool = True,
+        dimension: int | None = None,
+    ):
+        self.dimension = dimension
+        self.input_names = {value.name for value in session.get_inputs()}
+        self.normalize = normalize
+        self.pooling = pooling
+        self.session = session
+        self.tokenizer = tokenizer
+
+    def get_sentence_embedding_dimension(self) -> int | None:
+        return self.dimension
+
+    def _pool(self, token_embeddings: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        if self.pooling == "cls":
+            return token_embeddings[:, 0]
+
+        expanded = mask[:, :, None].astype(np.float32)
+        if self.pooling == "max":
+            masked = np.where(expanded > 0, token_embeddings, -np.inf)
+            return masked.max(axis=1)
+
+        summed = (token_embeddings * expanded).sum(axis=1)
+        return summed / np.clip(expanded.sum(axis=1), 1e-9, None)
+
+    def _encode_batch(self, texts: list[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        feed = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feed["token_type_ids"] = np.array(
+                [e.type_ids for e in encodings], dtype=np.int64
+            )
+        feed = {name: value for name, value in feed.items() if name in self.input_names}
+
+        output = np.asarray(self.session.run(None, feed)[0], dtype=np.float32)
+        embeddings = output if output.ndim == 2 else self._pool(output, attention_mask)
+
+        if self.normalize:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.clip(norms, 1e-12, None)
+
+        return embeddings.astype(np.float32, copy=False)
+
+    def encode(
+        self, sentences: list[str], batch_size: int = 32, **kwargs
+    ) -> np.ndarray:
+        if not sentences:
+            return np.zeros((0, self.dimension or 0), dtype=np.float32)
+
+        embeddings = np.vstack(
+            [
+                self._encode_batch(sentences[start : start + batch_size])
+                for start in range(0, len(sentences), batch_size)
+            ]
+        )
+        if self.dimension is None:
+            self.dimension = int(embeddings.shape[1])
+
+        return embeddings
+
+
+def _read_json(path: Path) -> dict | list | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _pipeline_config(model_dir: Path) -> tuple[str, bool, int | None]:
+    """Read pooling mode, normalization and dimension of a sentence-transformers
+    model directory. Defaults match models exported without that metadata."""
+    pooling, normalize, dimension = "mean", False, None
+
+    for module in _read_json(model_dir / "modules.json") or []:
+        module_type = module.get("type", "")
+        if module_type.endswith("Normalize"):
+            normalize = True
+        elif module_type.endswith("Pooling"):
+            config = _read_json(model_dir / module.get("path", "") / "config.json")
+            if config:
+                dimension = config.get("word_embedding_dimension")
+                if config.get("pooling_mode_cls_token"):
+                    pooling = "cls"
+                elif config.get("pooling_mode_max_tokens"):
+                    pooling = "max"
+        elif module_type.endswith("Dense"):
+            raise ValueError(
+                f"{model_dir} has a Dense module, which the onnx embeddings "
+                "backend does not support"
+            )
+
+    return pooling, normalize, dimension
+
+
+def _model_dir(model_name: str, file_name: str) -> Path:
+    if os.path.isdir(model_name):
+        return Path(model_name)
+
+    from huggingface_hub import snapshot_download
+
+    repo_id = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+    return Path(
+        snapshot_download(
+            repo_id,
+            allow_patterns=[file_name, f"{file_name}_data", "*.json", "*/config.json"],
+        )
+    )
+
+
+def quantize_model(path: Path) -> Path:
+    """Dynamically quantize the weights of an ONNX model to int8, once.
+
+    The quantized model is written next to the original and reused on later
+    loads.
+    """
+    quantized = path.with_name(f"{path.stem}{QUANTIZED_SUFFIX}{path.suffix}")
+    if quantized.exists():
+        return quantized
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    tmp = quantized.with_name(f"{quantized.name}.{os.getpid()}.tmp")
+    quantize_dynamic(str(path), str(tmp), weight_type=QuantType.QInt8)
+    os.replace(tmp, quantized)
+    return quantized
+
+
+def load_onnx_encoder(model_name: str, onnx_config) -> OnnxEncoder:
+    """Load ``model_name``, a local directory or a Hugging Face model id, for
+    the onnx embeddings backend."""
+    try:
+        import onnxruntime
+        from tokenizers import Tokenizer
+    except ImportError as e:
+        raise ImportError(
+            "The onnx embeddings backend requires onnxruntime and tokenizers: "
+            "pip install onnxruntime tokenizers"
+        ) from e
+
+    model_dir = _model_dir(model_name, onnx_config.file_name)
+    model_path = model_dir / onnx_config.file_name
+    if not model_path.exists():
+        raise OSError(f"{model_path} not found")
+    if onnx_config.quantize:
+        model_path = quantize_model(model_path)
+
+    pooling, normalize, dimension = _pipeline_config(model_dir)
+
+    tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+    max_seq_length = (_read_json(model_dir / "sentence_bert_config.json") or {}).get(
+        "max_seq_length", DEFAULT_MAX_SEQ_LENGTH
+    )
+    tokenizer.enable_truncation(max_length=max_seq_length)
+    pad_token = (_read_json(model_dir / "tokenizer_config.json") or {}).get(
+        "pad_token", "[PAD]"
+    )
+    if isinstance(pad_token, dict):
+        pad_token = pad_token.get("content", "[PAD]")
+    tokenizer.enable_padding(
+        pad_id=tokenizer.token_to_id(pad_token) or 0, pad_token=pad_token
+    )
+
+    options = onnxruntime.SessionOptions()
+    if onnx_config.intra_op_num_threads:
+        options.intra_op_num_threads = onnx_config.intra_op_num_threads
+    session = onnxruntime.InferenceSession(
+        str(model_path), options, providers=["CPUExecutionProvider"]
+    )
+
+    return OnnxEncoder(session, tokenizer, pooling, normalize, dimension)
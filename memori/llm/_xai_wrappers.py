@@ -12,8 +12,6 @@ import asyncio
 import json
 import time
 
-from google.protobuf import json_format
-
 from memori.llm._constants import XAI_LLM_PROVIDER
 
 
@@ -84,6 +82,8 @@ class XAiWrappers:
 
     def _create_sync_sample_wrapper(self, chat_obj, client_version):
         """Create a synchronous wrapper for sample()."""
+        from google.protobuf import json_format
+
         from memori.memory._manager import Manager as MemoryManager
 
         def wrapped_sample(*sample_args, **sample_kwargs):
@@ -131,6 +131,8 @@ class XAiWrappers:
 
     def _create_async_sample_wrapper(self, chat_obj, client_version):
         """Create an asynchronous wrapper for sample()."""
+        from google.protobuf import json_format
+
         from memori.memory._manager import Manager as MemoryManager
 
         async def wrapped_sample_async(*sample_args, **sample_kwargs):
@@ -178,6 +180,8 @@ class XAiWrappers:
 
     def _create_stream_wrapper(self, chat_obj, client_version):
         """Create an asynchronous wrapper for stream()."""
+        from google.protobuf import json_format
+
         from memori.memory._manager import Manager as MemoryManager
 
         async def wrapped_stream(*stream_args, **stream_kwargs):
@@ -18,11 +18,16 @@ from memori.storage._connection import connection_context
 
 class WriteTask:
     def __init__(
-        self, method_path: str, args: tuple | None = None, kwargs: dict | None = None
+        self,
+        method_path: str,
+        args: tuple | None = None,
+        kwargs: dict | None = None,
+        on_commit: Callable | None = None,
     ):
         self.method_path = method_path
         self.args = args or ()
         self.kwargs = kwargs or {}
+        self.on_commit = on_commit
 
     def execute(self, driver):
         method = self._resolve_method(driver, self.method_path)
@@ -102,6 +107,8 @@ class DbWriterRuntime:
                             if adapter:
                                 adapter.flush()
                                 adapter.commit()
+
+                            self._run_on_commit(batch, driver)
                         except Exception:
                             import traceback
 
@@ -117,6 +124,18 @@ class DbWriterRuntime:
                 traceback.print_exc()
                 time.sleep(1)
 
+    def _run_on_commit(self, batch: list[WriteTask], driver) -> None:
+        for task in batch:
+            if task.on_commit is None:
+                continue
+
+            try:
+                task.on_commit(driver)
+            except Exception:
+                import traceback
+
+                traceback.print_exc()
+
     def _collect_batch(self) -> list[WriteTask]:
         batch = []
         deadline = time.time() + self.batch_timeout
@@ -14,7 +14,9 @@ from collections.abc import Callable
 from concurrent.futures import Future
 from typing import Any
 
+from memori._cache import entity_versions
 from memori._config import Config
+from memori._search import refresh_entity_index
 from memori.memory.augmentation._base import AugmentationContext
 from memori.memory.augmentation._db_writer import WriteTask, get_db_writer
 from memori.memory.augmentation._registry import Registry as AugmentationRegistry
@@ -92,6 +94,58 @@ class Manager:
         future.add_done_callback(lambda f: self._handle_augmentation_result(f))
         return self
 
+    def prefetch(self, entity_id: str) -> Future[Any] | None:
+        """Warm recall for an entity on the augmentation runtime.
+
+        Resolves the entity's row id and loads its facts into the recall
+        index cache in the background, so the first recall does not pay for
+        it. Returns the future, or None when augmentation is not running.
+        """
+        if not self._active or not self.conn_factory:
+            return None
+
+        runtime = get_runtime()
+        if not runtime.ready.wait(timeout=RUNTIME_READY_TIMEOUT):
+            return None
+
+        if runtime.loop is None:
+            return None
+
+        future = asyncio.run_coroutine_threadsafe(
+            self._prefetch(entity_id), runtime.loop
+        )
+        future.add_done_callback(self._handle_prefetch_result)
+        return future
+
+    async def _prefetch(self, entity_id: str) -> int | None:
+        return await asyncio.get_running_loop().run_in_executor(
+            self.config.recall_thread_pool_executor, self._prefetch_recall, entity_id
+        )
+
+    def _prefetch_recall(self, entity_id: str) -> int | None:
+        from memori.memory.recall import Recall
+
+        cache = self.config.cache
+        with connection_context(self.conn_factory) as (conn, adapter, driver):
+            row_id = Recall(self.config).prefetch(driver, entity_id)
+
+        # Only cached after the commit, so other connections can see the row.
+        if (
+            row_id is not None
+            and self.config.entity_id == entity_id
+            and cache is self.config.cache
+            and cache.entity_id is None
+        ):
+            cache.entity_id = row_id
+
+        return row_id
+
+    def _handle_prefetch_result(self, future: Future[Any]) -> None:
+        try:
+            future.result()
+        except Exception as e:
+            logger.warning(f"Recall prefetch failed: {e}")
+
     def _handle_augmentation_result(self, future: Future[Any]) -> None:
         from memori._exceptions import QuotaExceededError
 
@@ -151,9 +205,42 @@ class Manager:
                 method_path=write_op["method_path"],
                 args=write_op["args"],
                 kwargs=write_op["kwargs"],
+                on_commit=self._on_commit_callback(write_op),
             )
             db_writer.enqueue_write(task)
 
+    def _on_commit_callback(self, write_op: dict[str, Any]) -> Callable | None:
+        if (
+            write_op["method_path"]
+            in ("entity_fact.increment_num_times", "knowledge_graph.create")
+            and write_op["args"]
+        ):
+            bumped_entity_id = write_op["args"][0]
+            return lambda driver: entity_versions.bump(bumped_entity_id)
+
+        if write_op["method_path"] != "entity_fact.create":
+            return None
+
+        args = write_op["args"]
+        if len(args) < 3:
+            return None
+
+        entity_id, facts, fact_embeddings = args[:3]
+
+        def _refresh(driver) -> None:
+            # Bumped again once the write is committed so a recall that ran
+            # between create() and the commit cannot stay cached.
+            entity_versions.bump(entity_id)
+            refresh_entity_index(
+                self.config.recall_index_cache,
+                driver.entity_fact,
+                entity_id,
+                facts,
+                fact_embeddings,
+            )
+
+        return _refresh
+
     def wait(self, timeout: float | None = None) -> bool:
         import concurrent.futures
         import time
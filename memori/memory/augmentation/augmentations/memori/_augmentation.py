@@ -9,7 +9,8 @@ r"""
 """
 
 from memori._network import Api
-from memori.llm._embeddings import embed_texts_async
+from memori._utils import generate_uniq
+from memori.llm._embeddings import embed_texts_array_async
 from memori.memory._struct import Memories
 from memori.memory.augmentation._base import AugmentationContext, BaseAugmentation
 from memori.memory.augmentation._models import (
@@ -128,31 +129,27 @@ class AdvancedAugmentation(BaseAugmentation):
         return ctx
 
     async def _process_api_response(self, api_response: dict) -> Memories:
-        entity_data = api_response.get("entity", {})
-        facts = entity_data.get("facts", [])
-        triples = entity_data.get("triples", [])
-
-        if not facts and triples:
-            facts = [
-                f"{t['subject']['name']} {t['predicate']} {t['object']['name']}"
-                for t in triples
-                if t.get("subject") and t.get("predicate") and t.get("object")
-            ]
+        return Memories().configure_from_advanced_augmentation(api_response)
 
-        if facts:
-            embeddings_config = self.config.embeddings
-            fact_embeddings = await embed_texts_async(
-                facts,
-                model=embeddings_config.model,
-                fallback_dimension=embeddings_config.fallback_dimension,
+    def _existing_uniqs(self, driver, entity_id: int, uniqs: list[str]) -> set[str]:
+        try:
+            rows = driver.entity_fact.get_ids_by_uniqs(
+                entity_id, list(dict.fromkeys(uniqs))
             )
-            api_response["entity"]["fact_embeddings"] = fact_embeddings
+        except NotImplementedError:
+            return set()
 
-        return Memories().configure_from_advanced_augmentation(api_response)
+        return {row["uniq"] for row in rows}
 
     async def _schedule_entity_writes(
         self, ctx: AugmentationContext, driver, memories: Memories
     ):
+        """Schedule writes for the entity's facts and knowledge graph.
+
+        Facts the entity already has are not embedded again: they are looked
+        up by uniq in one query and only get their frequency bumped. New facts
+        are embedded, unless embeddings for every fact came with ``memories``.
+        """
         if not ctx.payload.entity_id:
             return
 
@@ -160,36 +157,56 @@ class AdvancedAugmentation(BaseAugmentation):
         if not entity_id:
             return
 
-        facts_to_write = memories.entity.facts
-        embeddings_to_write = memories.entity.fact_embeddings
-
-        if memories.entity.semantic_triples and (
-            not facts_to_write or not embeddings_to_write
-        ):
-            facts_from_triples = [
+        facts = memories.entity.facts
+        if not facts and memories.entity.semantic_triples:
+            facts = [
                 f"{triple.subject_name} {triple.predicate} {triple.object_name}"
                 for triple in memories.entity.semantic_triples
             ]
 
-            if facts_from_triples:
+        if facts:
+            uniqs = [generate_uniq([fact]) for fact in facts]
+            existing = self._existing_uniqs(driver, entity_id, uniqs)
+
+            new_facts = [
+                fact
+                for fact, uniq in zip(facts, uniqs, strict=True)
+                if uniq not in existing
+            ]
+            if len(memories.entity.fact_embeddings) == len(facts):
+                new_embeddings = [
+                    embedding
+                    for embedding, uniq in zip(
+                        memories.entity.fact_embeddings, uniqs, strict=True
+                    )
+                    if uniq not in existing
+                ]
+            elif new_facts:
                 embeddings_config = self.config.embeddings
-                embeddings_from_triples = await embed_texts_async(
-                    facts_from_triples,
+                new_embeddings = await embed_texts_array_async(
+                    new_facts,
                     model=embeddings_config.model,
                     fallback_dimension=embeddings_config.fallback_dimension,
+                    batching=embeddings_config.batching,
+                    onnx=embeddings_config.onnx,
+                    process_pool=embeddings_config.process_pool,
+                    store=embeddings_config.store,
+                )
+            else:
+                new_embeddings = []
+
+            if new_facts and len(new_embeddings):
+                ctx.add_write(
+                    "entity_fact.create",
+                    entity_id,
+                    new_facts,
+                    new_embeddings,
+                    embedding_dtype=self.config.embeddings.storage_dtype,
                 )
-                facts_to_write = (facts_to_write or []) + facts_from_triples
-                embeddings_to_write = (
-                    embeddings_to_write or []
-                ) + embeddings_from_triples
 
-        if facts_to_write and embeddings_to_write:
-            ctx.add_write(
-                "entity_fact.create",
-                entity_id,
-                facts_to_write,
-                embeddings_to_write,
-            )
+            known = [uniq for uniq in dict.fromkeys(uniqs) if uniq in existing]
+            if known:
+                ctx.add_write("entity_fact.increment_num_times", entity_id, known)
 
         if memories.entity.semantic_triples:
             ctx.add_write(
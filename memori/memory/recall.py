@@ -8,61 +8,438 @@ r"""
                       memorilabs.ai
 """
 
+import asyncio
+import concurrent.futures
+import logging
 import time
+from functools import partial
 
 from sqlalchemy.exc import OperationalError
 
+from memori._cache import entity_versions
 from memori._config import Config
-from memori._search import search_entity_facts
-from memori.llm._embeddings import embed_texts
+from memori._graph import expand_facts_with_graph
+from memori._search import (
+    load_entity_index,
+    rescore_facts,
+    search_entity_facts,
+    search_entity_facts_many,
+)
+from memori.llm._embeddings import embed_queries_array, embed_rescore_array
+from memori.storage._connection import connection_context
+
+logger = logging.getLogger(__name__)
 
 MAX_RETRIES = 3
 RETRY_BACKOFF_BASE = 0.05
 
 
+def _log_background_failure(future) -> None:
+    if future.cancelled():
+        return
+
+    e = future.exception()
+    if e is not None:
+        logger.warning(f"Background recall failed: {e}")
+
+
 class Recall:
     def __init__(self, config: Config) -> None:
         self.config = config
 
+    def resolve_entity_id(
+        self, entity_id: int | None = None, driver=None
+    ) -> int | None:
+        if self.config.storage is None or self.config.storage.driver is None:
+            return None
+
+        if driver is None:
+            driver = self.config.storage.driver
+
+        if entity_id is None:
+            if self.config.entity_id is None:
+                return None
+
+            entity_id = self.config.cache.entity_id
+            if entity_id is None:
+                entity_id = driver.entity.create(self.config.entity_id)
+                self.config.cache.entity_id = entity_id
+
+        return entity_id
+
+    def prefetch(self, driver, entity_id: str) -> int | None:
+        """Resolve an entity and load its facts into the recall index cache.
+
+        Runs with its own driver, off the request path, and returns the
+        entity's row id so the caller can cache it once committed. The index
+        is not loaded when the cache is disabled, or when recall ranks inside
+        the database or uses the binary prefilter, which do not search an
+        EntityIndex.
+        """
+        row_id = driver.entity.create(entity_id)
+        if row_id is None:
+            return None
+
+        if (
+            self.config.recall_index_cache.max_bytes <= 0
+            or self.config.recall_native_vector
+            or self.config.recall_prefilter.enabled
+        ):
+            return row_id
+
+        load_entity_index(
+            driver.entity_fact,
+            row_id,
+            self._embeddings_limit(),
+            self.config.recall_index_cache,
+            self.config.recall_candidate_policy,
+            self.config.recall_fetch_content,
+        )
+
+        return row_id
+
+    def _embeddings_limit(self) -> int:
+        if self.config.recall_ann.enabled:
+            return self.config.recall_ann.embeddings_limit
+        return self.config.recall_embeddings_limit
+
+    def _expand_with_graph(
+        self, entity_id: int, facts: list[dict], driver=None
+    ) -> list[dict]:
+        if not self.config.recall_graph.enabled:
+            return facts
+
+        if driver is None:
+            driver = self.config.storage.driver
+
+        return expand_facts_with_graph(
+            driver.knowledge_graph,
+            entity_id,
+            facts,
+            self.config.recall_graph,
+            self.config.recall_graph_cache,
+        )
+
+    def _with_retries(self, search, *args, **kwargs):
+        for attempt in range(MAX_RETRIES):
+            try:
+                return search(*args, **kwargs)
+            except OperationalError as e:
+                if "restart transaction" in str(e) and attempt < MAX_RETRIES - 1:
+                    time.sleep(RETRY_BACKOFF_BASE * (2**attempt))
+                    continue
+                raise
+
+    def _deadline_missed(
+        self, query: str, limit: int | None, entity_id: int | None
+    ) -> list[dict]:
+        metrics = self.config.recall_metrics
+        metrics.increment("deadline_misses")
+
+        if entity_id is None:
+            entity_id = self.config.cache.entity_id
+        if limit is None:
+            limit = self.config.recall_facts_limit
+
+        result_cache = self.config.recall_result_cache
+        facts = (
+            result_cache.get_stale(entity_id, query, limit)
+            if result_cache is not None and entity_id is not None
+            else None
+        )
+
+        if facts is None:
+            metrics.increment("deadline_empty_results")
+            logger.debug("Recall missed its deadline, continuing without facts")
+            return []
+
+        metrics.increment("deadline_stale_results")
+        logger.debug("Recall missed its deadline, serving a stale cached result")
+        return facts
+
     def search_facts(
         self, query: str, limit: int | None = None, entity_id: int | None = None
     ) -> list[dict]:
-        if self.config.storage is None or self.config.storage.driver is None:
+        """Recall the facts most similar to ``query``.
+
+        With ``config.recall_deadline_seconds`` set, the search runs on the
+        recall executor, on its own connection, and is waited for at most that
+        long. On a miss the last cached result for the query is returned, or
+        no facts, while the search finishes in the background and refreshes
+        the result cache.
+        """
+        deadline = self.config.recall_deadline_seconds
+        if deadline is None:
+            return self._search_facts(query, limit, entity_id)
+
+        future = self.config.recall_thread_pool_executor.submit(
+            self._search_facts_on_own_connection, query, limit, entity_id
+        )
+        try:
+            return future.result(timeout=deadline)
+        except concurrent.futures.TimeoutError:
+            future.add_done_callback(_log_background_failure)
+            return self._deadline_missed(query, limit, entity_id)
+
+    def _rescore_limit(self, limit: int) -> int:
+        """Number of candidates to fetch for a recall returning ``limit`` facts.
+
+        Only embeddings stored at reduced precision are rescored, by encoding
+        the candidates' content again (see embed_rescore_array), and at most
+        recall_rescore_max_candidates of them.
+        """
+        rescore_factor = self.config.recall_rescore_factor
+        if rescore_factor <= 1 or self.config.embeddings.storage_dtype == "float32":
+            return limit
+
+        return max(
+            limit,
+            min(limit * rescore_factor, self.config.recall_rescore_max_candidates),
+        )
+
+    def _search_facts_on_own_connection(
+        self, query: str, limit: int | None = None, entity_id: int | None = None
+    ) -> list[dict]:
+        """_search_facts for the recall executor.
+
+        Opens a connection from the storage connection factory instead of
+        using the caller's, which may not be used from another thread and
+        must not be shared with a search abandoned at its deadline.
+
+        An entity created here is only cached after the commit, and only if
+        the attribution did not change while the search ran, as in the
+        augmentation manager's recall prefetch.
+        """
+        storage = self.config.storage
+        if storage is None or storage.conn_factory is None:
             return []
 
+        external_id = self.config.entity_id
+        cache = self.config.cache
         if entity_id is None:
-            if self.config.entity_id is None:
+            entity_id = cache.entity_id
+            if entity_id is None and external_id is None:
                 return []
-            entity_id = self.config.storage.driver.entity.create(self.config.entity_id)
 
+        created = None
+        with connection_context(storage.conn_factory) as (conn, adapter, driver):
+            if entity_id is None:
+                entity_id = created = driver.entity.create(external_id)
+                if entity_id is None:
+                    return []
+
+            facts = self._search_facts(query, limit, entity_id, driver)
+
+        if (
+            created is not None
+            and self.config.entity_id == external_id
+            and cache is self.config.cache
+            and cache.entity_id is None
+        ):
+            cache.entity_id = created
+
+        return facts
+
+    def _search_facts(
+        self,
+        query: str,
+        limit: int | None = None,
+        entity_id: int | None = None,
+        driver=None,
+    ) -> list[dict]:
+        entity_id = self.resolve_entity_id(entity_id, driver)
         if entity_id is None:
             return []
 
+        if driver is None:
+            driver = self.config.storage.driver
+
         if limit is None:
             limit = self.config.recall_facts_limit
 
+        result_cache = self.config.recall_result_cache
+        if result_cache is not None:
+            cached = result_cache.get(entity_id, query, limit)
+            if cached is not None:
+                return cached
+        version = entity_versions.get(entity_id)
+
         embeddings_config = self.config.embeddings
-        query_embedding = embed_texts(
+        query_embedding = embed_queries_array(
             query,
             model=embeddings_config.model,
             fallback_dimension=embeddings_config.fallback_dimension,
+            batching=embeddings_config.batching,
+            onnx=embeddings_config.onnx,
         )[0]
 
-        facts = []
-        for attempt in range(MAX_RETRIES):
-            try:
-                facts = search_entity_facts(
-                    self.config.storage.driver.entity_fact,
-                    entity_id,
-                    query_embedding,
-                    limit,
-                    self.config.recall_embeddings_limit,
-                )
-                break
-            except OperationalError as e:
-                if "restart transaction" in str(e) and attempt < MAX_RETRIES - 1:
-                    time.sleep(RETRY_BACKOFF_BASE * (2**attempt))
-                    continue
-                raise
+        search_limit = self._rescore_limit(limit)
+
+        facts = self._with_retries(
+            search_entity_facts,
+            driver.entity_fact,
+            entity_id,
+            query_embedding,
+            search_limit,
+            self._embeddings_limit(),
+            index_cache=self.config.recall_index_cache,
+            native_vector=self.config.recall_native_vector,
+            prefilter=self.config.recall_prefilter,
+            candidate_policy=self.config.recall_candidate_policy,
+            fetch_content=self.config.recall_fetch_content,
+            query_text=query,
+            lexical=self.config.recall_lexical,
+        )
+
+        if search_limit > limit and facts:
+            fact_embeddings = embed_rescore_array(
+                [fact["content"] for fact in facts],
+                model=embeddings_config.model,
+                fallback_dimension=embeddings_config.fallback_dimension,
+                batching=embeddings_config.batching,
+                onnx=embeddings_config.onnx,
+                store=embeddings_config.store,
+            )
+            facts = rescore_facts(facts, query_embedding, fact_embeddings, limit)
+
+        facts = self._expand_with_graph(entity_id, facts, driver)
+
+        if result_cache is not None:
+            result_cache.put(entity_id, query, limit, facts, version)
 
         return facts
+
+    async def search_facts_async(
+        self, query: str, limit: int | None = None, entity_id: int | None = None
+    ) -> list[dict]:
+        """Run search_facts on the bounded recall executor.
+
+        Encoding, database reads and the FAISS search all happen off the event
+        loop, so a slow recall does not stall other coroutines. The database
+        is read on a connection of its own (see
+        _search_facts_on_own_connection). The deadline in
+        ``config.recall_deadline_seconds`` applies as for search_facts.
+        """
+        future = asyncio.get_running_loop().run_in_executor(
+            self.config.recall_thread_pool_executor,
+            partial(self._search_facts_on_own_connection, query, limit, entity_id),
+        )
+
+        deadline = self.config.recall_deadline_seconds
+        if deadline is None:
+            return await future
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), deadline)
+        except asyncio.TimeoutError:
+            future.add_done_callback(_log_background_failure)
+            return self._deadline_missed(query, limit, entity_id)
+
+    def search_facts_many(
+        self,
+        queries: list[str],
+        limit: int | None = None,
+        entity_id: int | None = None,
+    ) -> list[list[dict]]:
+        """Recall facts for several queries in one pass.
+
+        All queries are embedded in a single encode batch and searched against
+        the entity's embeddings together. Returns one list of facts per query,
+        in the order of ``queries``; empty queries get an empty list.
+        """
+        results: list[list[dict]] = [[] for _ in queries]
+
+        entity_id = self.resolve_entity_id(entity_id)
+        if entity_id is None:
+            return results
+
+        if limit is None:
+            limit = self.config.recall_facts_limit
+
+        result_cache = self.config.recall_result_cache
+        positions = []
+        for i, query in enumerate(queries):
+            if not query:
+                continue
+
+            cached = (
+                result_cache.get(entity_id, query, limit)
+                if result_cache is not None
+                else None
+            )
+            if cached is not None:
+                results[i] = cached
+            else:
+                positions.append(i)
+
+        if not positions:
+            return results
+        version = entity_versions.get(entity_id)
+
+        embeddings_config = self.config.embeddings
+        query_embeddings = embed_queries_array(
+            [queries[i] for i in positions],
+            model=embeddings_config.model,
+            fallback_dimension=embeddings_config.fallback_dimension,
+            batching=embeddings_config.batching,
+            onnx=embeddings_config.onnx,
+        )
+
+        search_limit = self._rescore_limit(limit)
+
+        facts_lists = self._with_retries(
+            search_entity_facts_many,
+            self.config.storage.driver.entity_fact,
+            entity_id,
+            query_embeddings,
+            search_limit,
+            self._embeddings_limit(),
+            index_cache=self.config.recall_index_cache,
+            native_vector=self.config.recall_native_vector,
+            prefilter=self.config.recall_prefilter,
+            candidate_policy=self.config.recall_candidate_policy,
+            fetch_content=self.config.recall_fetch_content,
+            query_texts=[queries[i] for i in positions],
+            lexical=self.config.recall_lexical,
+        )
+
+        if search_limit > limit:
+            contents = list(
+                dict.fromkeys(
+                    fact["content"] for facts in facts_lists for fact in facts
+                )
+            )
+            if contents:
+                content_embeddings = dict(
+                    zip(
+                        contents,
+                        embed_rescore_array(
+                            contents,
+                            model=embeddings_config.model,
+                            fallback_dimension=embeddings_config.fallback_dimension,
+                            batching=embeddings_config.batching,
+                            onnx=embeddings_config.onnx,
+                            store=embeddings_config.store,
+                        ),
+                        strict=False,
+                    )
+                )
+                facts_lists = [
+                    rescore_facts(
+                        facts,
+                        query_embedding,
+                        [content_embeddings[fact["content"]] for fact in facts],
+                        limit,
+                    )
+                    for facts, query_embedding in zip(
+                        facts_lists, query_embeddings, strict=True
+                    )
+                ]
+
+        for position, facts in zip(positions, facts_lists, strict=True):
+            facts = self._expand_with_graph(entity_id, facts)
+            results[position] = facts
+            if result_cache is not None:
+                result_cache.put(entity_id, queries[position], limit, facts, version)
+
+        return results
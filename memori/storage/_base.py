@@ -8,6 +8,8 @@ r"""
                        memorilabs.ai
 """
 
+import re
+
 
 class BaseStorageAdapter:
     def __init__(self, conn):
@@ -30,6 +32,9 @@ class BaseStorageAdapter:
     def flush(self):
         raise NotImplementedError
 
+    def get_dbapi_connection(self):
+        return None
+
     def get_dialect(self):
         raise NotImplementedError
 
@@ -74,6 +79,9 @@ class BaseKnowledgeGraph:
     def create(self, entity_id: int, semantic_triples: list):
         raise NotImplementedError
 
+    def get_edges(self, entity_id: int, limit: int = 10000):
+        raise NotImplementedError
+
 
 class BaseEntity:
     def __init__(self, conn: BaseStorageAdapter):
@@ -83,19 +91,101 @@ class BaseEntity:
         raise NotImplementedError
 
 
+RECALL_CANDIDATE_POLICIES = ("frequent", "recent", "blended")
+
+# ORDER BY clauses served by idx_memori_entity_fact_entity_id_freq and
+# idx_memori_entity_fact_entity_id_recent in the SQL drivers.
+CANDIDATE_ORDER_BY = {
+    "frequent": "num_times DESC, date_last_time DESC",
+    "recent": "date_last_time DESC",
+}
+
+
+def candidate_windows(policy: str, limit: int) -> list[tuple[str, int]]:
+    """Split an embeddings limit into index-ordered candidate windows.
+
+    ``frequent`` takes the entity's most used facts and ``recent`` its most
+    recently seen ones. ``blended`` takes half of the limit from each, so
+    both windows are served by an index scan.
+    """
+    if policy == "blended":
+        recent = limit // 2
+        return [("frequent", limit - recent), ("recent", recent)]
+
+    if policy not in RECALL_CANDIDATE_POLICIES:
+        raise ValueError(
+            f"Unsupported recall candidate policy: {policy}. "
+            f"Supported policies: {list(RECALL_CANDIDATE_POLICIES)}"
+        )
+
+    return [(policy, limit)]
+
+
+LEXICAL_MAX_TERMS = 32
+
+
+def lexical_terms(query: str) -> list[str]:
+    """Split a recall query into distinct word terms for full-text search.
+
+    Only word characters are kept, so the terms can be embedded in each
+    database's full-text query syntax without escaping.
+    """
+    terms = dict.fromkeys(re.findall(r"\w+", query.casefold()))
+    return list(terms)[:LEXICAL_MAX_TERMS]
+
+
 class BaseEntityFact:
     def __init__(self, conn: BaseStorageAdapter):
         self.conn = conn
 
-    def create(self, entity_id: int, facts: list, fact_embeddings: list | None = None):
+    def create(
+        self,
+        entity_id: int,
+        facts: list,
+        fact_embeddings: list | None = None,
+        embedding_dtype: str = "float32",
+    ):
+        raise NotImplementedError
+
+    def get_embeddings(
+        self, entity_id: int, limit: int = 1000, policy: str = "frequent"
+    ):
+        raise NotImplementedError
+
+    def get_embeddings_bulk(
+        self,
+        entity_id: int,
+        limit: int = 1000,
+        policy: str = "frequent",
+        with_content: bool = False,
+    ):
         raise NotImplementedError
 
-    def get_embeddings(self, entity_id: int, limit: int = 1000):
+    def get_embedding_codes_bulk(
+        self, entity_id: int, limit: int = 1000, policy: str = "frequent"
+    ):
+        raise NotImplementedError
+
+    def get_embeddings_by_ids(self, fact_ids: list[int]):
         raise NotImplementedError
 
     def get_facts_by_ids(self, fact_ids: list[int]):
         raise NotImplementedError
 
+    def get_ids_by_uniqs(self, entity_id: int, uniqs: list[str]):
+        raise NotImplementedError
+
+    def increment_num_times(self, entity_id: int, uniqs: list[str]):
+        raise NotImplementedError
+
+    def search_embeddings(
+        self, entity_id: int, query_embedding: list[float], limit: int
+    ):
+        raise NotImplementedError
+
+    def search_lexical(self, entity_id: int, query: str, limit: int):
+        raise NotImplementedError
+
 
 class BaseProcess:
     def __init__(self, conn: BaseStorageAdapter):
@@ -126,6 +216,20 @@ class BaseSchema:
         self.conn = conn
 
 
+class BaseSchemaSkipped:
+    def __init__(self, conn: BaseStorageAdapter):
+        self.conn = conn
+
+    def create(self, num: int, step: int):
+        raise NotImplementedError
+
+    def delete(self, num: int, step: int):
+        raise NotImplementedError
+
+    def read(self):
+        raise NotImplementedError
+
+
 class BaseSchemaVersion:
     def __init__(self, conn: BaseStorageAdapter):
         self.conn = conn
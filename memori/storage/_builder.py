@@ -54,6 +54,9 @@ class Builder:
                 f"No migration mapping found for dialect: {dialect}."
             )
 
+        recorded = self._read_skipped(dialect)
+        skipped = self._retry_skipped(dialect, migrations, recorded)
+
         if num == max(migrations.keys()):
             self.cli.notice("data structures are up-to-date", 1)
         else:
@@ -64,17 +67,26 @@ class Builder:
 
                 self.cli.notice(f"Building revision #{num}...")
 
-                for migration in migrations[num]:
+                for step, migration in enumerate(migrations[num]):
+                    if not self._applies_to(migration, dialect):
+                        continue
+
                     self.cli.notice(migration["description"], 1)
                     if (
                         self.config.storage is not None
                         and self.config.storage.adapter is not None
                     ):
-                        operation = migration.get("operations") or migration.get(
-                            "operation"
-                        )
-                        self.config.storage.adapter.execute(operation)
-                        self.config.storage.adapter.commit()
+                        try:
+                            self._execute_migration(migration)
+                        except Exception:
+                            if not migration.get("optional", False):
+                                raise
+
+                            if self._requires_rollback(dialect):
+                                self.config.storage.adapter.rollback()
+
+                            skipped.add((num, step))
+                            self.cli.notice("skipped: not supported by database", 2)
 
             if self.config.storage is None or self.config.storage.driver is None:
                 raise RuntimeError("Driver not initialized")
@@ -82,8 +94,10 @@ class Builder:
             self.config.storage.driver.schema.version.delete()
             self.config.storage.driver.schema.version.create(num - 1)
 
-            if self.config.storage.adapter is not None:
-                self.config.storage.adapter.commit()
+        self._record_skipped(recorded, skipped)
+
+        if self.config.storage.adapter is not None:
+            self.config.storage.adapter.commit()
 
         self.cli.notice("Build executed successfully!")
         self.cli.newline()
@@ -111,6 +125,67 @@ class Builder:
 
         return self
 
+    @staticmethod
+    def _applies_to(migration, dialect) -> bool:
+        """Steps listing ``dialects`` only run on those; dialects sharing a
+        migration mapping (postgresql and cockroachdb) support different
+        index types."""
+        dialects = migration.get("dialects")
+        return dialects is None or dialect in dialects
+
+    def _execute_migration(self, migration):
+        operation = migration.get("operations") or migration.get("operation")
+        self.config.storage.adapter.execute(operation)
+        self.config.storage.adapter.commit()
+
+    def _read_skipped(self, dialect):
+        """Optional steps recorded as skipped by earlier builds, as
+        (revision, step index) pairs. Empty until the table holding them
+        has been created."""
+        try:
+            return set(self.config.storage.driver.schema.skipped.read())
+        except Exception:
+            if self._requires_rollback(dialect):
+                self.config.storage.adapter.rollback()
+
+            return set()
+
+    def _retry_skipped(self, dialect, migrations, recorded):
+        """Retry optional steps skipped by earlier builds, so that e.g. the
+        vector column is added once the extension has been installed even
+        though the schema version already moved past its revision. Returns
+        the steps that are still skipped."""
+        skipped = set()
+        for num, step in sorted(recorded):
+            if num not in migrations or step >= len(migrations[num]):
+                continue
+
+            migration = migrations[num][step]
+            if not self._applies_to(migration, dialect):
+                continue
+
+            try:
+                self._execute_migration(migration)
+            except Exception:
+                if self._requires_rollback(dialect):
+                    self.config.storage.adapter.rollback()
+
+                skipped.add((num, step))
+                continue
+
+            self.cli.notice(f"Applied revision #{num}: {migration['description']}")
+
+        return skipped
+
+    def _record_skipped(self, recorded, skipped):
+        if self.config.storage is None or self.config.storage.driver is None:
+            raise RuntimeError("Driver not initialized")
+
+        for num, step in sorted(recorded - skipped):
+            self.config.storage.driver.schema.skipped.delete(num, step)
+        for num, step in sorted(skipped - recorded):
+            self.config.storage.driver.schema.skipped.create(num, step)
+
     def _get_supported_dialects(self):
         return list(self.registry._drivers.keys())
 
@@ -82,6 +82,9 @@ class Adapter(BaseStorageAdapter):
     def flush(self):
         return self
 
+    def get_dbapi_connection(self):
+        return self.conn
+
     def get_dialect(self):
         module_name = type(self.conn).__module__
         dialect_mapping = {
@@ -72,6 +72,10 @@ class Adapter(BaseStorageAdapter):
     def flush(self):
         return self
 
+    def get_dbapi_connection(self):
+        self.conn.ensure_connection()
+        return self.conn.connection
+
     def get_dialect(self):
         vendor = self.conn.vendor
         dialect_mapping = {
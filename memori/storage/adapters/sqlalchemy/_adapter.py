@@ -27,6 +27,9 @@ class Adapter(BaseStorageAdapter):
         self.conn.flush()
         return self
 
+    def get_dbapi_connection(self):
+        return self.conn.connection().connection.dbapi_connection
+
     def get_dialect(self):
         return self.conn.get_bind().dialect.name
 
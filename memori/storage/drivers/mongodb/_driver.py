@@ -11,6 +11,7 @@ r"""
 from datetime import datetime, timezone
 from uuid import uuid4
 
+from memori._cache import entity_versions
 from memori.storage._base import (
     BaseConversation,
     BaseConversationMessage,
@@ -21,13 +22,21 @@ from memori.storage._base import (
     BaseProcess,
     BaseProcessAttribute,
     BaseSchema,
+    BaseSchemaSkipped,
     BaseSchemaVersion,
     BaseSession,
     BaseStorageAdapter,
+    candidate_windows,
+    lexical_terms,
 )
 from memori.storage._registry import Registry
 from memori.storage.migrations._mongodb import migrations
 
+_CANDIDATE_SORT = {
+    "frequent": [("num_times", -1), ("date_last_time", -1)],
+    "recent": [("date_last_time", -1)],
+}
+
 
 class Conversation(BaseConversation):
     def __init__(self, conn: BaseStorageAdapter):
@@ -161,20 +170,35 @@ class Entity(BaseEntity):
 
 
 class EntityFact(BaseEntityFact):
-    def create(self, entity_id: int, facts: list, fact_embeddings: list | None = None):
+    def __init__(self, conn: BaseStorageAdapter):
+        super().__init__(conn)
+        self._text_index: bool | None = None
+
+    def create(
+        self,
+        entity_id: int,
+        facts: list,
+        fact_embeddings: list | None = None,
+        embedding_dtype: str = "float32",
+    ):
         if facts is None or len(facts) == 0:
             return self
 
         from memori._utils import generate_uniq
-        from memori.llm._embeddings import format_embedding_for_db
+        from memori.llm._embeddings import (
+            format_embedding_code_for_db,
+            format_embedding_for_db,
+        )
 
         for i, fact in enumerate(facts):
             embedding = (
                 fact_embeddings[i]
-                if fact_embeddings and i < len(fact_embeddings)
+                if fact_embeddings is not None and i < len(fact_embeddings)
                 else []
             )
-            embedding_formatted = format_embedding_for_db(embedding, "mongodb")
+            embedding_formatted = format_embedding_for_db(
+                embedding, "mongodb", embedding_dtype
+            )
             uniq = generate_uniq([fact])
 
             # Check if fact already exists
@@ -202,6 +226,9 @@ class EntityFact(BaseEntityFact):
                     "entity_id": entity_id,
                     "content": fact,
                     "content_embedding": embedding_formatted,
+                    "content_embedding_code": format_embedding_code_for_db(
+                        embedding, "mongodb"
+                    ),
                     "num_times": 1,
                     "date_last_time": datetime.now(timezone.utc),
                     "uniq": uniq,
@@ -211,23 +238,96 @@ class EntityFact(BaseEntityFact):
 
                 self.conn.execute("memori_entity_fact", "insert_one", fact_doc)
 
+        entity_versions.bump(entity_id)
         return self
 
-    def get_embeddings(self, entity_id: int, limit: int = 1000):
+    def _find_candidates(
+        self,
+        field: str,
+        entity_id: int,
+        limit: int,
+        policy: str,
+        with_content: bool = False,
+    ):
+        # Limit, sort and batch size are applied server-side so only the
+        # requested documents cross the wire, served from
+        # idx_memori_entity_fact_embedding_recall and
+        # idx_memori_entity_fact_entity_id_recent. The server still caps each
+        # batch at 16MB.
+        projection = {"_id": 1, field: 1}
+        if with_content:
+            projection["content"] = 1
+
+        candidates: dict = {}
+        for window_policy, window_limit in candidate_windows(policy, limit):
+            if window_limit <= 0:
+                continue
+
+            results = self.conn.execute(
+                "memori_entity_fact",
+                "find",
+                {"entity_id": entity_id},
+                projection,
+                sort=_CANDIDATE_SORT[window_policy],
+                limit=window_limit,
+                batch_size=window_limit,
+            )
+            for result in results:
+                candidates.setdefault(result["_id"], result)
+
+        rows = []
+        for fact_id, result in candidates.items():
+            row = {"id": fact_id, field: result.get(field)}
+            if with_content:
+                row["content"] = result.get("content")
+            rows.append(row)
+        return rows
+
+    def get_embeddings(
+        self, entity_id: int, limit: int = 1000, policy: str = "frequent"
+    ):
+        return self._find_candidates("content_embedding", entity_id, limit, policy)
+
+    def get_embeddings_bulk(
+        self,
+        entity_id: int,
+        limit: int = 1000,
+        policy: str = "frequent",
+        with_content: bool = False,
+    ):
+        from memori._search import pack_embedding_rows
+
+        return pack_embedding_rows(
+            self._find_candidates(
+                "content_embedding", entity_id, limit, policy, with_content
+            ),
+            with_content=with_content,
+        )
+
+    def get_embedding_codes_bulk(
+        self, entity_id: int, limit: int = 1000, policy: str = "frequent"
+    ):
+        from memori._search import pack_code_rows
+
+        return pack_code_rows(
+            self._find_candidates("content_embedding_code", entity_id, limit, policy)
+        )
+
+    def get_embeddings_by_ids(self, fact_ids: list):
+        if not fact_ids:
+            return []
+
         results = self.conn.execute(
             "memori_entity_fact",
             "find",
-            {"entity_id": entity_id},
+            {"_id": {"$in": fact_ids}},
             {"_id": 1, "content_embedding": 1},
         )
 
-        embeddings = []
-        for result in list(results)[:limit]:
-            embeddings.append(
-                {"id": result["_id"], "content_embedding": result["content_embedding"]}
-            )
-
-        return embeddings
+        return [
+            {"id": result["_id"], "content_embedding": result["content_embedding"]}
+            for result in results
+        ]
 
     def get_facts_by_ids(self, fact_ids: list[int]):
         if not fact_ids:
@@ -246,6 +346,66 @@ class EntityFact(BaseEntityFact):
 
         return facts
 
+    def get_ids_by_uniqs(self, entity_id: int, uniqs: list[str]):
+        if not uniqs:
+            return []
+
+        results = self.conn.execute(
+            "memori_entity_fact",
+            "find",
+            {"entity_id": entity_id, "uniq": {"$in": uniqs}},
+            {"_id": 1, "uniq": 1},
+        )
+
+        return [{"id": result["_id"], "uniq": result["uniq"]} for result in results]
+
+    def increment_num_times(self, entity_id: int, uniqs: list[str]):
+        if not uniqs:
+            return self
+
+        self.conn.execute(
+            "memori_entity_fact",
+            "update_many",
+            {"entity_id": entity_id, "uniq": {"$in": uniqs}},
+            {
+                "$inc": {"num_times": 1},
+                "$set": {"date_last_time": datetime.now(timezone.utc)},
+            },
+        )
+
+        entity_versions.bump(entity_id)
+        return self
+
+    def has_text_index(self) -> bool:
+        if self._text_index is None:
+            indexes = self.conn.execute("memori_entity_fact", "index_information")
+            self._text_index = "idx_memori_entity_fact_content_text" in (indexes or {})
+
+        return self._text_index
+
+    def search_lexical(self, entity_id: int, query: str, limit: int):
+        """Return ids of the entity's facts matching query terms, best first.
+
+        Ranked by text score from idx_memori_entity_fact_content_text. Returns
+        None when the text index does not exist, so recall stays vector-only.
+        """
+        if not self.has_text_index():
+            return None
+
+        terms = lexical_terms(query)
+        if not terms:
+            return []
+
+        results = self.conn.execute(
+            "memori_entity_fact",
+            "find",
+            {"entity_id": entity_id, "$text": {"$search": " ".join(terms)}},
+            {"_id": 1, "score": {"$meta": "textScore"}},
+            sort=[("score", {"$meta": "textScore"})],
+            limit=limit,
+        )
+        return [result["_id"] for result in results]
+
 
 class KnowledgeGraph(BaseKnowledgeGraph):
     def create(self, entity_id: int, semantic_triples: list):
@@ -364,8 +524,49 @@ class KnowledgeGraph(BaseKnowledgeGraph):
                     }
                     self.conn.execute("memori_knowledge_graph", "insert_one", kg_doc)
 
+        entity_versions.bump(entity_id)
         return self
 
+    def get_edges(self, entity_id: int, limit: int = 10000):
+        edges = list(
+            self.conn.execute(
+                "memori_knowledge_graph",
+                "find",
+                {"entity_id": entity_id},
+                {"_id": 0, "subject_id": 1, "predicate_id": 1, "object_id": 1},
+                sort=[("num_times", -1), ("date_last_time", -1)],
+                limit=limit,
+            )
+        )
+        if not edges:
+            return []
+
+        names = {}
+        for collection, key, field in (
+            ("memori_subject", "subject_id", "name"),
+            ("memori_predicate", "predicate_id", "content"),
+            ("memori_object", "object_id", "name"),
+        ):
+            ids = list({edge[key] for edge in edges})
+            names[key] = {
+                doc["_id"]: doc[field]
+                for doc in self.conn.execute(
+                    collection, "find", {"_id": {"$in": ids}}, {"_id": 1, field: 1}
+                )
+            }
+
+        return [
+            {
+                "subject_name": names["subject_id"][edge["subject_id"]],
+                "predicate": names["predicate_id"][edge["predicate_id"]],
+                "object_name": names["object_id"][edge["object_id"]],
+            }
+            for edge in edges
+            if edge["subject_id"] in names["subject_id"]
+            and edge["predicate_id"] in names["predicate_id"]
+            and edge["object_id"] in names["object_id"]
+        ]
+
 
 class Process(BaseProcess):
     def create(self, external_id: str):
@@ -460,9 +661,29 @@ class Session(BaseSession):
 class Schema(BaseSchema):
     def __init__(self, conn: BaseStorageAdapter):
         super().__init__(conn)
+        self.skipped = SchemaSkipped(conn)
         self.version = SchemaVersion(conn)
 
 
+class SchemaSkipped(BaseSchemaSkipped):
+    def create(self, num: int, step: int):
+        skipped_doc = {"num": num, "step": step}
+
+        self.conn.execute("memori_schema_skipped", "insert_one", skipped_doc)
+
+    def delete(self, num: int, step: int):
+        self.conn.execute(
+            "memori_schema_skipped", "delete_many", {"num": num, "step": step}
+        )
+
+    def read(self):
+        results = self.conn.execute(
+            "memori_schema_skipped", "find", {}, {"num": 1, "step": 1, "_id": 0}
+        )
+
+        return {(int(result["num"]), int(result["step"])) for result in results}
+
+
 class SchemaVersion(BaseSchemaVersion):
     def create(self, num: int):
         schema_doc = {"num": num}
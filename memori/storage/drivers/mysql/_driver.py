@@ -10,8 +10,10 @@ r"""
 
 from uuid import uuid4
 
+from memori._cache import entity_versions
 from memori._utils import generate_uniq
 from memori.storage._base import (
+    CANDIDATE_ORDER_BY,
     BaseConversation,
     BaseConversationMessage,
     BaseConversationMessages,
@@ -21,9 +23,12 @@ from memori.storage._base import (
     BaseProcess,
     BaseProcessAttribute,
     BaseSchema,
+    BaseSchemaSkipped,
     BaseSchemaVersion,
     BaseSession,
     BaseStorageAdapter,
+    candidate_windows,
+    lexical_terms,
 )
 from memori.storage._registry import Registry
 from memori.storage.migrations._mysql import migrations
@@ -339,8 +344,33 @@ class KnowledgeGraph(BaseKnowledgeGraph):
                 )
                 self.conn.commit()
 
+        entity_versions.bump(entity_id)
         return self
 
+    def get_edges(self, entity_id: int, limit: int = 10000):
+        return (
+            self.conn.execute(
+                """
+                SELECT s.name AS subject_name,
+                       p.content AS predicate,
+                       o.name AS object_name
+                  FROM memori_knowledge_graph kg
+                  JOIN memori_subject s
+                    ON s.id = kg.subject_id
+                  JOIN memori_predicate p
+                    ON p.id = kg.predicate_id
+                  JOIN memori_object o
+                    ON o.id = kg.object_id
+                 WHERE kg.entity_id = %s
+                 ORDER BY kg.num_times DESC, kg.date_last_time DESC
+                 LIMIT %s
+                """,
+                (entity_id, limit),
+            )
+            .mappings()
+            .fetchall()
+        )
+
 
 class Entity(BaseEntity):
     def create(self, external_id: str):
@@ -374,19 +404,34 @@ class Entity(BaseEntity):
 
 
 class EntityFact(BaseEntityFact):
-    def create(self, entity_id: int, facts: list, fact_embeddings: list | None = None):
+    def __init__(self, conn: BaseStorageAdapter):
+        super().__init__(conn)
+        self._fulltext_index: bool | None = None
+
+    def create(
+        self,
+        entity_id: int,
+        facts: list,
+        fact_embeddings: list | None = None,
+        embedding_dtype: str = "float32",
+    ):
         if facts is None or len(facts) == 0:
             return self
 
-        from memori.llm._embeddings import format_embedding_for_db
+        from memori.llm._embeddings import (
+            format_embedding_code_for_db,
+            format_embedding_for_db,
+        )
 
         for i, fact in enumerate(facts):
             embedding = (
                 fact_embeddings[i]
-                if fact_embeddings and i < len(fact_embeddings)
+                if fact_embeddings is not None and i < len(fact_embeddings)
                 else []
             )
-            embedding_formatted = format_embedding_for_db(embedding, "mysql")
+            embedding_formatted = format_embedding_for_db(
+                embedding, "mysql", embedding_dtype
+            )
 
             self.conn.execute(
                 """
@@ -395,6 +440,7 @@ class EntityFact(BaseEntityFact):
                     entity_id,
                     content,
                     content_embedding,
+                    content_embedding_code,
                     num_times,
                     date_last_time,
                     uniq
@@ -404,6 +450,7 @@ class EntityFact(BaseEntityFact):
                     %s,
                     %s,
                     %s,
+                    %s,
                     current_timestamp(),
                     %s
                 )
@@ -416,6 +463,7 @@ class EntityFact(BaseEntityFact):
                     entity_id,
                     fact,
                     embedding_formatted,
+                    format_embedding_code_for_db(embedding, "mysql"),
                     1,
                     generate_uniq(fact),
                 ),
@@ -423,24 +471,108 @@ class EntityFact(BaseEntityFact):
 
         self.conn.commit()
 
+        entity_versions.bump(entity_id)
         return self
 
-    def get_embeddings(self, entity_id: int, limit: int = 1000):
-        return (
-            self.conn.execute(
-                """
-                SELECT id,
-                       content_embedding
+    def _select_candidates(self, columns: str, entity_id: int, limit: int, policy: str):
+        windows = candidate_windows(policy, limit)
+        if len(windows) == 1:
+            window_policy, window_limit = windows[0]
+            query = f"""
+                SELECT {columns}
                   FROM memori_entity_fact
                  WHERE entity_id = %s
+                 ORDER BY {CANDIDATE_ORDER_BY[window_policy]}
                  LIMIT %s
-                """,
-                (entity_id, limit),
+                """  # nosec B608: Safe - only interpolating column and ORDER BY constants
+            return (
+                self.conn.execute(query, (entity_id, window_limit))
+                .mappings()
+                .fetchall()
+            )
+
+        (frequent, frequent_limit), (recent, recent_limit) = windows
+        query = f"""
+                SELECT {columns}
+                  FROM memori_entity_fact
+                 WHERE id IN (
+                        SELECT id
+                          FROM (
+                                SELECT id
+                                  FROM memori_entity_fact
+                                 WHERE entity_id = %s
+                                 ORDER BY {CANDIDATE_ORDER_BY[frequent]}
+                                 LIMIT %s
+                               ) f
+                         UNION
+                        SELECT id
+                          FROM (
+                                SELECT id
+                                  FROM memori_entity_fact
+                                 WHERE entity_id = %s
+                                 ORDER BY {CANDIDATE_ORDER_BY[recent]}
+                                 LIMIT %s
+                               ) r
+                       )
+                """  # nosec B608: Safe - only interpolating column and ORDER BY constants
+        return (
+            self.conn.execute(
+                query, (entity_id, frequent_limit, entity_id, recent_limit)
             )
             .mappings()
             .fetchall()
         )
 
+    def get_embeddings(
+        self, entity_id: int, limit: int = 1000, policy: str = "frequent"
+    ):
+        return self._select_candidates(
+            "id, content_embedding", entity_id, limit, policy
+        )
+
+    def get_embeddings_bulk(
+        self,
+        entity_id: int,
+        limit: int = 1000,
+        policy: str = "frequent",
+        with_content: bool = False,
+    ):
+        from memori._search import pack_embedding_rows
+
+        if not with_content:
+            return pack_embedding_rows(self.get_embeddings(entity_id, limit, policy))
+
+        return pack_embedding_rows(
+            self._select_candidates(
+                "id, content_embedding, content", entity_id, limit, policy
+            ),
+            with_content=True,
+        )
+
+    def get_embedding_codes_bulk(
+        self, entity_id: int, limit: int = 1000, policy: str = "frequent"
+    ):
+        from memori._search import pack_code_rows
+
+        return pack_code_rows(
+            self._select_candidates(
+                "id, content_embedding_code", entity_id, limit, policy
+            )
+        )
+
+    def get_embeddings_by_ids(self, fact_ids: list[int]):
+        if not fact_ids:
+            return []
+        placeholders = ",".join(["%s"] * len(fact_ids))
+
+        query = f"""
+                SELECT id,
+                       content_embedding
+                  FROM memori_entity_fact
+                 WHERE id IN ({placeholders})
+                """  # nosec B608: Safe - only interpolating placeholder count, actual values parameterized
+        return self.conn.execute(query, tuple(fact_ids)).mappings().fetchall()
+
     def get_facts_by_ids(self, fact_ids: list[int]):
         if not fact_ids:
             return []
@@ -454,6 +586,89 @@ class EntityFact(BaseEntityFact):
                 """  # nosec B608: Safe - only interpolating placeholder count, actual values parameterized
         return self.conn.execute(query, tuple(fact_ids)).mappings().fetchall()
 
+    def get_ids_by_uniqs(self, entity_id: int, uniqs: list[str]):
+        if not uniqs:
+            return []
+        placeholders = ",".join(["%s"] * len(uniqs))
+
+        query = f"""
+                SELECT id,
+                       uniq
+                  FROM memori_entity_fact
+                 WHERE entity_id = %s
+                   AND uniq IN ({placeholders})
+                """  # nosec B608: Safe - only interpolating placeholder count, actual values parameterized
+        return self.conn.execute(query, (entity_id, *uniqs)).mappings().fetchall()
+
+    def increment_num_times(self, entity_id: int, uniqs: list[str]):
+        if not uniqs:
+            return self
+        placeholders = ",".join(["%s"] * len(uniqs))
+
+        query = f"""
+                UPDATE memori_entity_fact
+                   SET num_times = num_times + 1,
+                       date_last_time = current_timestamp()
+                 WHERE entity_id = %s
+                   AND uniq IN ({placeholders})
+                """  # nosec B608: Safe - only interpolating placeholder count, actual values parameterized
+        self.conn.execute(query, (entity_id, *uniqs))
+        self.conn.commit()
+
+        entity_versions.bump(entity_id)
+        return self
+
+    def has_fulltext_index(self) -> bool:
+        if self._fulltext_index is None:
+            result = (
+                self.conn.execute(
+                    """
+                    SELECT 1 AS present
+                      FROM information_schema.statistics
+                     WHERE table_schema = database()
+                       AND table_name = 'memori_entity_fact'
+                       AND index_name = 'idx_memori_entity_fact_content_fts'
+                     LIMIT 1
+                    """
+                )
+                .mappings()
+                .fetchone()
+            )
+            self._fulltext_index = result is not None
+
+        return self._fulltext_index
+
+    def search_lexical(self, entity_id: int, query: str, limit: int):
+        """Return ids of the entity's facts matching query terms, best first.
+
+        Ranked by FULLTEXT natural language relevance. Returns None when the
+        FULLTEXT index could not be created, so recall stays vector-only.
+        """
+        if not self.has_fulltext_index():
+            return None
+
+        terms = lexical_terms(query)
+        if not terms:
+            return []
+
+        search = " ".join(terms)
+        rows = (
+            self.conn.execute(
+                """
+                SELECT id
+                  FROM memori_entity_fact
+                 WHERE entity_id = %s
+                   AND MATCH (content) AGAINST (%s IN NATURAL LANGUAGE MODE)
+                 ORDER BY MATCH (content) AGAINST (%s IN NATURAL LANGUAGE MODE) DESC
+                 LIMIT %s
+                """,
+                (entity_id, search, search, limit),
+            )
+            .mappings()
+            .fetchall()
+        )
+        return [row["id"] for row in rows]
+
 
 class Process(BaseProcess):
     def create(self, external_id: str):
@@ -570,9 +785,51 @@ class Session(BaseSession):
 class Schema(BaseSchema):
     def __init__(self, conn: BaseStorageAdapter):
         super().__init__(conn)
+        self.skipped = SchemaSkipped(conn)
         self.version = SchemaVersion(conn)
 
 
+class SchemaSkipped(BaseSchemaSkipped):
+    def create(self, num: int, step: int):
+        self.conn.execute(
+            """
+            INSERT INTO memori_schema_skipped(
+                num,
+                step
+            ) VALUES (
+                %s,
+                %s
+            )
+            """,
+            (num, step),
+        )
+
+    def delete(self, num: int, step: int):
+        self.conn.execute(
+            """
+            DELETE FROM memori_schema_skipped
+             WHERE num = %s
+               AND step = %s
+            """,
+            (num, step),
+        )
+
+    def read(self):
+        results = (
+            self.conn.execute(
+                """
+                SELECT num,
+                       step
+                  FROM memori_schema_skipped
+                """
+            )
+            .mappings()
+            .fetchall()
+        )
+
+        return {(int(row["num"]), int(row["step"])) for row in results}
+
+
 class SchemaVersion(BaseSchemaVersion):
     def create(self, num: int):
         self.conn.execute(
@@ -10,7 +10,9 @@ r"""
 
 from uuid import uuid4
 
+from memori._cache import entity_versions
 from memori.storage._base import (
+    CANDIDATE_ORDER_BY,
     BaseConversation,
     BaseConversationMessage,
     BaseConversationMessages,
@@ -20,9 +22,11 @@ from memori.storage._base import (
     BaseProcess,
     BaseProcessAttribute,
     BaseSchema,
+    BaseSchemaSkipped,
     BaseSchemaVersion,
     BaseSession,
     BaseStorageAdapter,
+    candidate_windows,
 )
 from memori.storage._registry import Registry
 from memori.storage.migrations._oracle import migrations
@@ -216,67 +220,170 @@ class Entity(BaseEntity):
 
 
 class EntityFact(BaseEntityFact):
-    def create(self, entity_id: int, facts: list, fact_embeddings: list | None = None):
+    def create(
+        self,
+        entity_id: int,
+        facts: list,
+        fact_embeddings: list | None = None,
+        embedding_dtype: str = "float32",
+    ):
         if facts is None or len(facts) == 0:
             return self
 
         from memori._utils import generate_uniq
-        from memori.llm._embeddings import format_embedding_for_db
+        from memori.llm._embeddings import (
+            format_embedding_code_for_db,
+            format_embedding_for_db,
+        )
 
         dialect = self.conn.get_dialect()
 
         for i, fact in enumerate(facts):
             embedding = (
                 fact_embeddings[i]
-                if fact_embeddings and i < len(fact_embeddings)
+                if fact_embeddings is not None and i < len(fact_embeddings)
                 else []
             )
-            embedding_formatted = format_embedding_for_db(embedding, dialect)
+            embedding_formatted = format_embedding_for_db(
+                embedding, dialect, embedding_dtype
+            )
             uniq = generate_uniq([fact])
 
             self.conn.execute(
                 """
                 MERGE INTO memori_entity_fact dst
                 USING (SELECT :1 AS uuid, :2 AS entity_id, :3 AS content,
-                              :4 AS content_embedding, :5 AS uniq FROM DUAL) src
+                              :4 AS content_embedding, :5 AS content_embedding_code,
+                              :6 AS uniq FROM DUAL) src
                 ON (dst.entity_id = src.entity_id AND dst.uniq = src.uniq)
                 WHEN MATCHED THEN
                     UPDATE SET num_times = dst.num_times + 1,
                                date_last_time = SYSTIMESTAMP
                 WHEN NOT MATCHED THEN
                     INSERT (uuid, entity_id, content, content_embedding,
-                            num_times, date_last_time, uniq)
+                            content_embedding_code, num_times, date_last_time, uniq)
                     VALUES (src.uuid, src.entity_id, src.content, src.content_embedding,
-                            1, SYSTIMESTAMP, src.uniq)
+                            src.content_embedding_code, 1, SYSTIMESTAMP, src.uniq)
                 """,
                 (
                     str(uuid4()),
                     entity_id,
                     fact,
                     embedding_formatted,
+                    format_embedding_code_for_db(embedding, dialect),
                     uniq,
                 ),
             )
 
         self.conn.commit()
+        entity_versions.bump(entity_id)
         return self
 
-    def get_embeddings(self, entity_id: int, limit: int = 1000):
+    def _select_candidates(self, columns: str, entity_id: int, limit: int, policy: str):
+        # ROWNUM is assigned before ORDER BY, so every window is ordered in
+        # an inline view first.
+        windows = candidate_windows(policy, limit)
+        if len(windows) == 1:
+            window_policy, window_limit = windows[0]
+            query = f"""
+                SELECT {columns}
+                  FROM (
+                        SELECT {columns}
+                          FROM memori_entity_fact
+                         WHERE entity_id = :1
+                         ORDER BY {CANDIDATE_ORDER_BY[window_policy]}
+                       )
+                 WHERE ROWNUM <= :2
+                """  # nosec B608: Safe - only interpolating column and ORDER BY constants
+            return (
+                self.conn.execute(query, (entity_id, window_limit))
+                .mappings()
+                .fetchall()
+            )
+
+        (frequent, frequent_limit), (recent, recent_limit) = windows
+        query = f"""
+                SELECT {columns}
+                  FROM memori_entity_fact
+                 WHERE id IN (
+                        SELECT id
+                          FROM (
+                                SELECT id
+                                  FROM memori_entity_fact
+                                 WHERE entity_id = :1
+                                 ORDER BY {CANDIDATE_ORDER_BY[frequent]}
+                               )
+                         WHERE ROWNUM <= :2
+                         UNION
+                        SELECT id
+                          FROM (
+                                SELECT id
+                                  FROM memori_entity_fact
+                                 WHERE entity_id = :3
+                                 ORDER BY {CANDIDATE_ORDER_BY[recent]}
+                               )
+                         WHERE ROWNUM <= :4
+                       )
+                """  # nosec B608: Safe - only interpolating column and ORDER BY constants
         return (
             self.conn.execute(
-                """
-                SELECT id,
-                       content_embedding
-                  FROM memori_entity_fact
-                 WHERE entity_id = :1
-                   AND ROWNUM <= :2
-                """,
-                (entity_id, limit),
+                query, (entity_id, frequent_limit, entity_id, recent_limit)
             )
             .mappings()
             .fetchall()
         )
 
+    def get_embeddings(
+        self, entity_id: int, limit: int = 1000, policy: str = "frequent"
+    ):
+        return self._select_candidates(
+            "id, content_embedding", entity_id, limit, policy
+        )
+
+    def get_embeddings_bulk(
+        self,
+        entity_id: int,
+        limit: int = 1000,
+        policy: str = "frequent",
+        with_content: bool = False,
+    ):
+        from memori._search import pack_embedding_rows
+
+        if not with_content:
+            return pack_embedding_rows(self.get_embeddings(entity_id, limit, policy))
+
+        return pack_embedding_rows(
+            self._select_candidates(
+                "id, content_embedding, content", entity_id, limit, policy
+            ),
+            with_content=True,
+        )
+
+    def get_embedding_codes_bulk(
+        self, entity_id: int, limit: int = 1000, policy: str = "frequent"
+    ):
+        from memori._search import pack_code_rows
+
+        return pack_code_rows(
+            self._select_candidates(
+                "id, content_embedding_code", entity_id, limit, policy
+            )
+        )
+
+    def get_embeddings_by_ids(self, fact_ids: list[int]):
+        if not fact_ids:
+            return []
+
+        placeholders = ",".join([f":{i + 1}" for i in range(len(fact_ids))])
+        query = f"""
+            SELECT id,
+                   content_embedding
+              FROM memori_entity_fact
+             WHERE id IN ({placeholders})
+        """
+
+        return self.conn.execute(query, tuple(fact_ids)).mappings().fetchall()
+
     def get_facts_by_ids(self, fact_ids: list[int]):
         if not fact_ids:
             return []
@@ -292,6 +399,41 @@ class EntityFact(BaseEntityFact):
 
         return self.conn.execute(query, tuple(fact_ids)).mappings().fetchall()
 
+    def get_ids_by_uniqs(self, entity_id: int, uniqs: list[str]):
+        if not uniqs:
+            return []
+
+        placeholders = ",".join([f":{i + 2}" for i in range(len(uniqs))])
+        query = f"""
+            SELECT id,
+                   uniq
+              FROM memori_entity_fact
+             WHERE entity_id = :1
+               AND uniq IN ({placeholders})
+        """
+
+        return self.conn.execute(query, (entity_id, *uniqs)).mappings().fetchall()
+
+    def increment_num_times(self, entity_id: int, uniqs: list[str]):
+        if not uniqs:
+            return self
+
+        placeholders = ",".join([f":{i + 2}" for i in range(len(uniqs))])
+        self.conn.execute(
+            f"""
+            UPDATE memori_entity_fact
+               SET num_times = num_times + 1,
+                   date_last_time = SYSTIMESTAMP
+             WHERE entity_id = :1
+               AND uniq IN ({placeholders})
+            """,
+            (entity_id, *uniqs),
+        )
+        self.conn.commit()
+
+        entity_versions.bump(entity_id)
+        return self
+
 
 class KnowledgeGraph(BaseKnowledgeGraph):
     def create(self, entity_id: int, semantic_triples: list):
@@ -432,8 +574,38 @@ class KnowledgeGraph(BaseKnowledgeGraph):
                 )
                 self.conn.commit()
 
+        entity_versions.bump(entity_id)
         return self
 
+    def get_edges(self, entity_id: int, limit: int = 10000):
+        return (
+            self.conn.execute(
+                """
+                SELECT subject_name,
+                       predicate,
+                       object_name
+                  FROM (
+                        SELECT s.name AS subject_name,
+                               p.content AS predicate,
+                               o.name AS object_name
+                          FROM memori_knowledge_graph kg
+                          JOIN memori_subject s
+                            ON s.id = kg.subject_id
+                          JOIN memori_predicate p
+                            ON p.id = kg.predicate_id
+                          JOIN memori_object o
+                            ON o.id = kg.object_id
+                         WHERE kg.entity_id = :1
+                         ORDER BY kg.num_times DESC, kg.date_last_time DESC
+                       )
+                 WHERE ROWNUM <= :2
+                """,
+                (entity_id, limit),
+            )
+            .mappings()
+            .fetchall()
+        )
+
 
 class Process(BaseProcess):
     def create(self, external_id: str):
@@ -532,9 +704,51 @@ class Session(BaseSession):
 class Schema(BaseSchema):
     def __init__(self, conn: BaseStorageAdapter):
         super().__init__(conn)
+        self.skipped = SchemaSkipped(conn)
         self.version = SchemaVersion(conn)
 
 
+class SchemaSkipped(BaseSchemaSkipped):
+    def create(self, num: int, step: int):
+        self.conn.execute(
+            """
+            INSERT INTO memori_schema_skipped(
+                num,
+                step
+            ) VALUES (
+                :1,
+                :2
+            )
+            """,
+            (num, step),
+        )
+
+    def delete(self, num: int, step: int):
+        self.conn.execute(
+            """
+            DELETE FROM memori_schema_skipped
+             WHERE num = :1
+               AND step = :2
+            """,
+            (num, step),
+        )
+
+    def read(self):
+        results = (
+            self.conn.execute(
+                """
+                SELECT num,
+                       step
+                  FROM memori_schema_skipped
+                """
+            )
+            .mappings()
+            .fetchall()
+        )
+
+        return {(int(row["num"]), int(row["step"])) for row in results}
+
+
 class SchemaVersion(BaseSchemaVersion):
     def create(self, num: int):
         self.conn.execute(
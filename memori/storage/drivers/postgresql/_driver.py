@@ -8,9 +8,12 @@ r"""
                        memorilabs.ai
 """
 
+import logging
 from uuid import uuid4
 
+from memori._cache import entity_versions
 from memori.storage._base import (
+    CANDIDATE_ORDER_BY,
     BaseConversation,
     BaseConversationMessage,
     BaseConversationMessages,
@@ -20,12 +23,22 @@ from memori.storage._base import (
     BaseProcess,
     BaseProcessAttribute,
     BaseSchema,
+    BaseSchemaSkipped,
     BaseSchemaVersion,
     BaseSession,
     BaseStorageAdapter,
+    candidate_windows,
+    lexical_terms,
 )
 from memori.storage._registry import Registry
-from memori.storage.migrations._postgresql import migrations
+from memori.storage.migrations._postgresql import (
+    EMBEDDING_VECTOR_DIMENSION,
+    migrations,
+)
+
+logger = logging.getLogger(__name__)
+
+_warned_vector_dimensions: set[int] = set()
 
 
 class Conversation(BaseConversation):
@@ -215,24 +228,145 @@ class Entity(BaseEntity):
 
 
 class EntityFact(BaseEntityFact):
-    def create(self, entity_id: int, facts: list, fact_embeddings: list | None = None):
+    def __init__(self, conn: BaseStorageAdapter):
+        super().__init__(conn)
+        self._vector_column: bool | None = None
+
+    def backfill_embedding_vectors(self, batch_size: int = 1000) -> int:
+        """Populate content_embedding_vector for facts written before it existed.
+
+        Returns the number of facts updated. Facts whose embedding does not
+        have EMBEDDING_VECTOR_DIMENSION dimensions are left untouched.
+        """
+        if not self.has_vector_column():
+            return 0
+
+        from memori._search import parse_embedding
+        from memori.llm._embeddings import format_embedding_for_vector
+
+        last_id = 0
+        updated = 0
+        while True:
+            rows = (
+                self.conn.execute(
+                    """
+                    SELECT id,
+                           content_embedding
+                      FROM memori_entity_fact
+                     WHERE content_embedding_vector IS NULL
+                       AND id > %s
+                     ORDER BY id
+                     LIMIT %s
+                    """,
+                    (last_id, batch_size),
+                )
+                .mappings()
+                .fetchall()
+            )
+            if not rows:
+                break
+
+            for row in rows:
+                last_id = row["id"]
+
+                embedding = parse_embedding(row["content_embedding"])
+                if embedding.ndim != 1 or len(embedding) != EMBEDDING_VECTOR_DIMENSION:
+                    continue
+
+                self.conn.execute(
+                    """
+                    UPDATE memori_entity_fact
+                       SET content_embedding_vector = %s::vector
+                     WHERE id = %s
+                    """,
+                    (format_embedding_for_vector(embedding), row["id"]),
+                )
+                updated += 1
+
+            self.conn.commit()
+
+        return updated
+
+    def create(
+        self,
+        entity_id: int,
+        facts: list,
+        fact_embeddings: list | None = None,
+        embedding_dtype: str = "float32",
+    ):
         if facts is None or len(facts) == 0:
             return self
 
         from memori._utils import generate_uniq
-        from memori.llm._embeddings import format_embedding_for_db
+        from memori.llm._embeddings import (
+            format_embedding_code_for_db,
+            format_embedding_for_db,
+            format_embedding_for_vector,
+        )
 
         dialect = self.conn.get_dialect()
+        has_vector_column = self.has_vector_column()
 
         for i, fact in enumerate(facts):
             embedding = (
                 fact_embeddings[i]
-                if fact_embeddings and i < len(fact_embeddings)
+                if fact_embeddings is not None and i < len(fact_embeddings)
                 else []
             )
-            embedding_formatted = format_embedding_for_db(embedding, dialect)
+            embedding_formatted = format_embedding_for_db(
+                embedding, dialect, embedding_dtype
+            )
+            embedding_code = format_embedding_code_for_db(embedding, dialect)
             uniq = generate_uniq([fact])
 
+            if has_vector_column:
+                embedding_vector = None
+                if len(embedding) == EMBEDDING_VECTOR_DIMENSION:
+                    embedding_vector = format_embedding_for_vector(embedding)
+
+                self.conn.execute(
+                    """
+                    INSERT INTO memori_entity_fact(
+                        uuid,
+                        entity_id,
+                        content,
+                        content_embedding,
+                        content_embedding_code,
+                        content_embedding_vector,
+                        num_times,
+                        date_last_time,
+                        uniq
+                    ) VALUES (
+                        %s,
+                        %s,
+                        %s,
+                        %s,
+                        %s,
+                        %s::vector,
+                        1,
+                        CURRENT_TIMESTAMP,
+                        %s
+                    )
+                    ON CONFLICT (entity_id, uniq) DO UPDATE SET
+                        content_embedding_vector = COALESCE(
+                            memori_entity_fact.content_embedding_vector,
+                            EXCLUDED.content_embedding_vector
+                        ),
+                        num_times = memori_entity_fact.num_times + 1,
+                        date_last_time = CURRENT_TIMESTAMP
+                    """,
+                    (
+                        str(uuid4()),
+                        entity_id,
+                        fact,
+                        embedding_formatted,
+                        embedding_code,
+                        embedding_vector,
+                        uniq,
+                    ),
+                )
+                continue
+
             self.conn.execute(
                 """
                 INSERT INTO memori_entity_fact(
@@ -240,6 +374,7 @@ class EntityFact(BaseEntityFact):
                     entity_id,
                     content,
                     content_embedding,
+                    content_embedding_code,
                     num_times,
                     date_last_time,
                     uniq
@@ -248,6 +383,7 @@ class EntityFact(BaseEntityFact):
                     %s,
                     %s,
                     %s,
+                    %s,
                     1,
                     CURRENT_TIMESTAMP,
                     %s
@@ -261,23 +397,139 @@ class EntityFact(BaseEntityFact):
                     entity_id,
                     fact,
                     embedding_formatted,
+                    embedding_code,
                     uniq,
                 ),
             )
 
+        entity_versions.bump(entity_id)
         return self
 
-    def get_embeddings(self, entity_id: int, limit: int = 1000):
+    def _candidates_query(
+        self, columns: str, entity_id: int, limit: int, policy: str
+    ) -> tuple[str, tuple]:
+        windows = candidate_windows(policy, limit)
+        if len(windows) == 1:
+            window_policy, window_limit = windows[0]
+            return (
+                f"""
+                SELECT {columns}
+                  FROM memori_entity_fact
+                 WHERE entity_id = %s
+                 ORDER BY {CANDIDATE_ORDER_BY[window_policy]}
+                 LIMIT %s
+                """,  # nosec B608: Safe - only interpolating column and ORDER BY constants
+                (entity_id, window_limit),
+            )
+
+        (frequent, frequent_limit), (recent, recent_limit) = windows
+        return (
+            f"""
+                SELECT {columns}
+                  FROM memori_entity_fact
+                 WHERE id IN (
+                        SELECT id
+                          FROM (
+                                SELECT id
+                                  FROM memori_entity_fact
+                                 WHERE entity_id = %s
+                                 ORDER BY {CANDIDATE_ORDER_BY[frequent]}
+                                 LIMIT %s
+                               ) f
+                         UNION
+                        SELECT id
+                          FROM (
+                                SELECT id
+                                  FROM memori_entity_fact
+                                 WHERE entity_id = %s
+                                 ORDER BY {CANDIDATE_ORDER_BY[recent]}
+                                 LIMIT %s
+                               ) r
+                       )
+                """,  # nosec B608: Safe - only interpolating column and ORDER BY constants
+            (entity_id, frequent_limit, entity_id, recent_limit),
+        )
+
+    def _aggregate_candidates(
+        self,
+        column: str,
+        entity_id: int,
+        limit: int,
+        policy: str,
+        with_content: bool = False,
+    ) -> dict:
+        columns = f"id, {column} AS value"
+        contents = ""
+        if with_content:
+            columns += ", content"
+            contents = ", array_agg(content ORDER BY id) AS contents"
+
+        candidates, params = self._candidates_query(columns, entity_id, limit, policy)
+        result = (
+            self.conn.execute(
+                f"""
+                SELECT array_agg(id ORDER BY id) AS ids,
+                       array_agg(octet_length(value) ORDER BY id) AS sizes,
+                       string_agg(value, ''::bytea ORDER BY id) AS buffer{contents}
+                  FROM ({candidates}) c
+                """,  # nosec B608: Safe - only interpolating the candidates query
+                params,
+            )
+            .mappings()
+            .fetchone()
+        )
+
+        if result is None or not result["ids"]:
+            bulk = {"ids": [], "sizes": [], "buffer": b""}
+            if with_content:
+                bulk["contents"] = []
+            return bulk
+
+        bulk = {
+            "ids": result["ids"],
+            "sizes": result["sizes"],
+            "buffer": bytes(result["buffer"]),
+        }
+        if with_content:
+            bulk["contents"] = result["contents"]
+        return bulk
+
+    def get_embeddings(
+        self, entity_id: int, limit: int = 1000, policy: str = "frequent"
+    ):
+        query, params = self._candidates_query(
+            "id, content_embedding", entity_id, limit, policy
+        )
+        return self.conn.execute(query, params).mappings().fetchall()
+
+    def get_embeddings_bulk(
+        self,
+        entity_id: int,
+        limit: int = 1000,
+        policy: str = "frequent",
+        with_content: bool = False,
+    ):
+        return self._aggregate_candidates(
+            "content_embedding", entity_id, limit, policy, with_content
+        )
+
+    def get_embedding_codes_bulk(
+        self, entity_id: int, limit: int = 1000, policy: str = "frequent"
+    ):
+        return self._aggregate_candidates(
+            "COALESCE(content_embedding_code, ''::bytea)", entity_id, limit, policy
+        )
+
+    def get_embeddings_by_ids(self, fact_ids: list[int]):
         return (
             self.conn.execute(
                 """
                 SELECT id,
                        content_embedding
                   FROM memori_entity_fact
-                 WHERE entity_id = %s
-                 LIMIT %s
+                 WHERE id = ANY(%s)
                 """,
-                (entity_id, limit),
+                (fact_ids,),
             )
             .mappings()
             .fetchall()
@@ -298,6 +550,178 @@ class EntityFact(BaseEntityFact):
             .fetchall()
         )
 
+    def get_ids_by_uniqs(self, entity_id: int, uniqs: list[str]):
+        if not uniqs:
+            return []
+
+        return (
+            self.conn.execute(
+                """
+                SELECT id,
+                       uniq
+                  FROM memori_entity_fact
+                 WHERE entity_id = %s
+                   AND uniq = ANY(%s)
+                """,
+                (entity_id, uniqs),
+            )
+            .mappings()
+            .fetchall()
+        )
+
+    def increment_num_times(self, entity_id: int, uniqs: list[str]):
+        if not uniqs:
+            return self
+
+        self.conn.execute(
+            """
+            UPDATE memori_entity_fact
+               SET num_times = num_times + 1,
+                   date_last_time = CURRENT_TIMESTAMP
+             WHERE entity_id = %s
+               AND uniq = ANY(%s)
+            """,
+            (entity_id, uniqs),
+        )
+
+        entity_versions.bump(entity_id)
+        return self
+
+    def has_vector_column(self) -> bool:
+        if self._vector_column is None:
+            result = (
+                self.conn.execute(
+                    """
+                    SELECT 1 AS present
+                      FROM information_schema.columns
+                     WHERE table_schema = current_schema()
+                       AND table_name = 'memori_entity_fact'
+                       AND column_name = 'content_embedding_vector'
+                    """
+                )
+                .mappings()
+                .fetchone()
+            )
+            self._vector_column = result is not None
+
+        return self._vector_column
+
+    def search_embeddings(
+        self, entity_id: int, query_embedding: list[float], limit: int
+    ):
+        """Return the top-k facts by cosine similarity, ranked in the database.
+
+        Returns None when the native vector column is unavailable or the query
+        dimension does not match it, so the caller can fall back to scoring
+        embeddings client-side. No rows are returned while any of the entity's
+        facts still lack a vector (see backfill_embedding_vectors).
+
+        On PostgreSQL the entity's facts are scanned exactly: a global HNSW
+        index applies the entity filter after its ``ef_search`` candidates
+        are fetched, which truncates results for all but the largest
+        entities. CockroachDB's vector index is prefixed by entity_id, so it
+        is searched directly.
+        """
+        if len(query_embedding) != EMBEDDING_VECTOR_DIMENSION:
+            if len(query_embedding) not in _warned_vector_dimensions:
+                _warned_vector_dimensions.add(len(query_embedding))
+                logger.warning(
+                    f"Native vector search needs {EMBEDDING_VECTOR_DIMENSION}-"
+                    f"dimensional embeddings, got {len(query_embedding)}; "
+                    "scoring embeddings client-side"
+                )
+            return None
+
+        if not self.has_vector_column():
+            return None
+
+        from memori.llm._embeddings import format_embedding_for_vector
+
+        query_vector = format_embedding_for_vector(query_embedding)
+
+        if self.conn.get_dialect() == "cockroachdb":
+            return (
+                self.conn.execute(
+                    """
+                    SELECT f.id,
+                           f.content,
+                           1 - (f.content_embedding_vector <=> %s::vector) AS similarity
+                      FROM memori_entity_fact f
+                     WHERE f.entity_id = %s
+                       AND f.content_embedding_vector IS NOT NULL
+                       AND NOT EXISTS (
+                               SELECT 1
+                                 FROM memori_entity_fact p
+                                WHERE p.entity_id = %s
+                                  AND p.content_embedding_vector IS NULL
+                           )
+                     ORDER BY f.content_embedding_vector <=> %s::vector
+                     LIMIT %s
+                    """,
+                    (query_vector, entity_id, entity_id, query_vector, limit),
+                )
+                .mappings()
+                .fetchall()
+            )
+
+        return (
+            self.conn.execute(
+                """
+                WITH candidates AS MATERIALIZED (
+                    SELECT f.id,
+                           f.content,
+                           f.content_embedding_vector <=> %s::vector AS distance
+                      FROM memori_entity_fact f
+                     WHERE f.entity_id = %s
+                       AND f.content_embedding_vector IS NOT NULL
+                       AND NOT EXISTS (
+                               SELECT 1
+                                 FROM memori_entity_fact p
+                                WHERE p.entity_id = %s
+                                  AND p.content_embedding_vector IS NULL
+                           )
+                )
+                SELECT id,
+                       content,
+                       1 - distance AS similarity
+                  FROM candidates
+                 ORDER BY distance
+                 LIMIT %s
+                """,
+                (query_vector, entity_id, entity_id, limit),
+            )
+            .mappings()
+            .fetchall()
+        )
+
+    def search_lexical(self, entity_id: int, query: str, limit: int):
+        """Return ids of the entity's facts matching any query term, best first.
+
+        Matches and ranks with to_tsvector('english', content), which is
+        served by idx_memori_entity_fact_content_tsv when it exists.
+        """
+        terms = lexical_terms(query)
+        if not terms:
+            return []
+
+        rows = (
+            self.conn.execute(
+                """
+                SELECT id
+                  FROM memori_entity_fact,
+                       to_tsquery('english', %s) AS q
+                 WHERE entity_id = %s
+                   AND to_tsvector('english', content) @@ q
+                 ORDER BY ts_rank(to_tsvector('english', content), q) DESC
+                 LIMIT %s
+                """,
+                (" | ".join(terms), entity_id, limit),
+            )
+            .mappings()
+            .fetchall()
+        )
+        return [row["id"] for row in rows]
+
 
 class KnowledgeGraph(BaseKnowledgeGraph):
     def create(self, entity_id: int, semantic_triples: list):
@@ -460,8 +884,33 @@ class KnowledgeGraph(BaseKnowledgeGraph):
                     (str(uuid4()), entity_id, subject_id, predicate_id, object_id),
                 )
 
+        entity_versions.bump(entity_id)
         return self
 
+    def get_edges(self, entity_id: int, limit: int = 10000):
+        return (
+            self.conn.execute(
+                """
+                SELECT s.name AS subject_name,
+                       p.content AS predicate,
+                       o.name AS object_name
+                  FROM memori_knowledge_graph kg
+                  JOIN memori_subject s
+                    ON s.id = kg.subject_id
+                  JOIN memori_predicate p
+                    ON p.id = kg.predicate_id
+                  JOIN memori_object o
+                    ON o.id = kg.object_id
+                 WHERE kg.entity_id = %s
+                 ORDER BY kg.num_times DESC, kg.date_last_time DESC
+                 LIMIT %s
+                """,
+                (entity_id, limit),
+            )
+            .mappings()
+            .fetchall()
+        )
+
 
 class Process(BaseProcess):
     def create(self, external_id: str):
@@ -574,9 +1023,51 @@ class Session(BaseSession):
 class Schema(BaseSchema):
     def __init__(self, conn: BaseStorageAdapter):
         super().__init__(conn)
+        self.skipped = SchemaSkipped(conn)
         self.version = SchemaVersion(conn)
 
 
+class SchemaSkipped(BaseSchemaSkipped):
+    def create(self, num: int, step: int):
+        self.conn.execute(
+            """
+            INSERT INTO memori_schema_skipped(
+                num,
+                step
+            ) VALUES (
+                %s,
+                %s
+            )
+            """,
+            (num, step),
+        )
+
+    def delete(self, num: int, step: int):
+        self.conn.execute(
+            """
+            DELETE FROM memori_schema_skipped
+             WHERE num = %s
+               AND step = %s
+            """,
+            (num, step),
+        )
+
+    def read(self):
+        results = (
+            self.conn.execute(
+                """
+                SELECT num,
+                       step
+                  FROM memori_schema_skipped
+                """
+            )
+            .mappings()
+            .fetchall()
+        )
+
+        return {(int(row["num"]), int(row["step"])) for row in results}
+
+
 class SchemaVersion(BaseSchemaVersion):
     def create(self, num: int):
         self.conn.execute(
@@ -8,9 +8,15 @@ r"""
                        memorilabs.ai
 """
 
+import logging
+import sqlite3
 from uuid import uuid4
 
+import numpy as np
+
+from memori._cache import entity_versions
 from memori.storage._base import (
+    CANDIDATE_ORDER_BY,
     BaseConversation,
     BaseConversationMessage,
     BaseConversationMessages,
@@ -20,13 +26,20 @@ from memori.storage._base import (
     BaseProcess,
     BaseProcessAttribute,
     BaseSchema,
+    BaseSchemaSkipped,
     BaseSchemaVersion,
     BaseSession,
     BaseStorageAdapter,
+    candidate_windows,
+    lexical_terms,
 )
 from memori.storage._registry import Registry
 from memori.storage.migrations._sqlite import migrations
 
+logger = logging.getLogger(__name__)
+
+_warned_unreadable_entities: set[int] = set()
+
 
 class Conversation(BaseConversation):
     def __init__(self, conn: BaseStorageAdapter):
@@ -213,21 +226,76 @@ class Entity(BaseEntity):
         )
 
 
+_sqlite_vec_loadable: bool | None = None
+
+
+def load_sqlite_vec(dbapi_conn) -> bool:
+    """Make sqlite-vec's vector functions available on a SQLite connection.
+
+    Returns False when the connection is not a sqlite3 connection, sqlite-vec
+    is not installed, or the Python build cannot load extensions. The last two
+    are remembered so later calls skip the load attempt.
+    """
+    global _sqlite_vec_loadable
+
+    if not isinstance(dbapi_conn, sqlite3.Connection):
+        return False
+
+    try:
+        dbapi_conn.execute("SELECT vec_version()")
+        return True
+    except sqlite3.Error:
+        pass
+
+    if _sqlite_vec_loadable is False:
+        return False
+
+    try:
+        import sqlite_vec
+
+        dbapi_conn.enable_load_extension(True)
+        try:
+            sqlite_vec.load(dbapi_conn)
+        finally:
+            dbapi_conn.enable_load_extension(False)
+    except (AttributeError, ImportError, sqlite3.Error):
+        _sqlite_vec_loadable = False
+        return False
+
+    _sqlite_vec_loadable = True
+    return True
+
+
 class EntityFact(BaseEntityFact):
-    def create(self, entity_id: int, facts: list, fact_embeddings: list | None = None):
+    def __init__(self, conn: BaseStorageAdapter):
+        super().__init__(conn)
+        self._fts_table: bool | None = None
+
+    def create(
+        self,
+        entity_id: int,
+        facts: list,
+        fact_embeddings: list | None = None,
+        embedding_dtype: str = "float32",
+    ):
         if facts is None or len(facts) == 0:
             return self
 
         from memori._utils import generate_uniq
-        from memori.llm._embeddings import format_embedding_for_db
+        from memori.llm._embeddings import (
+            format_embedding_code_for_db,
+            format_embedding_for_db,
+        )
 
         for i, fact in enumerate(facts):
             embedding = (
                 fact_embeddings[i]
-                if fact_embeddings and i < len(fact_embeddings)
+                if fact_embeddings is not None and i < len(fact_embeddings)
                 else []
             )
-            embedding_formatted = format_embedding_for_db(embedding, "sqlite")
+            embedding_formatted = format_embedding_for_db(
+                embedding, "sqlite", embedding_dtype
+            )
             uniq = generate_uniq([fact])
 
             self.conn.execute(
@@ -237,6 +305,7 @@ class EntityFact(BaseEntityFact):
                     entity_id,
                     content,
                     content_embedding,
+                    content_embedding_code,
                     num_times,
                     date_last_time,
                     uniq
@@ -246,6 +315,7 @@ class EntityFact(BaseEntityFact):
                     ?,
                     ?,
                     ?,
+                    ?,
                     datetime('now'),
                     ?
                 )
@@ -258,6 +328,7 @@ class EntityFact(BaseEntityFact):
                     entity_id,
                     fact,
                     embedding_formatted,
+                    format_embedding_code_for_db(embedding, "sqlite"),
                     1,
                     uniq,
                 ),
@@ -265,24 +336,108 @@ class EntityFact(BaseEntityFact):
 
         self.conn.commit()
 
+        entity_versions.bump(entity_id)
         return self
 
-    def get_embeddings(self, entity_id: int, limit: int = 1000):
-        return (
-            self.conn.execute(
-                """
-                SELECT id,
-                       content_embedding
+    def _select_candidates(self, columns: str, entity_id: int, limit: int, policy: str):
+        windows = candidate_windows(policy, limit)
+        if len(windows) == 1:
+            window_policy, window_limit = windows[0]
+            query = f"""
+                SELECT {columns}
                   FROM memori_entity_fact
                  WHERE entity_id = ?
+                 ORDER BY {CANDIDATE_ORDER_BY[window_policy]}
                  LIMIT ?
-                """,
-                (entity_id, limit),
+                """  # nosec B608: Safe - only interpolating column and ORDER BY constants
+            return (
+                self.conn.execute(query, (entity_id, window_limit))
+                .mappings()
+                .fetchall()
+            )
+
+        (frequent, frequent_limit), (recent, recent_limit) = windows
+        query = f"""
+                SELECT {columns}
+                  FROM memori_entity_fact
+                 WHERE id IN (
+                        SELECT id
+                          FROM (
+                                SELECT id
+                                  FROM memori_entity_fact
+                                 WHERE entity_id = ?
+                                 ORDER BY {CANDIDATE_ORDER_BY[frequent]}
+                                 LIMIT ?
+                               ) f
+                         UNION
+                        SELECT id
+                          FROM (
+                                SELECT id
+                                  FROM memori_entity_fact
+                                 WHERE entity_id = ?
+                                 ORDER BY {CANDIDATE_ORDER_BY[recent]}
+                                 LIMIT ?
+                               ) r
+                       )
+                """  # nosec B608: Safe - only interpolating column and ORDER BY constants
+        return (
+            self.conn.execute(
+                query, (entity_id, frequent_limit, entity_id, recent_limit)
             )
             .mappings()
             .fetchall()
         )
 
+    def get_embeddings(
+        self, entity_id: int, limit: int = 1000, policy: str = "frequent"
+    ):
+        return self._select_candidates(
+            "id, content_embedding", entity_id, limit, policy
+        )
+
+    def get_embeddings_bulk(
+        self,
+        entity_id: int,
+        limit: int = 1000,
+        policy: str = "frequent",
+        with_content: bool = False,
+    ):
+        from memori._search import pack_embedding_rows
+
+        if not with_content:
+            return pack_embedding_rows(self.get_embeddings(entity_id, limit, policy))
+
+        return pack_embedding_rows(
+            self._select_candidates(
+                "id, content_embedding, content", entity_id, limit, policy
+            ),
+            with_content=True,
+        )
+
+    def get_embedding_codes_bulk(
+        self, entity_id: int, limit: int = 1000, policy: str = "frequent"
+    ):
+        from memori._search import pack_code_rows
+
+        return pack_code_rows(
+            self._select_candidates(
+                "id, content_embedding_code", entity_id, limit, policy
+            )
+        )
+
+    def get_embeddings_by_ids(self, fact_ids: list[int]):
+        if not fact_ids:
+            return []
+        placeholders = ",".join(["?"] * len(fact_ids))
+
+        query = f"""
+                SELECT id,
+                       content_embedding
+                  FROM memori_entity_fact
+                 WHERE id IN ({placeholders})
+                """  # nosec B608: Safe - only interpolating placeholder count, actual values parameterized
+        return self.conn.execute(query, tuple(fact_ids)).mappings().fetchall()
+
     def get_facts_by_ids(self, fact_ids: list[int]):
         if not fact_ids:
             return []
@@ -296,6 +451,157 @@ class EntityFact(BaseEntityFact):
                 """  # nosec B608: Safe - only interpolating placeholder count, actual values parameterized
         return self.conn.execute(query, tuple(fact_ids)).mappings().fetchall()
 
+    def get_ids_by_uniqs(self, entity_id: int, uniqs: list[str]):
+        if not uniqs:
+            return []
+        placeholders = ",".join(["?"] * len(uniqs))
+
+        query = f"""
+                SELECT id,
+                       uniq
+                  FROM memori_entity_fact
+                 WHERE entity_id = ?
+                   AND uniq IN ({placeholders})
+                """  # nosec B608: Safe - only interpolating placeholder count, actual values parameterized
+        return self.conn.execute(query, (entity_id, *uniqs)).mappings().fetchall()
+
+    def increment_num_times(self, entity_id: int, uniqs: list[str]):
+        if not uniqs:
+            return self
+        placeholders = ",".join(["?"] * len(uniqs))
+
+        query = f"""
+                UPDATE memori_entity_fact
+                   SET num_times = num_times + 1,
+                       date_last_time = datetime('now')
+                 WHERE entity_id = ?
+                   AND uniq IN ({placeholders})
+                """  # nosec B608: Safe - only interpolating placeholder count, actual values parameterized
+        self.conn.execute(query, (entity_id, *uniqs))
+        self.conn.commit()
+
+        entity_versions.bump(entity_id)
+        return self
+
+    def search_embeddings(
+        self, entity_id: int, query_embedding: list[float], limit: int
+    ):
+        """Return the top-k facts by cosine similarity, ranked inside SQLite.
+
+        Requires the sqlite-vec extension. Returns None when it cannot be
+        loaded on the underlying connection, so the caller can fall back to
+        scoring embeddings client-side. Facts whose embeddings sqlite-vec
+        cannot read (float16/int8 storage or another dimension) are left out,
+        and a warning is logged once per entity when there are any.
+        """
+        if not load_sqlite_vec(self.conn.get_dbapi_connection()):
+            return None
+
+        query = np.asarray(query_embedding, dtype="<f4").tobytes()
+
+        rows = (
+            self.conn.execute(
+                """
+                SELECT id,
+                       content,
+                       1.0 - distance AS similarity,
+                       (
+                        SELECT COUNT(*)
+                          FROM memori_entity_fact q
+                         WHERE q.entity_id = ?
+                           AND typeof(q.content_embedding) = 'blob'
+                           AND length(q.content_embedding) != ?
+                       ) AS unreadable
+                  FROM (
+                        SELECT id,
+                               content,
+                               vec_distance_cosine(content_embedding, ?) AS distance
+                          FROM memori_entity_fact
+                         WHERE entity_id = ?
+                           AND typeof(content_embedding) = 'blob'
+                           AND length(content_embedding) = ?
+                       )
+                 WHERE distance IS NOT NULL
+                 ORDER BY distance
+                 LIMIT ?
+                """,
+                (entity_id, len(query), query, entity_id, len(query), limit),
+            )
+            .mappings()
+            .fetchall()
+        )
+
+        if (
+            rows
+            and rows[0]["unreadable"]
+            and entity_id not in _warned_unreadable_entities
+        ):
+            _warned_unreadable_entities.add(entity_id)
+            logger.warning(
+                f"Entity {entity_id} has {rows[0]['unreadable']} facts whose "
+                "embeddings sqlite-vec cannot read (float16/int8 storage or "
+                "another dimension); they are left out of native vector search"
+            )
+
+        return [
+            {
+                "id": row["id"],
+                "content": row["content"],
+                "similarity": row["similarity"],
+            }
+            for row in rows
+        ]
+
+    def has_fts_table(self) -> bool:
+        if self._fts_table is None:
+            result = (
+                self.conn.execute(
+                    """
+                    SELECT 1 AS present
+                      FROM sqlite_master
+                     WHERE type = 'table'
+                       AND name = 'memori_entity_fact_fts'
+                    """
+                )
+                .mappings()
+                .fetchone()
+            )
+            self._fts_table = result is not None
+
+        return self._fts_table
+
+    def search_lexical(self, entity_id: int, query: str, limit: int):
+        """Return ids of the entity's facts matching query terms, best first.
+
+        Ranked by FTS5 bm25 over memori_entity_fact_fts. Returns None when
+        SQLite was built without FTS5, so recall stays vector-only.
+        """
+        if not self.has_fts_table():
+            return None
+
+        terms = lexical_terms(query)
+        if not terms:
+            return []
+
+        rows = (
+            self.conn.execute(
+                """
+                SELECT f.id
+                  FROM memori_entity_fact_fts
+                  JOIN memori_entity_fact f
+                    ON f.id = memori_entity_fact_fts.rowid
+                 WHERE memori_entity_fact_fts MATCH ?
+                   AND f.entity_id = ?
+                 ORDER BY memori_entity_fact_fts.rank
+                 LIMIT ?
+                """,
+                (" OR ".join(f'"{term}"' for term in terms), entity_id, limit),
+            )
+            .mappings()
+            .fetchall()
+        )
+        return [row["id"] for row in rows]
+
 
 class KnowledgeGraph(BaseKnowledgeGraph):
     def create(self, entity_id: int, semantic_triples: list):
@@ -426,8 +732,33 @@ class KnowledgeGraph(BaseKnowledgeGraph):
                 )
                 self.conn.commit()
 
+        entity_versions.bump(entity_id)
         return self
 
+    def get_edges(self, entity_id: int, limit: int = 10000):
+        return (
+            self.conn.execute(
+                """
+                SELECT s.name AS subject_name,
+                       p.content AS predicate,
+                       o.name AS object_name
+                  FROM memori_knowledge_graph kg
+                  JOIN memori_subject s
+                    ON s.id = kg.subject_id
+                  JOIN memori_predicate p
+                    ON p.id = kg.predicate_id
+                  JOIN memori_object o
+                    ON o.id = kg.object_id
+                 WHERE kg.entity_id = ?
+                 ORDER BY kg.num_times DESC, kg.date_last_time DESC
+                 LIMIT ?
+                """,
+                (entity_id, limit),
+            )
+            .mappings()
+            .fetchall()
+        )
+
 
 class Process(BaseProcess):
     def create(self, external_id: str):
@@ -527,9 +858,51 @@ class Session(BaseSession):
 class Schema(BaseSchema):
     def __init__(self, conn: BaseStorageAdapter):
         super().__init__(conn)
+        self.skipped = SchemaSkipped(conn)
         self.version = SchemaVersion(conn)
 
 
+class SchemaSkipped(BaseSchemaSkipped):
+    def create(self, num: int, step: int):
+        self.conn.execute(
+            """
+            INSERT INTO memori_schema_skipped(
+                num,
+                step
+            ) VALUES (
+                ?,
+                ?
+            )
+            """,
+            (num, step),
+        )
+
+    def delete(self, num: int, step: int):
+        self.conn.execute(
+            """
+            DELETE FROM memori_schema_skipped
+             WHERE num = ?
+               AND step = ?
+            """,
+            (num, step),
+        )
+
+    def read(self):
+        results = (
+            self.conn.execute(
+                """
+                SELECT num,
+                       step
+                  FROM memori_schema_skipped
+                """
+            )
+            .mappings()
+            .fetchall()
+        )
+
+        return {(int(row["num"]), int(row["step"])) for row in results}
+
+
 class SchemaVersion(BaseSchemaVersion):
     def create(self, num: int):
         self.conn.execute(
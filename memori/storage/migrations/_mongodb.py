@@ -271,5 +271,66 @@ migrations = {
                 },
             ],
         },
-    ]
+    ],
+    2: [
+        {
+            "description": "create index idx_memori_entity_fact_embedding_recall",
+            "operations": [
+                {
+                    "collection": "memori_entity_fact",
+                    "method": "create_index",
+                    "args": [
+                        [
+                            ("entity_id", 1),
+                            ("num_times", -1),
+                            ("date_last_time", -1),
+                            ("_id", 1),
+                            ("content_embedding", 1),
+                        ]
+                    ],
+                    "kwargs": {"name": "idx_memori_entity_fact_embedding_recall"},
+                },
+            ],
+        },
+    ],
+    3: [
+        {
+            "description": "create index idx_memori_entity_fact_entity_id_recent",
+            "operations": [
+                {
+                    "collection": "memori_entity_fact",
+                    "method": "create_index",
+                    "args": [[("entity_id", 1), ("date_last_time", -1)]],
+                    "kwargs": {"name": "idx_memori_entity_fact_entity_id_recent"},
+                },
+            ],
+        },
+    ],
+    4: [
+        {
+            "description": "create index idx_memori_entity_fact_content_text",
+            "operations": [
+                {
+                    "collection": "memori_entity_fact",
+                    "method": "create_index",
+                    "args": [[("entity_id", 1), ("content", "text")]],
+                    "kwargs": {"name": "idx_memori_entity_fact_content_text"},
+                },
+            ],
+            "optional": True,
+        },
+    ],
+    5: [
+        {
+            "description": "create collection memori_schema_skipped",
+            "operations": [
+                {
+                    "collection": "memori_schema_skipped",
+                    "method": "create_index",
+                    "args": [[("num", 1), ("step", 1)]],
+                    "kwargs": {"unique": True},
+                },
+            ],
+        },
+    ],
 }
@@ -274,5 +274,45 @@ migrations = {
                 )
             """,
         },
-    ]
+    ],
+    2: [
+        {
+            "description": "add column memori_entity_fact.content_embedding_code",
+            "operation": """
+                alter table memori_entity_fact
+                add column content_embedding_code blob default null
+            """,
+        },
+    ],
+    3: [
+        {
+            "description": "create index on memori_entity_fact for recency queries",
+            "operation": """
+                create index idx_memori_entity_fact_entity_id_recent
+                on memori_entity_fact (entity_id, date_last_time desc)
+            """,
+        },
+    ],
+    4: [
+        {
+            "description": "create fulltext index on memori_entity_fact.content",
+            "operation": """
+                create fulltext index idx_memori_entity_fact_content_fts
+                on memori_entity_fact (content)
+            """,
+            "optional": True,
+        },
+    ],
+    5: [
+        {
+            "description": "create table memori_schema_skipped",
+            "operation": """
+                create table if not exists memori_schema_skipped(
+                    num bigint not null,
+                    step bigint not null,
+                    primary key (num, step)
+                )
+            """,
+        },
+    ],
 }
@@ -359,5 +359,62 @@ migrations = {
                 END;
             """,
         },
-    ]
+    ],
+    2: [
+        {
+            "description": "add column memori_entity_fact.content_embedding_code",
+            "operation": """
+                BEGIN
+                    EXECUTE IMMEDIATE '
+                        ALTER TABLE memori_entity_fact
+                        ADD (content_embedding_code BLOB DEFAULT NULL)
+                    ';
+                EXCEPTION
+                    WHEN OTHERS THEN
+                        IF SQLCODE = -1430 THEN NULL;
+                        ELSE RAISE;
+                        END IF;
+                END;
+            """,
+        },
+    ],
+    3: [
+        {
+            "description": "create index on memori_entity_fact for recency queries",
+            "operation": """
+                BEGIN
+                    EXECUTE IMMEDIATE '
+                        CREATE INDEX idx_memori_entity_fact_entity_id_recent
+                        ON memori_entity_fact (entity_id, date_last_time DESC)
+                    ';
+                EXCEPTION
+                    WHEN OTHERS THEN
+                        IF SQLCODE = -955 THEN NULL;
+                        ELSE RAISE;
+                        END IF;
+                END;
+            """,
+        },
+    ],
+    4: [
+        {
+            "description": "create table memori_schema_skipped",
+            "operation": """
+                BEGIN
+                    EXECUTE IMMEDIATE '
+                        CREATE TABLE memori_schema_skipped(
+                            num NUMBER(19) NOT NULL,
+                            step NUMBER(19) NOT NULL,
+                            PRIMARY KEY (num, step)
+                        )
+                    ';
+                EXCEPTION
+                    WHEN OTHERS THEN
+                        IF SQLCODE = -955 THEN NULL;
+                        ELSE RAISE;
+                        END IF;
+                END;
+            """,
+        },
+    ],
 }
@@ -8,6 +8,8 @@ r"""
                        memorilabs.ai
 """
 
+EMBEDDING_VECTOR_DIMENSION = 384
+
 migrations = {
     1: [
         {
@@ -264,5 +266,88 @@ migrations = {
                 )
             """,
         },
-    ]
+    ],
+    2: [
+        {
+            "description": "create extension vector",
+            "operation": "CREATE EXTENSION IF NOT EXISTS vector",
+            "optional": True,
+        },
+        {
+            "description": "add column memori_entity_fact.content_embedding_vector",
+            "operation": f"""
+                ALTER TABLE memori_entity_fact
+                ADD COLUMN IF NOT EXISTS content_embedding_vector VECTOR({EMBEDDING_VECTOR_DIMENSION})
+            """,
+            "optional": True,
+        },
+        {
+            "description": "create index idx_memori_entity_fact_vector_pending",
+            "operation": """
+                CREATE INDEX IF NOT EXISTS idx_memori_entity_fact_vector_pending
+                ON memori_entity_fact (entity_id)
+                WHERE content_embedding_vector IS NULL
+            """,
+            "optional": True,
+        },
+        {
+            "description": "create vector index idx_memori_entity_fact_embedding_vector",
+            "operation": """
+                CREATE VECTOR INDEX IF NOT EXISTS idx_memori_entity_fact_embedding_vector
+                ON memori_entity_fact (entity_id, content_embedding_vector vector_cosine_ops)
+            """,
+            "optional": True,
+            "dialects": ("cockroachdb",),
+        },
+    ],
+    3: [
+        {
+            "description": "add column memori_entity_fact.content_embedding_code",
+            "operation": """
+                ALTER TABLE memori_entity_fact
+                ADD COLUMN IF NOT EXISTS content_embedding_code BYTEA DEFAULT NULL
+            """,
+        },
+    ],
+    4: [
+        {
+            "description": "create index on memori_entity_fact for recency queries",
+            "operation": """
+                CREATE INDEX IF NOT EXISTS idx_memori_entity_fact_entity_id_recent
+                ON memori_entity_fact (entity_id, date_last_time DESC)
+            """,
+        },
+    ],
+    5: [
+        {
+            "description": "create gin index idx_memori_entity_fact_content_tsv",
+            "operation": """
+                CREATE INDEX IF NOT EXISTS idx_memori_entity_fact_content_tsv
+                ON memori_entity_fact
+                USING GIN (to_tsvector('english', content))
+            """,
+            "optional": True,
+        },
+    ],
+    6: [
+        {
+            "description": "create table memori_schema_skipped",
+            "operation": """
+                CREATE TABLE IF NOT EXISTS memori_schema_skipped(
+                    num BIGINT NOT NULL,
+                    step BIGINT NOT NULL,
+                    PRIMARY KEY (num, step)
+                )
+            """,
+        },
+    ],
+    7: [
+        {
+            "description": "drop hnsw index idx_memori_entity_fact_embedding_vector",
+            "operation": """
+                DROP INDEX IF EXISTS idx_memori_entity_fact_embedding_vector
+            """,
+            "dialects": ("postgresql",),
+        },
+    ],
 }
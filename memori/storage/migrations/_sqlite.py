@@ -274,5 +274,96 @@ migrations = {
                 )
             """,
         },
-    ]
+    ],
+    2: [
+        {
+            "description": "add column memori_entity_fact.content_embedding_code",
+            "operation": """
+                ALTER TABLE memori_entity_fact
+                ADD COLUMN content_embedding_code BLOB DEFAULT NULL
+            """,
+        },
+    ],
+    3: [
+        {
+            "description": "create index on memori_entity_fact for recency queries",
+            "operation": """
+                CREATE INDEX IF NOT EXISTS idx_memori_entity_fact_entity_id_recent
+                ON memori_entity_fact (entity_id, date_last_time DESC)
+            """,
+        },
+    ],
+    4: [
+        {
+            "description": "create fts5 table memori_entity_fact_fts",
+            "operation": """
+                CREATE VIRTUAL TABLE IF NOT EXISTS memori_entity_fact_fts
+                USING fts5(
+                    content,
+                    content='memori_entity_fact',
+                    content_rowid='id',
+                    tokenize='porter unicode61'
+                )
+            """,
+            "optional": True,
+        },
+        {
+            "description": "create trigger memori_entity_fact_fts_insert",
+            "operation": """
+                CREATE TRIGGER IF NOT EXISTS memori_entity_fact_fts_insert
+                AFTER INSERT ON memori_entity_fact
+                BEGIN
+                    INSERT INTO memori_entity_fact_fts (rowid, content)
+                    VALUES (new.id, new.content);
+                END
+            """,
+            "optional": True,
+        },
+        {
+            "description": "create trigger memori_entity_fact_fts_delete",
+            "operation": """
+                CREATE TRIGGER IF NOT EXISTS memori_entity_fact_fts_delete
+                AFTER DELETE ON memori_entity_fact
+                BEGIN
+                    INSERT INTO memori_entity_fact_fts (memori_entity_fact_fts, rowid, content)
+                    VALUES ('delete', old.id, old.content);
+                END
+            """,
+            "optional": True,
+        },
+        {
+            "description": "create trigger memori_entity_fact_fts_update",
+            "operation": """
+                CREATE TRIGGER IF NOT EXISTS memori_entity_fact_fts_update
+                AFTER UPDATE OF content ON memori_entity_fact
+                BEGIN
+                    INSERT INTO memori_entity_fact_fts (memori_entity_fact_fts, rowid, content)
+                    VALUES ('delete', old.id, old.content);
+                    INSERT INTO memori_entity_fact_fts (rowid, content)
+                    VALUES (new.id, new.content);
+                END
+            """,
+            "optional": True,
+        },
+        {
+            "description": "populate memori_entity_fact_fts",
+            "operation": """
+                INSERT INTO memori_entity_fact_fts (memori_entity_fact_fts)
+                VALUES ('rebuild')
+            """,
+            "optional": True,
+        },
+    ],
+    5: [
+        {
+            "description": "create table memori_schema_skipped",
+            "operation": """
+                CREATE TABLE IF NOT EXISTS memori_schema_skipped(
+                    num INTEGER NOT NULL,
+                    step INTEGER NOT NULL,
+                    PRIMARY KEY (num, step)
+                )
+            """,
+        },
+    ],
 }
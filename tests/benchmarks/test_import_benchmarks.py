@@ -0,0 +1,32 @@
+"""Guards against regressions in the cost of ``import memori``."""
+
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.mark.benchmark
+def test_import_does_not_load_model_runtime():
+    """The import takes about a second either way, so a time limit would not
+    notice the model runtime being imported eagerly again; check for it."""
+    script = (
+        "import sys\n"
+        "import time\n"
+        "start = time.perf_counter()\n"
+        "import memori\n"
+        "print(time.perf_counter() - start)\n"
+        "print(','.join(m for m in ('sentence_transformers', 'torch') "
+        "if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        check=True,
+        text=True,
+        timeout=120,
+    )
+
+    seconds, loaded = result.stdout.splitlines()[-2:]
+    print(f"[import] import memori took {float(seconds):.3f}s")
+    assert loaded == ""
@@ -2,6 +2,7 @@ import datetime
 import os
 import random
 import statistics
+import time
 from math import sqrt
 from typing import TypedDict
 from uuid import uuid4
@@ -9,6 +10,12 @@ from uuid import uuid4
 import pytest
 
 from memori._config import Config
+from memori._search import (
+    build_entity_index_from_bulk,
+    encode_embedding,
+    pack_embeddings,
+    rescore_facts,
+)
 from memori.llm import _embeddings as embeddings_mod
 from memori.llm._embeddings import embed_texts
 from memori.memory.recall import Recall
@@ -17,6 +24,7 @@ from tests.benchmarks.fixtures.sample_facts import build_user_data
 from tests.benchmarks.semantic_accuracy_dataset import DATASET as CURATED_DATASET
 from tests.benchmarks.semantic_accuracy_metrics import (
     mrr,
+    ndcg_at_k,
 )
 
 
@@ -638,3 +646,250 @@ def test_semantic_recall_accuracy_curated(memori_instance, distractor_count):
             "mrr_mean": statistics.fmean(mrr_scores),
         },
     )
+
+
+def _default_semantic_accuracy_ann_csv_path() -> str:
+    return str(results_dir() / "semantic_accuracy_ann.csv")
+
+
+@pytest.mark.skipif(not _embeddings_available(), reason="Embedding model unavailable")
+@pytest.mark.parametrize(
+    "total_records",
+    [1000, 5000, 20000],
+    ids=lambda n: f"n{n}",
+)
+@pytest.mark.parametrize("mode", ["exact", "hnsw", "ivfpq"])
+def test_semantic_recall_ann_tradeoff(memori_instance, total_records, mode):
+    """
+    Recall-vs-latency trade-off of the approximate recall index.
+
+    The same labeled facts and queries are evaluated with the exact flat index
+    and with each ANN index type forced on, reporting hit@k, nDCG@5 and
+    per-query search latency so the accuracy cost of ANN can be compared.
+    """
+    dataset = _build_semantic_accuracy_dataset_from_sample_facts()
+    corpus_facts = dataset["corpus_facts"]
+    triples: list[tuple[str, str, str]] = build_user_data()["facts"]
+
+    query_count = int(os.environ.get("SEMANTIC_ACCURACY_QUERY_COUNT", "150"))
+    rng = random.Random(int(os.environ.get("SEMANTIC_ACCURACY_BASE_SEED", "123")))
+    queries = _generate_query_set(
+        triples=triples, fact_texts=corpus_facts, rng=rng, query_count=query_count
+    )
+    labeled_norm_set = {fact for expected in queries.values() for fact in expected}
+
+    facts = [f for f in corpus_facts if _strip_id_suffix(f) in labeled_norm_set]
+    facts.extend(
+        _generate_hard_distractors(
+            max(0, total_records - len(facts)), rng=rng, forbidden=labeled_norm_set
+        )
+    )
+    rng.shuffle(facts)
+
+    entity_id = f"semantic-accuracy-ann-{mode}-{total_records}-{uuid4()}"
+    memori_instance.attribution(entity_id=entity_id, process_id="semantic-accuracy")
+    entity_db_id = memori_instance.config.storage.driver.entity.create(entity_id)
+
+    fact_embeddings = embed_texts(
+        facts,
+        model=memori_instance.config.embeddings.model,
+        fallback_dimension=memori_instance.config.embeddings.fallback_dimension,
+    )
+    memori_instance.config.storage.driver.entity_fact.create(
+        entity_db_id, facts, fact_embeddings
+    )
+
+    config = memori_instance.config
+    config.recall_index_cache_max_bytes = 4 * 1024 * 1024 * 1024
+    config.recall_ann.enabled = mode != "exact"
+    config.recall_ann.hnsw_min_facts = 0 if mode == "hnsw" else total_records + 1
+    config.recall_ann.ivfpq_min_facts = 0 if mode == "ivfpq" else total_records + 1
+    recall = Recall(config)
+
+    # Warm the entity index and wait for the background ANN build to finish so
+    # the timed queries measure steady-state search latency.
+    recall.search_facts(query="warm up", limit=5, entity_id=entity_db_id)
+    index = config.recall_index_cache.peek(entity_db_id)
+    if index is not None and index.ann_future is not None:
+        index.ann_future.result()
+
+    hit1: list[float] = []
+    hit5: list[float] = []
+    ndcg5: list[float] = []
+    latencies: list[float] = []
+
+    for query, expected in queries.items():
+        start = time.perf_counter()
+        results = recall.search_facts(query=query, limit=5, entity_id=entity_db_id)
+        latencies.append(time.perf_counter() - start)
+
+        retrieved_norm = [_strip_id_suffix(r.get("content", "")) for r in results]
+        relevant = set(expected)
+        hit1.append(1.0 if any(f in retrieved_norm[:1] for f in relevant) else 0.0)
+        hit5.append(1.0 if any(f in retrieved_norm[:5] for f in relevant) else 0.0)
+        ndcg5.append(ndcg_at_k(relevant, retrieved_norm, 5))
+
+    db_type = getattr(memori_instance, "_benchmark_db_type", "unknown")
+    latency_p50 = statistics.median(latencies)
+    latency_p95 = statistics.quantiles(latencies, n=20)[-1]
+    print(
+        f"[semantic-accuracy-ann] db={db_type} mode={mode} total={len(facts)} "
+        f"hit@1={statistics.fmean(hit1):.3f} "
+        f"hit@5={statistics.fmean(hit5):.3f} "
+        f"ndcg@5={statistics.fmean(ndcg5):.3f} "
+        f"p50_ms={latency_p50 * 1000:.2f} p95_ms={latency_p95 * 1000:.2f}"
+    )
+
+    append_csv_row(
+        os.environ.get("SEMANTIC_ACCURACY_ANN_CSV_PATH")
+        or _default_semantic_accuracy_ann_csv_path(),
+        header=[
+            "timestamp_utc",
+            "run_id",
+            "db",
+            "mode",
+            "total_records",
+            "query_count",
+            "hit1_mean",
+            "hit5_mean",
+            "ndcg5_mean",
+            "latency_p50_seconds",
+            "latency_p95_seconds",
+        ],
+        row={
+            "timestamp_utc": datetime.datetime.now(datetime.UTC).isoformat(),
+            "run_id": str(uuid4()),
+            "db": db_type,
+            "mode": mode,
+            "total_records": len(facts),
+            "query_count": len(queries),
+            "hit1_mean": statistics.fmean(hit1),
+            "hit5_mean": statistics.fmean(hit5),
+            "ndcg5_mean": statistics.fmean(ndcg5),
+            "latency_p50_seconds": latency_p50,
+            "latency_p95_seconds": latency_p95,
+        },
+    )
+
+
+def _default_semantic_accuracy_quantized_csv_path() -> str:
+    return str(results_dir() / "semantic_accuracy_quantized.csv")
+
+
+@pytest.mark.skipif(not _embeddings_available(), reason="Embedding model unavailable")
+@pytest.mark.parametrize(
+    "total_records",
+    [1000, 5000],
+    ids=lambda n: f"n{n}",
+)
+@pytest.mark.parametrize(
+    ("dtype", "rescore_factor"),
+    [("float32", 0), ("float16", 0), ("int8", 0), ("int8", 4)],
+    ids=["float32", "float16", "int8", "int8-rescore4"],
+)
+def test_semantic_recall_quantized_storage(total_records, dtype, rescore_factor):
+    """
+    Accuracy and storage cost of quantized embedding storage.
+
+    Fact embeddings are encoded with the given storage dtype, decoded the way
+    recall reads them and searched in memory, reporting stored bytes per
+    embedding next to hit@k and nDCG@5. With a rescore factor the top
+    limit x factor candidates are re-ranked with full-precision embeddings of
+    their content, as config.recall_rescore_factor does.
+    """
+    dataset = _build_semantic_accuracy_dataset_from_sample_facts()
+    corpus_facts = dataset["corpus_facts"]
+    triples: list[tuple[str, str, str]] = build_user_data()["facts"]
+
+    query_count = int(os.environ.get("SEMANTIC_ACCURACY_QUERY_COUNT", "150"))
+    rng = random.Random(int(os.environ.get("SEMANTIC_ACCURACY_BASE_SEED", "123")))
+    queries = _generate_query_set(
+        triples=triples, fact_texts=corpus_facts, rng=rng, query_count=query_count
+    )
+    labeled_norm_set = {fact for expected in queries.values() for fact in expected}
+
+    facts = [f for f in corpus_facts if _strip_id_suffix(f) in labeled_norm_set]
+    facts.extend(
+        _generate_hard_distractors(
+            max(0, total_records - len(facts)), rng=rng, forbidden=labeled_norm_set
+        )
+    )
+    rng.shuffle(facts)
+
+    cfg = Config()
+    fact_embeddings = embed_texts(
+        facts,
+        model=cfg.embeddings.model,
+        fallback_dimension=cfg.embeddings.fallback_dimension,
+    )
+    raws = [encode_embedding(embedding, dtype) for embedding in fact_embeddings]
+    index = build_entity_index_from_bulk(
+        pack_embeddings(list(range(len(facts))), raws), len(fact_embeddings[0])
+    )
+    search_limit = 5 * rescore_factor if rescore_factor > 1 else 5
+
+    hit1: list[float] = []
+    hit5: list[float] = []
+    ndcg5: list[float] = []
+
+    for query, expected in queries.items():
+        query_embedding = embed_texts(
+            query,
+            model=cfg.embeddings.model,
+            fallback_dimension=cfg.embeddings.fallback_dimension,
+        )[0]
+        candidates = [
+            {"id": fact_id, "content": facts[fact_id], "similarity": similarity}
+            for fact_id, similarity in index.search(query_embedding, search_limit)
+        ]
+        if rescore_factor > 1:
+            candidates = rescore_facts(
+                candidates,
+                query_embedding,
+                [fact_embeddings[c["id"]] for c in candidates],
+                5,
+            )
+
+        retrieved_norm = [_strip_id_suffix(c["content"]) for c in candidates[:5]]
+        relevant = set(expected)
+        hit1.append(1.0 if any(f in retrieved_norm[:1] for f in relevant) else 0.0)
+        hit5.append(1.0 if any(f in retrieved_norm[:5] for f in relevant) else 0.0)
+        ndcg5.append(ndcg_at_k(relevant, retrieved_norm, 5))
+
+    bytes_per_embedding = statistics.fmean(len(raw) for raw in raws)
+    print(
+        f"[semantic-accuracy-quantized] dtype={dtype} rescore={rescore_factor} "
+        f"total={len(facts)} bytes={bytes_per_embedding:.0f} "
+        f"hit@1={statistics.fmean(hit1):.3f} "
+        f"hit@5={statistics.fmean(hit5):.3f} "
+        f"ndcg@5={statistics.fmean(ndcg5):.3f}"
+    )
+
+    append_csv_row(
+        os.environ.get("SEMANTIC_ACCURACY_QUANTIZED_CSV_PATH")
+        or _default_semantic_accuracy_quantized_csv_path(),
+        header=[
+            "timestamp_utc",
+            "run_id",
+            "dtype",
+            "rescore_factor",
+            "total_records",
+            "query_count",
+            "bytes_per_embedding",
+            "hit1_mean",
+            "hit5_mean",
+            "ndcg5_mean",
+        ],
+        row={
+            "timestamp_utc": datetime.datetime.now(datetime.UTC).isoformat(),
+            "run_id": str(uuid4()),
+            "dtype": dtype,
+            "rescore_factor": rescore_factor,
+            "total_records": len(facts),
+            "query_count": len(queries),
+            "bytes_per_embedding": bytes_per_embedding,
+            "hit1_mean": statistics.fmean(hit1),
+            "hit5_mean": statistics.fmean(hit5),
+            "ndcg5_mean": statistics.fmean(ndcg5),
+        },
+    )
@@ -373,3 +373,111 @@ class TestEndToEndRecallBenchmarks:
                 "peak_rss_bytes": benchmark.extra_info.get("peak_rss_bytes", ""),
             },
         )
+
+
+@pytest.fixture(params=[1000, 10000, 50000], ids=["n1000", "n10000", "n50000"])
+def sqlite_entity_with_n_facts(request, tmp_path):
+    """Create a file-backed SQLite database holding one entity with N facts."""
+    import sqlite3
+
+    import numpy as np
+
+    from memori.storage.adapters.dbapi._adapter import Adapter
+    from memori.storage.drivers.sqlite._driver import Driver
+    from memori.storage.migrations._sqlite import migrations
+
+    fact_count = request.param
+    conn = sqlite3.connect(tmp_path / "memori.db")
+    for migration in migrations[1]:
+        conn.executescript(migration.get("operations") or migration.get("operation"))
+
+    driver = Driver(Adapter(lambda: conn))
+    entity_db_id = driver.entity.create("benchmark-entity")
+
+    rng = np.random.default_rng(42)
+    embeddings = rng.standard_normal((fact_count, 384)).astype("<f4")
+    conn.executemany(
+        """
+        INSERT INTO memori_entity_fact(
+            uuid, entity_id, content, content_embedding, num_times,
+            date_last_time, uniq
+        ) VALUES (?, ?, ?, ?, 1, CURRENT_TIMESTAMP, ?)
+        """,
+        (
+            (f"uuid-{i}", entity_db_id, f"fact {i}", embeddings[i].tobytes(), str(i))
+            for i in range(fact_count)
+        ),
+    )
+    conn.commit()
+
+    yield {
+        "driver": driver,
+        "entity_db_id": entity_db_id,
+        "fact_count": fact_count,
+        "query_embedding": rng.standard_normal(384).astype("<f4").tolist(),
+    }
+    conn.close()
+
+
+@pytest.mark.benchmark
+class TestSqliteVectorScanBenchmarks:
+    """In-database SQLite top-k versus fetching every BLOB and scoring with FAISS."""
+
+    def test_benchmark_sqlite_in_db_scan(self, benchmark, sqlite_entity_with_n_facts):
+        data = sqlite_entity_with_n_facts
+        entity_fact_driver = data["driver"].entity_fact
+
+        def _search():
+            return entity_fact_driver.search_embeddings(
+                data["entity_db_id"], data["query_embedding"], 5
+            )
+
+        if _search() is None:
+            pytest.skip("sqlite-vec cannot be loaded on this Python build")
+
+        result = benchmark(_search)
+        assert len(result) == 5
+        _write_benchmark_row(
+            benchmark=benchmark,
+            row={
+                "test": "sqlite_in_db_scan",
+                "db": "sqlite",
+                "fact_count": data["fact_count"],
+                "query_size": "",
+                "retrieval_limit": 5,
+                "one_shot_seconds": "",
+                "peak_rss_bytes": "",
+            },
+        )
+
+    def test_benchmark_sqlite_client_side_scan(
+        self, benchmark, sqlite_entity_with_n_facts
+    ):
+        data = sqlite_entity_with_n_facts
+        entity_fact_driver = data["driver"].entity_fact
+
+        def _search():
+            rows = entity_fact_driver.get_embeddings(
+                data["entity_db_id"], limit=data["fact_count"]
+            )
+            similar = find_similar_embeddings(
+                [(row["id"], row["content_embedding"]) for row in rows],
+                data["query_embedding"],
+                limit=5,
+            )
+            return entity_fact_driver.get_facts_by_ids([i for i, _ in similar])
+
+        result = benchmark(_search)
+        assert len(result) == 5
+        _write_benchmark_row(
+            benchmark=benchmark,
+            row={
+                "test": "sqlite_client_side_scan",
+                "db": "sqlite",
+                "fact_count": data["fact_count"],
+                "query_size": "",
+                "retrieval_limit": 5,
+                "one_shot_seconds": "",
+                "peak_rss_bytes": "",
+            },
+        )
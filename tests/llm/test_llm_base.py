@@ -1,5 +1,6 @@
 import json
-from unittest.mock import Mock, patch
+import sqlite3
+from unittest.mock import AsyncMock, Mock, patch
 
 from memori._config import Config
 from memori.llm._base import BaseInvoke, BaseLlmAdaptor
@@ -8,6 +9,7 @@ from memori.llm._constants import (
     LANGCHAIN_OPENAI_LLM_PROVIDER,
     OPENAI_LLM_PROVIDER,
 )
+from memori.storage import Manager as StorageManager
 from tests.llm.unit_test_objects import UnitTestX, UnitTestY
 
 
@@ -787,3 +789,84 @@ def test_inject_conversation_messages_openai_success():
     assert result["messages"][1]["content"] == "Previous answer"
     assert result["messages"][2]["content"] == "New question"
     assert invoke._injected_message_count == 2
+
+
+async def test_inject_recalled_facts_async_success():
+    config = Config()
+    config.storage = Mock()
+    config.storage.driver = Mock()
+    config.entity_id = "test-entity"
+    invoke = BaseInvoke(config, "test_method")
+
+    kwargs = {"messages": [{"role": "user", "content": "What do I like?"}]}
+
+    with patch(
+        "memori.memory.recall.Recall.search_facts_async",
+        new=AsyncMock(
+            return_value=[{"content": "User likes pizza", "similarity": 0.9}]
+        ),
+    ) as mock_search:
+        result = await invoke.inject_recalled_facts_async(kwargs)
+
+    mock_search.assert_awaited_once_with("What do I like?")
+    config.storage.driver.entity.create.assert_not_called()
+    assert len(result["messages"]) == 2
+    assert "User likes pizza" in result["messages"][0]["content"]
+
+
+async def test_inject_recalled_facts_async_no_user_query():
+    config = Config()
+    config.storage = Mock()
+    config.storage.driver = Mock()
+    config.entity_id = "test-entity"
+    invoke = BaseInvoke(config, "test_method")
+
+    kwargs = {"messages": [{"role": "system", "content": "You are helpful"}]}
+    result = await invoke.inject_recalled_facts_async(kwargs)
+
+    assert result == kwargs
+    config.storage.driver.entity.create.assert_not_called()
+
+
+def _sqlite_config(tmp_path):
+    path = tmp_path / "memori.db"
+    config = Config()
+    config.entity_id = "user-1"
+    config.storage = StorageManager(config).start(lambda: sqlite3.connect(path))
+    config.storage.build()
+    return config
+
+
+async def test_inject_recalled_facts_async_with_sqlite_connection(tmp_path):
+    config = _sqlite_config(tmp_path)
+    driver = config.storage.driver
+    driver.entity_fact.create(
+        driver.entity.create("user-1"), ["User likes pizza"], [[1.0, 0.0]]
+    )
+    config.framework.provider = None
+    config.llm.provider = OPENAI_LLM_PROVIDER
+    invoke = BaseInvoke(config, "test_method")
+
+    kwargs = {"messages": [{"role": "user", "content": "What do I like?"}]}
+    with patch("memori.memory.recall.embed_queries_array", return_value=[[1.0, 0.0]]):
+        result = await invoke.inject_recalled_facts_async(kwargs)
+
+    assert "User likes pizza" in result["messages"][0]["content"]
+
+
+async def test_inject_conversation_messages_async(tmp_path):
+    config = _sqlite_config(tmp_path)
+    driver = config.storage.driver
+    session_id = driver.session.create(config.session_id, None, None)
+    conversation_id = driver.conversation.create(session_id, 1800)
+    driver.conversation.message.create(conversation_id, "user", None, "Earlier")
+    config.storage.adapter.commit()
+    config.cache.conversation_id = conversation_id
+    config.framework.provider = None
+    config.llm.provider = OPENAI_LLM_PROVIDER
+    invoke = BaseInvoke(config, "test_method")
+
+    kwargs = {"messages": [{"role": "user", "content": "Hello"}]}
+    result = await invoke.inject_conversation_messages_async(kwargs)
+
+    assert [m["content"] for m in result["messages"]] == ["Earlier", "Hello"]
@@ -9,17 +9,29 @@ r"""
 """
 
 import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch
 
 import numpy as np
 import pytest
 
-from memori._config import Config
+from memori._config import Config, EmbeddingsBatching
 from memori.llm._embeddings import (
+    EmbeddingScheduler,
+    QueryEmbeddingCache,
     _get_model,
+    embed_queries,
+    embed_queries_array,
+    embed_rescore_array,
     embed_texts,
+    embed_texts_array,
+    embed_texts_array_async,
     embed_texts_async,
     format_embedding_for_db,
+    format_embedding_for_vector,
+    query_embedding_cache,
+    rescore_embedding_cache,
 )
 
 
@@ -31,6 +43,17 @@ def test_format_embedding_for_db_mysql():
     assert list(unpacked) == pytest.approx(embedding)
 
 
+def test_format_embedding_for_db_float16():
+    result = format_embedding_for_db([1.0, 2.0, 3.0], "sqlite", "float16")
+    assert isinstance(result, bytes)
+    assert len(result) == 4 + 3 * 2
+
+
+def test_format_embedding_for_vector():
+    assert format_embedding_for_vector([1, 0.5, -2.25]) == "[1.0,0.5,-2.25]"
+    assert format_embedding_for_vector(np.array([0.5], dtype=np.float32)) == "[0.5]"
+
+
 def test_format_embedding_for_db_postgresql():
     embedding = [1.0, 2.0, 3.0]
     result = format_embedding_for_db(embedding, "postgresql")
@@ -106,8 +129,14 @@ def test_format_embedding_for_db_high_dimensional():
     assert list(unpacked_postgres) == pytest.approx(embedding)
 
 
+def test_format_embedding_for_db_float32_array_row():
+    embeddings = np.array([[1.0, 2.0], [3.0, 4.0]], dtype=np.float32)
+    result = format_embedding_for_db(embeddings[1], "sqlite")
+    assert result == struct.pack("<2f", 3.0, 4.0)
+
+
 def test_get_model_caches_model():
-    with patch("memori.llm._embeddings.SentenceTransformer") as mock_transformer:
+    with patch("sentence_transformers.SentenceTransformer") as mock_transformer:
         mock_model = Mock()
         mock_transformer.return_value = mock_model
 
@@ -118,8 +147,25 @@ def test_get_model_caches_model():
         mock_transformer.assert_called_once_with("test-model")
 
 
+def test_get_model_loads_once_under_concurrent_calls():
+    def load(model_name):
+        time.sleep(0.05)
+        return Mock()
+
+    with patch(
+        "sentence_transformers.SentenceTransformer", side_effect=load
+    ) as mock_transformer:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            models = list(
+                executor.map(lambda _: _get_model("concurrent-model"), range(4))
+            )
+
+    assert all(model is models[0] for model in models)
+    mock_transformer.assert_called_once_with("concurrent-model")
+
+
 def test_get_model_different_models():
-    with patch("memori.llm._embeddings.SentenceTransformer") as mock_transformer:
+    with patch("sentence_transformers.SentenceTransformer") as mock_transformer:
         mock_model_1 = Mock()
         mock_model_2 = Mock()
         mock_transformer.side_effect = [mock_model_1, mock_model_2]
@@ -226,7 +272,7 @@ def test_embed_texts_custom_model():
 
         result = embed_texts("test", model="custom-model", fallback_dimension=1024)
 
-        mock_get_model.assert_called_once_with("custom-model")
+        mock_get_model.assert_called_once_with("custom-model", None)
         assert len(result) == 1
 
 
@@ -312,7 +358,7 @@ def test_embed_texts_model_load_value_error():
 @pytest.mark.asyncio
 async def test_embed_texts_async_single_string():
     cfg = Config()
-    mock_result = [[0.1, 0.2, 0.3]]
+    mock_result = np.array([[0.1, 0.2, 0.3]], dtype=np.float32)
 
     async def mock_run_in_executor(executor, func, *args):
         return mock_result
@@ -333,7 +379,7 @@ async def test_embed_texts_async_single_string():
 @pytest.mark.asyncio
 async def test_embed_texts_async_list():
     cfg = Config()
-    mock_result = [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]]
+    mock_result = np.array([[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]], dtype=np.float32)
 
     async def mock_run_in_executor(executor, func, *args):
         return mock_result
@@ -354,7 +400,7 @@ async def test_embed_texts_async_list():
 
 @pytest.mark.asyncio
 async def test_embed_texts_async_custom_model():
-    mock_result = [[0.1, 0.2, 0.3]]
+    mock_result = np.array([[0.1, 0.2, 0.3]], dtype=np.float32)
 
     async def mock_run_in_executor(executor, func, *args):
         return mock_result
@@ -368,3 +414,272 @@ async def test_embed_texts_async_custom_model():
 
         assert len(result) == 1
         assert result[0] == pytest.approx([0.1, 0.2, 0.3])
+
+
+def test_embed_texts_array_returns_float32_matrix():
+    with patch("memori.llm._embeddings._get_model") as mock_get_model:
+        mock_model = Mock()
+        mock_model.encode.return_value = np.array([[0.5, 1.5], [2.5, 3.5]])
+        mock_get_model.return_value = mock_model
+
+        result = embed_texts_array(
+            ["a", "b"], model="array-model", fallback_dimension=2
+        )
+
+    assert isinstance(result, np.ndarray)
+    assert result.dtype == np.float32
+    assert result.tolist() == [[0.5, 1.5], [2.5, 3.5]]
+
+
+def test_embed_texts_array_fallback_and_empty_inputs():
+    with patch("memori.llm._embeddings._get_model", side_effect=OSError):
+        fallback = embed_texts_array(["a"], model="missing", fallback_dimension=3)
+
+    assert fallback.dtype == np.float32
+    assert fallback.shape == (1, 3)
+    assert not fallback.any()
+    assert embed_texts_array([], model="missing", fallback_dimension=3).shape == (0, 3)
+
+
+async def test_embed_texts_array_async_returns_float32_matrix():
+    with patch("memori.llm._embeddings._get_model") as mock_get_model:
+        mock_model = Mock()
+        mock_model.encode.return_value = np.array([[1.0, 2.0]])
+        mock_get_model.return_value = mock_model
+
+        result = await embed_texts_array_async(
+            "a", model="array-model", fallback_dimension=2
+        )
+
+    assert result.dtype == np.float32
+    assert result.tolist() == [[1.0, 2.0]]
+
+
+def test_embed_queries_encodes_only_uncached_texts():
+    query_embedding_cache.clear()
+    with patch("memori.llm._embeddings._get_model") as mock_get_model:
+        mock_model = Mock()
+        mock_model.encode.side_effect = [
+            np.array([[0.1, 0.2], [0.3, 0.4]]),
+            np.array([[0.5, 0.6]]),
+        ]
+        mock_get_model.return_value = mock_model
+
+        first = embed_queries(
+            ["a", "b", "a"], model="cache-model", fallback_dimension=2
+        )
+        second = embed_queries(["b", "c"], model="cache-model", fallback_dimension=2)
+
+    assert first[0] == first[2] == pytest.approx([0.1, 0.2])
+    assert second == [pytest.approx([0.3, 0.4]), pytest.approx([0.5, 0.6])]
+    assert mock_model.encode.call_args_list[0][0][0] == ["a", "b"]
+    assert mock_model.encode.call_args_list[1][0][0] == ["c"]
+    assert query_embedding_cache.stats()["entries"] == 3
+
+
+def test_embed_queries_array_returns_float32_rows_from_cache():
+    query_embedding_cache.clear()
+    with patch("memori.llm._embeddings._get_model") as mock_get_model:
+        mock_model = Mock()
+        mock_model.encode.side_effect = [np.array([[0.1, 0.2]]), np.array([[0.3, 0.4]])]
+        mock_get_model.return_value = mock_model
+
+        embed_queries_array("a", model="array-model", fallback_dimension=2)
+        result = embed_queries_array(
+            ["b", "a"], model="array-model", fallback_dimension=2
+        )
+
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result, [[0.3, 0.4], [0.1, 0.2]], rtol=1e-6)
+    assert embed_queries_array([], model="array-model", fallback_dimension=2).shape == (
+        0,
+        2,
+    )
+
+
+def test_embed_queries_keys_by_model():
+    query_embedding_cache.clear()
+    with patch("memori.llm._embeddings._get_model") as mock_get_model:
+        mock_model = Mock()
+        mock_model.encode.side_effect = [np.array([[1.0]]), np.array([[2.0]])]
+        mock_get_model.return_value = mock_model
+
+        assert embed_queries("q", model="model-a", fallback_dimension=1) == [[1.0]]
+        assert embed_queries("q", model="model-b", fallback_dimension=1) == [[2.0]]
+
+
+def test_embed_queries_does_not_cache_fallback_vectors():
+    query_embedding_cache.clear()
+    with patch("memori.llm._embeddings._get_model", side_effect=OSError):
+        assert embed_queries("q", model="missing", fallback_dimension=3) == [
+            [0.0, 0.0, 0.0]
+        ]
+
+    assert len(query_embedding_cache) == 0
+
+
+def test_embed_rescore_array_encodes_each_fact_once(tmp_path):
+    from memori._config import EmbeddingsStore
+
+    store = EmbeddingsStore()
+    store.enabled = True
+    store.path = str(tmp_path)
+    rescore_embedding_cache.clear()
+
+    with patch("memori.llm._embeddings._get_model") as mock_get_model:
+        mock_model = Mock()
+        mock_model.encode.side_effect = [
+            np.array([[1.0, 0.0], [0.0, 1.0]]),
+            np.array([[0.5, 0.5]]),
+        ]
+        mock_get_model.return_value = mock_model
+
+        first = embed_rescore_array(["a", "b"], "model", 2, store=store)
+        second = embed_rescore_array(["b", "c", "a"], "model", 2, store=store)
+        rescore_embedding_cache.clear()
+        third = embed_rescore_array(["c"], "model", 2, store=store)
+
+    assert first.tolist() == [[1.0, 0.0], [0.0, 1.0]]
+    assert second.tolist() == [[0.0, 1.0], [0.5, 0.5], [1.0, 0.0]]
+    assert third.tolist() == [[0.5, 0.5]]
+    assert [call.args[0] for call in mock_model.encode.call_args_list] == [
+        ["a", "b"],
+        ["c"],
+    ]
+
+
+def test_query_embedding_cache_lru_and_stats():
+    cache = QueryEmbeddingCache(max_entries=2)
+    cache.put("m", "a", [1.0, 2.0])
+    cache.put("m", "b", [3.0, 4.0])
+    assert cache.get("m", "a") is not None
+    cache.put("m", "c", [5.0, 6.0])
+
+    assert cache.get("m", "b") is None
+    assert cache.get("m", "a").dtype == np.float32
+    assert cache.stats() == {
+        "entries": 2,
+        "evictions": 1,
+        "hits": 2,
+        "misses": 1,
+        "nbytes": 16,
+    }
+
+    cache.max_entries = 0
+    cache.put("m", "d", [7.0, 8.0])
+    assert cache.get("m", "d") is None
+
+
+def _batching(max_batch_size=4, max_wait_seconds=5.0):
+    batching = EmbeddingsBatching()
+    batching.enabled = True
+    batching.max_batch_size = max_batch_size
+    batching.max_wait_seconds = max_wait_seconds
+    return batching
+
+
+def _encode_lengths(texts, **kwargs):
+    return np.array([[float(len(text)), 1.0] for text in texts])
+
+
+def test_embed_texts_batches_concurrent_callers():
+    scheduler = EmbeddingScheduler()
+    with (
+        patch("memori.llm._embeddings.embedding_scheduler", scheduler),
+        patch("memori.llm._embeddings._get_model") as mock_get_model,
+    ):
+        mock_model = Mock()
+        mock_model.encode.side_effect = _encode_lengths
+        mock_get_model.return_value = mock_model
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(
+                executor.map(
+                    lambda texts: embed_texts(
+                        texts, "batch-model", 2, batching=_batching()
+                    ),
+                    [["a"], ["bb", "a"], ["ccc"]],
+                )
+            )
+
+    assert results == [[[1.0, 1.0]], [[2.0, 1.0], [1.0, 1.0]], [[3.0, 1.0]]]
+    mock_model.encode.assert_called_once()
+    assert sorted(mock_model.encode.call_args[0][0]) == ["a", "bb", "ccc"]
+    assert scheduler.stats() == {
+        "batches": 1,
+        "pending": 0,
+        "requests": 3,
+        "texts": 4,
+    }
+
+
+def test_embed_texts_batch_flushes_after_max_wait():
+    scheduler = EmbeddingScheduler()
+    with (
+        patch("memori.llm._embeddings.embedding_scheduler", scheduler),
+        patch("memori.llm._embeddings._get_model") as mock_get_model,
+    ):
+        mock_model = Mock()
+        mock_model.encode.side_effect = _encode_lengths
+        mock_get_model.return_value = mock_model
+
+        batching = _batching(max_wait_seconds=0.001)
+        assert embed_texts("a", "batch-model", 2, batching=batching) == [[1.0, 1.0]]
+
+    assert scheduler.stats()["batches"] == 1
+
+
+def test_embedding_scheduler_splits_batches_and_models():
+    scheduler = EmbeddingScheduler()
+    with patch("memori.llm._embeddings._get_model") as mock_get_model:
+        mock_model = Mock()
+        mock_model.encode.side_effect = _encode_lengths
+        mock_get_model.return_value = mock_model
+
+        with scheduler.condition:
+            futures = [
+                scheduler.submit(["a", "b"], "model-a", 2, 3, 0.001),
+                scheduler.submit(["cc"], "model-b", 2, 3, 0.001),
+                scheduler.submit(["d", "e"], "model-a", 2, 3, 0.001),
+            ]
+
+        results = [future.result(timeout=5) for future in futures]
+
+    assert results[1].tolist() == [[2.0, 1.0]]
+    assert [args[0] for args, _ in mock_model.encode.call_args_list] == [
+        ["a", "b"],
+        ["cc"],
+        ["d", "e"],
+    ]
+    assert scheduler.stats()["batches"] == 3
+
+
+def test_embed_texts_large_requests_bypass_scheduler():
+    scheduler = EmbeddingScheduler()
+    with (
+        patch("memori.llm._embeddings.embedding_scheduler", scheduler),
+        patch("memori.llm._embeddings._get_model") as mock_get_model,
+    ):
+        mock_model = Mock()
+        mock_model.encode.side_effect = _encode_lengths
+        mock_get_model.return_value = mock_model
+
+        result = embed_texts(
+            ["a", "b"], "batch-model", 2, batching=_batching(max_batch_size=2)
+        )
+
+    assert len(result) == 2
+    assert scheduler.worker is None
+
+
+def test_embedding_scheduler_propagates_encode_errors():
+    scheduler = EmbeddingScheduler()
+    with patch("memori.llm._embeddings._get_model") as mock_get_model:
+        mock_model = Mock()
+        mock_model.encode.side_effect = ValueError("bad input")
+        mock_get_model.return_value = mock_model
+
+        future = scheduler.submit(["a"], "batch-model", 2, 4, 0.001)
+
+        with pytest.raises(ValueError, match="bad input"):
+            future.result(timeout=5)
@@ -4,7 +4,7 @@ from memori.llm._embeddings import _get_model
 
 
 def test_get_model_downloads_from_huggingface():
-    with patch("memori.llm._embeddings.SentenceTransformer") as mock_transformer:
+    with patch("sentence_transformers.SentenceTransformer") as mock_transformer:
         mock_model = Mock()
         mock_transformer.return_value = mock_model
 
@@ -19,7 +19,7 @@ def test_get_model_downloads_from_huggingface():
 
 
 def test_get_model_caching():
-    with patch("memori.llm._embeddings.SentenceTransformer") as mock_transformer:
+    with patch("sentence_transformers.SentenceTransformer") as mock_transformer:
         mock_model = Mock()
         mock_transformer.return_value = mock_model
 
@@ -35,7 +35,7 @@ def test_get_model_caching():
 
 
 def test_get_model_different_models():
-    with patch("memori.llm._embeddings.SentenceTransformer") as mock_transformer:
+    with patch("sentence_transformers.SentenceTransformer") as mock_transformer:
         mock_model1 = Mock()
         mock_model2 = Mock()
         mock_transformer.side_effect = [mock_model1, mock_model2]
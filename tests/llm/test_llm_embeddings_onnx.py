@@ -0,0 +1,135 @@
+import json
+import sys
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+from memori._config import EmbeddingsOnnx
+from memori.llm import _embeddings
+from memori.llm._embeddings import _get_model, embed_queries, query_embedding_cache
+from memori.llm._onnx import OnnxEncoder, _pipeline_config, load_onnx_encoder
+
+
+def _tokenizer(ids, masks):
+    tokenizer = Mock()
+    tokenizer.encode_batch.return_value = [
+        SimpleNamespace(ids=i, attention_mask=m, type_ids=[0] * len(i))
+        for i, m in zip(ids, masks, strict=True)
+    ]
+    return tokenizer
+
+
+def _session(output, inputs=("input_ids", "attention_mask")):
+    session = Mock()
+    session.get_inputs.return_value = [SimpleNamespace(name=name) for name in inputs]
+    session.run.return_value = [np.array(output, dtype=np.float32)]
+    return session
+
+
+def _onnx(enabled=True, quantize=False):
+    onnx = EmbeddingsOnnx()
+    onnx.enabled = enabled
+    onnx.quantize = quantize
+    return onnx
+
+
+def test_onnx_encoder_mean_pools_masked_tokens_and_normalizes():
+    session = _session([[[3.0, 0.0], [0.0, 4.0], [100.0, 100.0]]])
+    encoder = OnnxEncoder(session, _tokenizer([[1, 2, 0]], [[1, 1, 0]]))
+
+    embeddings = encoder.encode(["hello"])
+
+    assert embeddings.dtype == np.float32
+    assert embeddings[0] == pytest.approx([0.6, 0.8])
+    assert encoder.get_sentence_embedding_dimension() == 2
+    assert set(session.run.call_args[0][1]) == {"input_ids", "attention_mask"}
+
+
+def test_onnx_encoder_feeds_token_type_ids_when_declared():
+    session = _session(
+        [[1.0, 0.0]], inputs=("input_ids", "attention_mask", "token_type_ids")
+    )
+    encoder = OnnxEncoder(session, _tokenizer([[1]], [[1]]), normalize=False)
+
+    assert encoder.encode(["hello"])[0] == pytest.approx([1.0, 0.0])
+    assert session.run.call_args[0][1]["token_type_ids"].tolist() == [[0]]
+
+
+def test_onnx_encoder_cls_and_max_pooling():
+    output = [[[1.0, 5.0], [3.0, 2.0], [9.0, 9.0]]]
+    tokenizer = _tokenizer([[1, 2, 0]], [[1, 1, 0]])
+
+    cls = OnnxEncoder(_session(output), tokenizer, pooling="cls", normalize=False)
+    assert cls.encode(["a"])[0] == pytest.approx([1.0, 5.0])
+
+    pooled = OnnxEncoder(_session(output), tokenizer, pooling="max", normalize=False)
+    assert pooled.encode(["a"])[0] == pytest.approx([3.0, 5.0])
+
+
+def test_pipeline_config_reads_sentence_transformers_modules(tmp_path):
+    (tmp_path / "1_Pooling").mkdir()
+    (tmp_path / "modules.json").write_text(
+        json.dumps(
+            [
+                {"path": "", "type": "sentence_transformers.models.Transformer"},
+                {"path": "1_Pooling", "type": "sentence_transformers.models.Pooling"},
+                {
+                    "path": "2_Normalize",
+                    "type": "sentence_transformers.models.Normalize",
+                },
+            ]
+        )
+    )
+    (tmp_path / "1_Pooling" / "config.json").write_text(
+        json.dumps({"word_embedding_dimension": 384, "pooling_mode_cls_token": True})
+    )
+
+    assert _pipeline_config(tmp_path) == ("cls", True, 384)
+
+
+def test_pipeline_config_rejects_dense_modules(tmp_path):
+    (tmp_path / "modules.json").write_text(
+        json.dumps([{"path": "2_Dense", "type": "sentence_transformers.models.Dense"}])
+    )
+
+    with pytest.raises(ValueError, match="Dense"):
+        _pipeline_config(tmp_path)
+
+
+def test_load_onnx_encoder_requires_onnxruntime():
+    with patch.dict(sys.modules, {"onnxruntime": None}):
+        with pytest.raises(ImportError, match="pip install onnxruntime"):
+            load_onnx_encoder("all-MiniLM-L6-v2", _onnx())
+
+
+def test_get_model_loads_onnx_encoder_per_backend():
+    _embeddings._MODEL_CACHE.clear()
+    with (
+        patch("memori.llm._onnx.load_onnx_encoder") as mock_load,
+        patch("sentence_transformers.SentenceTransformer") as mock_transformer,
+    ):
+        onnx = _onnx()
+        assert _get_model("model", onnx) is _get_model("model", onnx)
+        assert _get_model("model", _onnx(quantize=True)) is not None
+        _get_model("model", _onnx(enabled=False))
+
+    assert mock_load.call_count == 2
+    mock_transformer.assert_called_once_with("model")
+    _embeddings._MODEL_CACHE.clear()
+
+
+def test_embed_queries_caches_backends_separately():
+    query_embedding_cache.clear()
+    with patch("memori.llm._embeddings._get_model") as mock_get_model:
+        mock_model = Mock()
+        mock_model.encode.side_effect = [np.array([[1.0]]), np.array([[2.0]])]
+        mock_get_model.return_value = mock_model
+
+        assert embed_queries("q", model="m", fallback_dimension=1) == [[1.0]]
+        assert embed_queries("q", model="m", fallback_dimension=1, onnx=_onnx()) == [
+            [2.0]
+        ]
+
+    assert mock_get_model.call_args_list[1][0][1].enabled is True
@@ -0,0 +1,133 @@
+import asyncio
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+from memori._config import EmbeddingsProcessPool
+from memori.llm._embedding_pool import (
+    SHARED_MEMORY_MIN_BYTES,
+    EmbeddingProcessPool,
+    _encode_in_worker,
+    _read_result,
+)
+from memori.llm._embeddings import embed_texts_async
+
+
+def test_encode_in_worker_returns_small_results_inline():
+    with patch(
+        "memori.llm._embedding_pool._encode_array",
+        return_value=np.array([[1.0, 2.0]], dtype=np.float32),
+    ) as mock_encode:
+        result = _encode_in_worker(["a"], "model", 2)
+
+    mock_encode.assert_called_once_with(["a"], "model", 2, None)
+    assert isinstance(result, np.ndarray)
+    assert result.dtype == np.float32
+    assert _read_result(result).tolist() == [[1.0, 2.0]]
+
+
+def test_encode_in_worker_returns_large_results_in_shared_memory():
+    rows = SHARED_MEMORY_MIN_BYTES // (4 * 8) + 1
+    vectors = np.arange(rows * 8, dtype=np.float32).reshape(rows, 8)
+
+    with patch("memori.llm._embedding_pool._encode_array", return_value=vectors):
+        result = _encode_in_worker(["a"] * rows, "model", 8)
+
+    name, shape = result
+    assert shape == (rows, 8)
+    np.testing.assert_array_equal(_read_result(result), vectors)
+
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+
+def test_embedding_process_pool_encodes_in_workers_and_shuts_down():
+    pool = EmbeddingProcessPool()
+    rows = SHARED_MEMORY_MIN_BYTES // (4 * 16) + 1
+
+    try:
+        result = pool.embed(
+            [f"text {i}" for i in range(rows)], "/nonexistent/memori-model", 16, 1
+        )
+        executor = pool.executor
+    finally:
+        pool.shutdown()
+
+    assert result.shape == (rows, 16)
+    assert result.dtype == np.float32
+    assert not result.any()
+    assert executor is not None
+    assert pool.executor is None
+
+
+def test_embedding_process_pool_replaces_pool_on_resize():
+    pool = EmbeddingProcessPool()
+    with patch("memori.llm._embedding_pool.ProcessPoolExecutor") as mock_executor:
+        first = pool.get_executor(1)
+        assert pool.get_executor(1) is first
+        pool.get_executor(2)
+
+    first.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+    assert mock_executor.call_count == 2
+    assert pool.workers == 2
+
+
+def test_embedding_process_pool_falls_back_when_broken():
+    pool = EmbeddingProcessPool()
+    executor = Mock()
+    executor.submit.return_value.result.side_effect = BrokenProcessPool("died")
+    pool.executor, pool.workers = executor, 1
+
+    with patch(
+        "memori.llm._embedding_pool._encode_array",
+        return_value=np.array([[1.0]], dtype=np.float32),
+    ) as mock_encode:
+        assert pool.embed(["a"], "model", 1, 1).tolist() == [[1.0]]
+
+    mock_encode.assert_called_once_with(["a"], "model", 1, None)
+    assert pool.executor is None
+    executor.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+
+
+async def test_embed_async_unlinks_result_of_cancelled_call():
+    pool = EmbeddingProcessPool()
+    future: Future = Future()
+    future.set_running_or_notify_cancel()
+    executor = Mock()
+    executor.submit.return_value = future
+    pool.executor, pool.workers = executor, 1
+
+    task = asyncio.create_task(pool.embed_async(["a"], "model", 8, 1))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    block = shared_memory.SharedMemory(create=True, size=32)
+    block.close()
+    future.set_result((block.name, (1, 8)))
+
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=block.name)
+
+
+async def test_embed_texts_async_uses_process_pool_when_enabled():
+    process_pool = EmbeddingsProcessPool()
+    process_pool.enabled = True
+    process_pool.workers = 3
+
+    with patch(
+        "memori.llm._embedding_pool.embedding_process_pool.embed_async",
+        return_value=np.array([[1.0]], dtype=np.float32),
+    ) as mock_embed:
+        result = await embed_texts_async(
+            ["a", ""], "model", 1, process_pool=process_pool
+        )
+        assert await embed_texts_async([], "model", 1, process_pool=process_pool) == []
+
+    assert result == [[1.0]]
+    mock_embed.assert_called_once_with(["a"], "model", 1, 3, None)
@@ -0,0 +1,121 @@
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+from memori._config import EmbeddingsStore
+from memori.llm._embedding_store import (
+    INDEX_RECORD,
+    EmbeddingStore,
+    open_embedding_store,
+)
+from memori.llm._embeddings import embed_texts_async
+
+
+def _store_config(path):
+    store = EmbeddingsStore()
+    store.enabled = True
+    store.path = str(path)
+    return store
+
+
+def test_embedding_store_round_trip_keyed_by_exact_text(tmp_path):
+    store = EmbeddingStore(str(tmp_path))
+    store.put_many("model", ["User likes pizza"], [[0.5, 1.5, 2.5]])
+
+    vectors = store.get_many(
+        "model", ["User likes pizza", "user likes pizza!", "User lives in NYC"]
+    )
+
+    assert vectors[0].dtype == np.float32
+    assert vectors[0].tolist() == [0.5, 1.5, 2.5]
+    assert vectors[1] is None
+    assert vectors[2] is None
+    assert store.get_many("other-model", ["User likes pizza"]) == [None]
+    assert store.stats() == {"entries": 1, "hits": 1, "misses": 3}
+
+
+def test_embedding_store_keeps_non_ascii_texts_apart(tmp_path):
+    store = EmbeddingStore(str(tmp_path))
+    store.put_many(
+        "model", ["用户喜欢披萨", "Пользователь любит пиццу"], [[1.0], [2.0]]
+    )
+
+    vectors = store.get_many("model", ["Пользователь любит пиццу", "用户喜欢披萨"])
+
+    assert [vector.tolist() for vector in vectors] == [[2.0], [1.0]]
+    assert store.stats()["entries"] == 2
+
+
+def test_embedding_store_survives_restart_and_is_shared(tmp_path):
+    writer = EmbeddingStore(str(tmp_path))
+    reader = EmbeddingStore(str(tmp_path))
+    assert reader.get_many("model", ["a"]) == [None]
+
+    writer.put_many("model", ["a", "b"], [[1.0], [2.0, 3.0]])
+    writer.put_many("model", ["a"], [[9.0]])
+
+    assert [v.tolist() for v in reader.get_many("model", ["b", "a"])] == [
+        [2.0, 3.0],
+        [1.0],
+    ]
+    restarted = EmbeddingStore(str(tmp_path))
+    assert restarted.get_many("model", ["a"])[0].tolist() == [1.0]
+    assert restarted.stats()["entries"] == 2
+
+
+def test_embedding_store_drops_torn_index_records(tmp_path):
+    store = EmbeddingStore(str(tmp_path))
+    store.put_many("model", ["a"], [[1.0]])
+    files = store.files["model"]
+    with open(files.index_path, "ab") as f:
+        f.write(b"torn")
+
+    restarted = EmbeddingStore(str(tmp_path))
+    assert restarted.get_many("model", ["a"])[0].tolist() == [1.0]
+    restarted.put_many("model", ["b"], [[2.0]])
+
+    assert files.index_path.stat().st_size == 2 * INDEX_RECORD.size
+    assert EmbeddingStore(str(tmp_path)).get_many("model", ["b"])[0].tolist() == [2.0]
+
+
+def test_open_embedding_store_shares_instances_per_path(tmp_path):
+    assert open_embedding_store(None) is None
+    assert open_embedding_store(EmbeddingsStore()) is None
+
+    store = open_embedding_store(_store_config(tmp_path))
+    assert open_embedding_store(_store_config(tmp_path)) is store
+
+
+async def test_embed_texts_async_skips_stored_texts(tmp_path):
+    store = _store_config(tmp_path / "first")
+    with patch("memori.llm._embeddings._get_model") as mock_get_model:
+        mock_model = Mock()
+        mock_model.encode.side_effect = [
+            np.array([[1.0, 2.0], [3.0, 4.0]]),
+            np.array([[5.0, 6.0]]),
+        ]
+        mock_get_model.return_value = mock_model
+
+        first = await embed_texts_async(["a", "b", "a"], "model", 2, store=store)
+        second = await embed_texts_async(["b", "c"], "model", 2, store=store)
+
+    assert first == [[1.0, 2.0], [3.0, 4.0], [1.0, 2.0]]
+    assert second == [[3.0, 4.0], [5.0, 6.0]]
+    assert mock_model.encode.call_args_list[0][0][0] == ["a", "b"]
+    assert mock_model.encode.call_args_list[1][0][0] == ["c"]
+
+
+async def test_embed_texts_async_does_not_store_fallback_vectors(tmp_path):
+    store = _store_config(tmp_path / "second")
+    with patch("memori.llm._embeddings._get_model", side_effect=OSError):
+        assert await embed_texts_async("a", "missing", 2, store=store) == [[0.0, 0.0]]
+
+    assert open_embedding_store(store).stats()["entries"] == 0
+
+
+@pytest.mark.parametrize("texts", [[], [""]])
+async def test_embed_texts_async_with_store_and_no_texts(tmp_path, texts):
+    assert (
+        await embed_texts_async(texts, "model", 2, store=_store_config(tmp_path)) == []
+    )
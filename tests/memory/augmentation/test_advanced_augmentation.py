@@ -32,6 +32,7 @@ def driver():
     driver.conversation.conn.get_dialect.return_value = "postgresql"
     driver.conversation.read.return_value = {"summary": "Previous conversation summary"}
     driver.entity.create.return_value = 1
+    driver.entity_fact.get_ids_by_uniqs.return_value = []
     driver.process.create.return_value = 1
     return driver
 
@@ -191,7 +192,7 @@ async def test_process_api_response_dict_to_memories(augmentation):
     }
 
     with patch(
-        "memori.memory.augmentation.augmentations.memori._augmentation.embed_texts_async"
+        "memori.memory.augmentation.augmentations.memori._augmentation.embed_texts_array_async"
     ) as mock_embed:
         mock_embed.return_value = [[0.1, 0.2], [0.3, 0.4]]
 
@@ -223,16 +224,13 @@ async def test_process_api_response_triples_to_facts(augmentation):
     }
 
     with patch(
-        "memori.memory.augmentation.augmentations.memori._augmentation.embed_texts_async"
+        "memori.memory.augmentation.augmentations.memori._augmentation.embed_texts_array_async"
     ) as mock_embed:
-        mock_embed.return_value = [[0.1, 0.2], [0.3, 0.4]]
-
-        await augmentation._process_api_response(api_response)
+        result = await augmentation._process_api_response(api_response)
 
-        mock_embed.assert_called_once()
-        call_args = mock_embed.call_args[0][0]
-        assert "User likes Pizza" in call_args
-        assert "User lives_in NYC" in call_args
+        mock_embed.assert_not_called()
+        assert result.entity.facts == ["User likes Pizza", "User lives_in NYC"]
+        assert result.entity.fact_embeddings == []
 
 
 @pytest.mark.asyncio
@@ -272,6 +270,61 @@ async def test_schedule_entity_writes_with_semantic_triples(
     assert ctx.writes[1]["method_path"] == "knowledge_graph.create"
 
 
+@pytest.mark.asyncio
+async def test_schedule_entity_writes_embeds_only_new_facts(
+    augmentation, driver, augmentation_input
+):
+    from memori._utils import generate_uniq
+
+    ctx = AugmentationContext(payload=augmentation_input)
+    memories = Memories()
+    memories.entity.facts = ["User likes pizza", "User is from NYC", "User likes pizza"]
+    driver.entity_fact.get_ids_by_uniqs.return_value = [
+        {"id": 7, "uniq": generate_uniq(["User likes pizza"])}
+    ]
+
+    with patch(
+        "memori.memory.augmentation.augmentations.memori._augmentation.embed_texts_array_async",
+        return_value=[[0.5, 0.6]],
+    ) as mock_embed:
+        await augmentation._schedule_entity_writes(ctx, driver, memories)
+
+    driver.entity_fact.get_ids_by_uniqs.assert_called_once_with(
+        1, [generate_uniq(["User likes pizza"]), generate_uniq(["User is from NYC"])]
+    )
+    assert mock_embed.call_args[0][0] == ["User is from NYC"]
+    assert [write["method_path"] for write in ctx.writes] == [
+        "entity_fact.create",
+        "entity_fact.increment_num_times",
+    ]
+    assert ctx.writes[0]["args"] == (1, ["User is from NYC"], [[0.5, 0.6]])
+    assert ctx.writes[1]["args"] == (1, [generate_uniq(["User likes pizza"])])
+
+
+@pytest.mark.asyncio
+async def test_schedule_entity_writes_known_facts_are_not_embedded(
+    augmentation, driver, augmentation_input
+):
+    from memori._utils import generate_uniq
+
+    ctx = AugmentationContext(payload=augmentation_input)
+    memories = Memories()
+    memories.entity.facts = ["User likes pizza"]
+    driver.entity_fact.get_ids_by_uniqs.return_value = [
+        {"id": 7, "uniq": generate_uniq(["User likes pizza"])}
+    ]
+
+    with patch(
+        "memori.memory.augmentation.augmentations.memori._augmentation.embed_texts_array_async"
+    ) as mock_embed:
+        await augmentation._schedule_entity_writes(ctx, driver, memories)
+
+    mock_embed.assert_not_called()
+    assert [write["method_path"] for write in ctx.writes] == [
+        "entity_fact.increment_num_times"
+    ]
+
+
 @pytest.mark.asyncio
 async def test_schedule_process_writes(augmentation, driver, augmentation_input):
     ctx = AugmentationContext(payload=augmentation_input)
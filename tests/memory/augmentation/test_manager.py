@@ -94,6 +94,44 @@ def test_manager_enqueue_no_conn_factory():
     assert result == manager
 
 
+def test_manager_prefetch_inactive():
+    manager = Manager(Config())
+
+    assert manager.prefetch("test-entity") is None
+
+
+def test_manager_prefetch_caches_entity_id(mocker):
+    config = Config()
+    config.entity_id = "test-entity"
+    manager = Manager(config).start(Mock())
+
+    driver = Mock()
+    mocker.patch(
+        "memori.memory.augmentation._manager.connection_context"
+    ).return_value.__enter__.return_value = (Mock(), Mock(), driver)
+    prefetch = mocker.patch("memori.memory.recall.Recall.prefetch", return_value=7)
+
+    future = manager.prefetch("test-entity")
+
+    assert future.result(timeout=5) == 7
+    prefetch.assert_called_once_with(driver, "test-entity")
+    assert config.cache.entity_id == 7
+
+
+def test_manager_prefetch_ignores_stale_entity(mocker):
+    config = Config()
+    config.entity_id = "other-entity"
+    manager = Manager(config).start(Mock())
+
+    mocker.patch(
+        "memori.memory.augmentation._manager.connection_context"
+    ).return_value.__enter__.return_value = (Mock(), Mock(), Mock())
+    mocker.patch("memori.memory.recall.Recall.prefetch", return_value=7)
+
+    assert manager.prefetch("test-entity").result(timeout=5) == 7
+    assert config.cache.entity_id is None
+
+
 def test_runtime_ensure_started():
     runtime = get_runtime()
     original_thread = runtime.thread
@@ -196,3 +234,26 @@ def test_manager_wait_for_db_writer_queue():
             assert result is True
     finally:
         db_writer.queue = original_queue
+
+
+@pytest.mark.parametrize(
+    "method_path", ["entity_fact.increment_num_times", "knowledge_graph.create"]
+)
+def test_manager_on_commit_bumps_entity_version(method_path):
+    from memori._cache import entity_versions
+
+    manager = Manager(Config())
+    callback = manager._on_commit_callback(
+        {"method_path": method_path, "args": (951, ["uniq"]), "kwargs": {}}
+    )
+    version = entity_versions.get(951)
+
+    callback(Mock())
+
+    assert entity_versions.get(951) == version + 1
+    assert (
+        manager._on_commit_callback(
+            {"method_path": "conversation.update", "args": (1,), "kwargs": {}}
+        )
+        is None
+    )
@@ -46,3 +46,33 @@ class TestDbWriterRuntime:
         result = runtime.enqueue_write(task, timeout=1.0)
 
         assert result is False
+
+    def test_run_on_commit_invokes_callbacks(self):
+        runtime = DbWriterRuntime()
+        driver = Mock()
+        callback = Mock()
+
+        runtime._run_on_commit(
+            [
+                WriteTask(method_path="entity_fact.create", on_commit=callback),
+                WriteTask(method_path="conversation.update"),
+            ],
+            driver,
+        )
+
+        callback.assert_called_once_with(driver)
+
+    def test_run_on_commit_isolates_callback_errors(self):
+        runtime = DbWriterRuntime()
+        failing = Mock(side_effect=RuntimeError("boom"))
+        succeeding = Mock()
+
+        runtime._run_on_commit(
+            [
+                WriteTask(method_path="entity_fact.create", on_commit=failing),
+                WriteTask(method_path="entity_fact.create", on_commit=succeeding),
+            ],
+            Mock(),
+        )
+
+        succeeding.assert_called_once()
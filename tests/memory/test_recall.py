@@ -8,13 +8,60 @@ r"""
                       memorilabs.ai
 """
 
+import sqlite3
+import threading
+import time
 from unittest.mock import Mock, patch
 
 import pytest
 from sqlalchemy.exc import OperationalError
 
+from memori._cache import entity_versions
 from memori._config import Config
 from memori.memory.recall import MAX_RETRIES, RETRY_BACKOFF_BASE, Recall
+from memori.storage import Manager as StorageManager
+
+
+def _sqlite_config(tmp_path, facts: list[str], embeddings: list[list[float]]):
+    path = tmp_path / "memori.db"
+    config = Config()
+    config.entity_id = "user-1"
+    config.storage = StorageManager(config).start(lambda: sqlite3.connect(path))
+    config.storage.build()
+
+    driver = config.storage.driver
+    driver.entity_fact.create(driver.entity.create("user-1"), facts, embeddings)
+    return config
+
+
+def test_search_facts_prefilter_finds_fact_written_after_index_cached(tmp_path):
+    from memori.memory.augmentation._manager import Manager as AugmentationManager
+
+    config = _sqlite_config(
+        tmp_path, ["likes pizza", "lives in NYC"], [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]
+    )
+    config.recall_prefilter.enabled = True
+    config.recall_index_cache_max_bytes = 1024 * 1024
+    recall = Recall(config)
+
+    with patch(
+        "memori.memory.recall.embed_queries_array", return_value=[[0.0, 0.0, 1.0]]
+    ):
+        recall.search_facts("pets", limit=1)
+        entity_id = config.cache.entity_id
+        assert config.recall_index_cache.peek(entity_id) is not None
+
+        driver = config.storage.driver
+        args = (entity_id, ["has a dog"], [[0.0, 0.0, 1.0]])
+        driver.entity_fact.create(*args)
+        config.storage.adapter.commit()
+        AugmentationManager(config)._on_commit_callback(
+            {"method_path": "entity_fact.create", "args": args, "kwargs": {}}
+        )(driver)
+
+        facts = recall.search_facts("pets", limit=1)
+
+    assert [fact["content"] for fact in facts] == ["has a dog"]
 
 
 def test_recall_init():
@@ -70,6 +117,66 @@ def test_search_facts_entity_create_returns_none():
     config.storage.driver.entity.create.assert_called_once_with("test-entity")
 
 
+def test_resolve_entity_id_is_cached():
+    config = Config()
+    config.storage = Mock()
+    config.storage.driver = Mock()
+    config.storage.driver.entity.create.return_value = 7
+    config.entity_id = "test-entity"
+    recall = Recall(config)
+
+    assert recall.resolve_entity_id() == 7
+    assert recall.resolve_entity_id() == 7
+    assert recall.resolve_entity_id(3) == 3
+
+    config.storage.driver.entity.create.assert_called_once_with("test-entity")
+    assert config.cache.entity_id == 7
+
+
+def test_prefetch_loads_entity_index():
+    from memori._search import pack_embedding_rows
+
+    config = Config()
+    config.recall_index_cache_max_bytes = 1024 * 1024
+    driver = Mock()
+    driver.entity.create.return_value = 7
+    driver.entity_fact.get_embeddings_bulk.return_value = pack_embedding_rows(
+        [{"id": 1, "content_embedding": [1.0, 0.0, 0.0]}]
+    )
+
+    assert Recall(config).prefetch(driver, "test-entity") == 7
+
+    driver.entity.create.assert_called_once_with("test-entity")
+    driver.entity_fact.get_embeddings_bulk.assert_called_once_with(
+        7, 1000, policy="frequent"
+    )
+    index = config.recall_index_cache.peek(7)
+    assert index.dim == 3
+    assert index.ids == [1]
+
+
+def test_prefetch_skips_index_when_cache_disabled():
+    config = Config()
+    driver = Mock()
+    driver.entity.create.return_value = 7
+
+    assert Recall(config).prefetch(driver, "test-entity") == 7
+
+    driver.entity_fact.get_embeddings_bulk.assert_not_called()
+
+
+def test_prefetch_skips_index_for_native_vector():
+    config = Config()
+    config.recall_native_vector = True
+    driver = Mock()
+    driver.entity.create.return_value = 7
+
+    assert Recall(config).prefetch(driver, "test-entity") == 7
+
+    driver.entity_fact.get_embeddings_bulk.assert_not_called()
+    assert 7 not in config.recall_index_cache
+
+
 def test_search_facts_uses_provided_entity_id():
     config = Config()
     config.storage = Mock()
@@ -77,7 +184,7 @@ def test_search_facts_uses_provided_entity_id():
     config.entity_id = None
     recall = Recall(config)
 
-    with patch("memori.memory.recall.embed_texts") as mock_embed:
+    with patch("memori.memory.recall.embed_queries_array") as mock_embed:
         mock_embed.return_value = [[0.1, 0.2, 0.3]]
 
         with patch("memori.memory.recall.search_entity_facts") as mock_search:
@@ -99,7 +206,7 @@ def test_search_facts_success():
     config.entity_id = "test-entity"
     recall = Recall(config)
 
-    with patch("memori.memory.recall.embed_texts") as mock_embed:
+    with patch("memori.memory.recall.embed_queries_array") as mock_embed:
         mock_embed.return_value = [[0.1, 0.2, 0.3]]
 
         with patch("memori.memory.recall.search_entity_facts") as mock_search:
@@ -118,6 +225,8 @@ def test_search_facts_success():
                 "What do I like?",
                 model=config.embeddings.model,
                 fallback_dimension=config.embeddings.fallback_dimension,
+                batching=config.embeddings.batching,
+                onnx=config.embeddings.onnx,
             )
             mock_search.assert_called_once_with(
                 config.storage.driver.entity_fact,
@@ -125,6 +234,13 @@ def test_search_facts_success():
                 [0.1, 0.2, 0.3],
                 5,
                 1000,
+                index_cache=config.recall_index_cache,
+                native_vector=False,
+                prefilter=config.recall_prefilter,
+                candidate_policy="frequent",
+                fetch_content=False,
+                query_text="What do I like?",
+                lexical=config.recall_lexical,
             )
 
 
@@ -134,7 +250,7 @@ def test_search_facts_with_custom_limit():
     config.storage.driver = Mock()
     recall = Recall(config)
 
-    with patch("memori.memory.recall.embed_texts") as mock_embed:
+    with patch("memori.memory.recall.embed_queries_array") as mock_embed:
         mock_embed.return_value = [[0.1, 0.2, 0.3]]
 
         with patch("memori.memory.recall.search_entity_facts") as mock_search:
@@ -153,7 +269,7 @@ def test_search_facts_retry_on_operational_error():
     config.storage.driver = Mock()
     recall = Recall(config)
 
-    with patch("memori.memory.recall.embed_texts") as mock_embed:
+    with patch("memori.memory.recall.embed_queries_array") as mock_embed:
         mock_embed.return_value = [[0.1, 0.2, 0.3]]
 
         with patch("memori.memory.recall.search_entity_facts") as mock_search:
@@ -179,7 +295,7 @@ def test_search_facts_retry_multiple_times():
     config.storage.driver = Mock()
     recall = Recall(config)
 
-    with patch("memori.memory.recall.embed_texts") as mock_embed:
+    with patch("memori.memory.recall.embed_queries_array") as mock_embed:
         mock_embed.return_value = [[0.1, 0.2, 0.3]]
 
         with patch("memori.memory.recall.search_entity_facts") as mock_search:
@@ -209,7 +325,7 @@ def test_search_facts_raises_after_max_retries():
     config.storage.driver = Mock()
     recall = Recall(config)
 
-    with patch("memori.memory.recall.embed_texts") as mock_embed:
+    with patch("memori.memory.recall.embed_queries_array") as mock_embed:
         mock_embed.return_value = [[0.1, 0.2, 0.3]]
 
         with patch("memori.memory.recall.search_entity_facts") as mock_search:
@@ -230,7 +346,7 @@ def test_search_facts_raises_on_non_restart_error():
     config.storage.driver = Mock()
     recall = Recall(config)
 
-    with patch("memori.memory.recall.embed_texts") as mock_embed:
+    with patch("memori.memory.recall.embed_queries_array") as mock_embed:
         mock_embed.return_value = [[0.1, 0.2, 0.3]]
 
         with patch("memori.memory.recall.search_entity_facts") as mock_search:
@@ -250,7 +366,7 @@ def test_search_facts_returns_empty_on_no_results():
     config.storage.driver = Mock()
     recall = Recall(config)
 
-    with patch("memori.memory.recall.embed_texts") as mock_embed:
+    with patch("memori.memory.recall.embed_queries_array") as mock_embed:
         mock_embed.return_value = [[0.1, 0.2, 0.3]]
 
         with patch("memori.memory.recall.search_entity_facts") as mock_search:
@@ -267,7 +383,7 @@ def test_search_facts_embeds_query_correctly():
     config.storage.driver = Mock()
     recall = Recall(config)
 
-    with patch("memori.memory.recall.embed_texts") as mock_embed:
+    with patch("memori.memory.recall.embed_queries_array") as mock_embed:
         mock_embed.return_value = [[0.1, 0.2, 0.3, 0.4, 0.5]]
 
         with patch("memori.memory.recall.search_entity_facts") as mock_search:
@@ -279,6 +395,8 @@ def test_search_facts_embeds_query_correctly():
                 "My test query",
                 model=config.embeddings.model,
                 fallback_dimension=config.embeddings.fallback_dimension,
+                batching=config.embeddings.batching,
+                onnx=config.embeddings.onnx,
             )
             mock_search.assert_called_once()
             assert mock_search.call_args[0][2] == [0.1, 0.2, 0.3, 0.4, 0.5]
@@ -287,3 +405,404 @@ def test_search_facts_embeds_query_correctly():
 def test_constants():
     assert MAX_RETRIES == 3
     assert RETRY_BACKOFF_BASE == 0.05
+
+
+def test_search_facts_ann_mode_uses_ann_embeddings_limit():
+    config = Config()
+    config.storage = Mock()
+    config.storage.driver = Mock()
+    config.recall_ann.enabled = True
+    config.recall_ann.embeddings_limit = 50_000
+    recall = Recall(config)
+
+    with patch("memori.memory.recall.embed_queries_array") as mock_embed:
+        mock_embed.return_value = [[0.1, 0.2, 0.3]]
+
+        with patch("memori.memory.recall.search_entity_facts") as mock_search:
+            mock_search.return_value = []
+
+            recall.search_facts("test query", entity_id=1)
+
+            assert mock_search.call_args[0][4] == 50_000
+
+
+def test_search_facts_rescores_candidates_with_full_precision_embeddings():
+    config = Config()
+    config.storage = Mock()
+    config.storage.driver = Mock()
+    config.embeddings.storage_dtype = "int8"
+    config.recall_rescore_factor = 3
+    recall = Recall(config)
+
+    with (
+        patch("memori.memory.recall.embed_queries_array") as mock_embed_query,
+        patch("memori.memory.recall.embed_rescore_array") as mock_embed,
+    ):
+        mock_embed_query.return_value = [[1.0, 0.0]]
+        mock_embed.return_value = [[0.0, 1.0], [0.6, 0.8], [1.0, 0.0]]
+
+        with patch("memori.memory.recall.search_entity_facts") as mock_search:
+            mock_search.return_value = [
+                {"id": 1, "content": "a", "similarity": 0.9},
+                {"id": 2, "content": "b", "similarity": 0.8},
+                {"id": 3, "content": "c", "similarity": 0.7},
+            ]
+
+            result = recall.search_facts("test query", limit=2, entity_id=1)
+
+            assert mock_search.call_args[0][3] == 6
+            assert mock_embed.call_args[0][0] == ["a", "b", "c"]
+            assert [fact["id"] for fact in result] == [3, 2]
+            assert result[0]["similarity"] == pytest.approx(1.0)
+            assert result[1]["similarity"] == pytest.approx(0.6)
+
+
+def test_search_facts_does_not_rescore_float32_embeddings():
+    config = Config()
+    config.storage = Mock()
+    config.storage.driver = Mock()
+    config.recall_rescore_factor = 3
+    recall = Recall(config)
+
+    with (
+        patch("memori.memory.recall.embed_queries_array", return_value=[[1.0, 0.0]]),
+        patch("memori.memory.recall.embed_rescore_array") as mock_embed,
+        patch("memori.memory.recall.search_entity_facts") as mock_search,
+    ):
+        mock_search.return_value = [{"id": 1, "content": "a", "similarity": 0.9}]
+
+        result = recall.search_facts("test query", limit=2, entity_id=1)
+
+    assert mock_search.call_args[0][3] == 2
+    mock_embed.assert_not_called()
+    assert result == [{"id": 1, "content": "a", "similarity": 0.9}]
+
+
+def test_rescore_limit_is_capped():
+    config = Config()
+    config.embeddings.storage_dtype = "int8"
+    config.recall_rescore_factor = 10
+    config.recall_rescore_max_candidates = 64
+    recall = Recall(config)
+
+    assert recall._rescore_limit(5) == 50
+    assert recall._rescore_limit(10) == 64
+    assert recall._rescore_limit(100) == 100
+
+
+def test_search_facts_many_embeds_queries_in_one_batch():
+    config = Config()
+    config.storage = Mock()
+    config.storage.driver = Mock()
+    recall = Recall(config)
+
+    with patch("memori.memory.recall.embed_queries_array") as mock_embed:
+        mock_embed.return_value = [[0.1, 0.2], [0.3, 0.4]]
+
+        with patch("memori.memory.recall.search_entity_facts_many") as mock_search:
+            mock_search.return_value = [
+                [{"id": 1, "content": "a", "similarity": 0.9}],
+                [{"id": 2, "content": "b", "similarity": 0.8}],
+            ]
+
+            result = recall.search_facts_many(
+                ["first", "", "second"], limit=3, entity_id=1
+            )
+
+            assert result == [
+                [{"id": 1, "content": "a", "similarity": 0.9}],
+                [],
+                [{"id": 2, "content": "b", "similarity": 0.8}],
+            ]
+            mock_embed.assert_called_once_with(
+                ["first", "second"],
+                model=config.embeddings.model,
+                fallback_dimension=config.embeddings.fallback_dimension,
+                batching=config.embeddings.batching,
+                onnx=config.embeddings.onnx,
+            )
+            mock_search.assert_called_once_with(
+                config.storage.driver.entity_fact,
+                1,
+                [[0.1, 0.2], [0.3, 0.4]],
+                3,
+                1000,
+                index_cache=config.recall_index_cache,
+                native_vector=False,
+                prefilter=config.recall_prefilter,
+                candidate_policy="frequent",
+                fetch_content=False,
+                query_texts=["first", "second"],
+                lexical=config.recall_lexical,
+            )
+
+
+def test_search_facts_many_no_storage():
+    config = Config()
+    config.storage = None
+    recall = Recall(config)
+
+    assert recall.search_facts_many(["a", "b"]) == [[], []]
+
+
+def test_search_facts_many_rescores_each_query():
+    config = Config()
+    config.storage = Mock()
+    config.storage.driver = Mock()
+    config.embeddings.storage_dtype = "int8"
+    config.recall_rescore_factor = 2
+    recall = Recall(config)
+
+    with (
+        patch("memori.memory.recall.embed_queries_array") as mock_embed_query,
+        patch("memori.memory.recall.embed_rescore_array") as mock_embed,
+    ):
+        mock_embed_query.return_value = [[1.0, 0.0], [0.0, 1.0]]
+        mock_embed.return_value = [[0.0, 1.0], [1.0, 0.0]]
+
+        with patch("memori.memory.recall.search_entity_facts_many") as mock_search:
+            mock_search.return_value = [
+                [
+                    {"id": 1, "content": "a", "similarity": 0.9},
+                    {"id": 2, "content": "b", "similarity": 0.8},
+                ],
+                [{"id": 1, "content": "a", "similarity": 0.7}],
+            ]
+
+            result = recall.search_facts_many(["q1", "q2"], limit=1, entity_id=1)
+
+            assert mock_search.call_args[0][3] == 2
+            assert mock_embed.call_args[0][0] == ["a", "b"]
+            assert [[fact["id"] for fact in facts] for facts in result] == [[2], [1]]
+            assert result[1][0]["similarity"] == pytest.approx(1.0)
+
+
+async def test_search_facts_async_runs_on_recall_executor():
+    config = Config()
+    recall = Recall(config)
+
+    def search_facts(query, limit, entity_id):
+        return [{"thread": threading.current_thread().name}]
+
+    with patch.object(
+        recall, "_search_facts_on_own_connection", side_effect=search_facts
+    ) as mock:
+        result = await recall.search_facts_async("test query", entity_id=1)
+
+    mock.assert_called_once_with("test query", None, 1)
+    assert result[0]["thread"].startswith("memori-recall")
+
+
+async def test_search_facts_async_with_sqlite_connection(tmp_path):
+    config = _sqlite_config(
+        tmp_path, ["likes pizza", "lives in NYC"], [[1.0, 0.0], [0.0, 1.0]]
+    )
+
+    with patch("memori.memory.recall.embed_queries_array", return_value=[[1.0, 0.0]]):
+        facts = await Recall(config).search_facts_async("food", limit=1)
+
+    assert [fact["content"] for fact in facts] == ["likes pizza"]
+    assert config.cache.entity_id is not None
+
+
+def test_search_facts_deadline_with_sqlite_connection(tmp_path):
+    config = _sqlite_config(
+        tmp_path, ["likes pizza", "lives in NYC"], [[1.0, 0.0], [0.0, 1.0]]
+    )
+    config.recall_deadline_seconds = 5
+
+    with patch("memori.memory.recall.embed_queries_array", return_value=[[0.0, 1.0]]):
+        facts = Recall(config).search_facts("home", limit=1)
+
+    assert [fact["content"] for fact in facts] == ["lives in NYC"]
+    assert config.recall_metrics.stats()["deadline_misses"] == 0
+
+
+def test_search_facts_deadline_does_not_cache_entity_after_attribution_change(
+    tmp_path,
+):
+    config = _sqlite_config(
+        tmp_path, ["likes pizza", "lives in NYC"], [[1.0, 0.0], [0.0, 1.0]]
+    )
+    config.recall_deadline_seconds = 5
+    entity = config.storage.driver.entity
+    create = type(entity).create
+
+    def create_then_change_attribution(self, external_id):
+        row_id = create(self, external_id)
+        # What Memori.attribution() does while the recall is running.
+        config.cache.entity_id = None
+        config.entity_id = "user-2"
+        return row_id
+
+    with (
+        patch("memori.memory.recall.embed_queries_array", return_value=[[0.0, 1.0]]),
+        patch.object(type(entity), "create", create_then_change_attribution),
+    ):
+        facts = Recall(config).search_facts("home", limit=1)
+
+    assert [fact["content"] for fact in facts] == ["lives in NYC"]
+    assert config.cache.entity_id is None
+
+
+def _slow_search(release: threading.Event, facts: list[dict]):
+    def search(*args, **kwargs):
+        release.wait(5)
+        return facts
+
+    return search
+
+
+def test_search_facts_deadline_serves_stale_result_and_refreshes_cache():
+    config = Config()
+    config.recall_result_cache_max_entries = 16
+    config.storage = Mock()
+    config.storage.driver = Mock()
+    config.recall_deadline_seconds = 0.01
+    recall = Recall(config)
+
+    config.recall_result_cache.put(
+        78, "query", 5, [{"content": "old"}], entity_versions.get(78)
+    )
+    entity_versions.bump(78)
+    release = threading.Event()
+
+    with patch("memori.memory.recall.embed_queries_array", return_value=[[0.1, 0.2]]):
+        with patch(
+            "memori.memory.recall.search_entity_facts",
+            side_effect=_slow_search(release, [{"content": "new"}]),
+        ):
+            assert recall.search_facts("query", entity_id=78) == [{"content": "old"}]
+
+            release.set()
+            for _ in range(500):
+                if config.recall_result_cache.get_stale(78, "query", 5) != [
+                    {"content": "old"}
+                ]:
+                    break
+                time.sleep(0.01)
+
+    assert config.recall_result_cache.get(78, "query", 5) == [{"content": "new"}]
+    assert config.recall_metrics.stats() == {
+        "deadline_misses": 1,
+        "deadline_stale_results": 1,
+        "deadline_empty_results": 0,
+    }
+
+
+def test_search_facts_deadline_without_cached_result_returns_no_facts():
+    config = Config()
+    config.storage = Mock()
+    config.storage.driver = Mock()
+    config.recall_deadline_seconds = 0.01
+    recall = Recall(config)
+    release = threading.Event()
+
+    with patch("memori.memory.recall.embed_queries_array", return_value=[[0.1, 0.2]]):
+        with patch(
+            "memori.memory.recall.search_entity_facts",
+            side_effect=_slow_search(release, [{"content": "new"}]),
+        ):
+            try:
+                assert recall.search_facts("query", entity_id=79) == []
+            finally:
+                release.set()
+
+    assert config.recall_metrics.stats()["deadline_empty_results"] == 1
+
+
+def test_search_facts_within_deadline_returns_result():
+    config = Config()
+    config.storage = Mock()
+    config.storage.driver = Mock()
+    config.recall_deadline_seconds = 5
+    recall = Recall(config)
+
+    with patch("memori.memory.recall.embed_queries_array", return_value=[[0.1, 0.2]]):
+        with patch(
+            "memori.memory.recall.search_entity_facts",
+            return_value=[{"content": "fact"}],
+        ):
+            assert recall.search_facts("query", entity_id=80) == [{"content": "fact"}]
+
+    assert config.recall_metrics.stats()["deadline_misses"] == 0
+
+
+async def test_search_facts_async_deadline_serves_stale_result():
+    config = Config()
+    config.recall_result_cache_max_entries = 16
+    config.recall_deadline_seconds = 0.01
+    config.cache.entity_id = 81
+    recall = Recall(config)
+    config.recall_result_cache.put(
+        81, "query", 5, [{"content": "old"}], entity_versions.get(81)
+    )
+    release = threading.Event()
+
+    with patch.object(
+        recall,
+        "_search_facts_on_own_connection",
+        side_effect=_slow_search(release, []),
+    ) as mock:
+        try:
+            result = await recall.search_facts_async("query")
+        finally:
+            release.set()
+
+    mock.assert_called_once_with("query", None, None)
+    assert result == [{"content": "old"}]
+    assert config.recall_metrics.stats()["deadline_misses"] == 1
+
+
+def test_search_facts_served_from_result_cache_until_entity_write():
+    config = Config()
+    config.recall_result_cache_max_entries = 16
+    config.storage = Mock()
+    config.storage.driver = Mock()
+    recall = Recall(config)
+
+    with patch("memori.memory.recall.embed_queries_array") as mock_embed:
+        mock_embed.return_value = [[0.1, 0.2, 0.3]]
+
+        with patch("memori.memory.recall.search_entity_facts") as mock_search:
+            mock_search.return_value = [{"content": "fact", "similarity": 0.9}]
+
+            first = recall.search_facts("What do I like?", entity_id=77)
+            second = recall.search_facts("what do i like?", entity_id=77)
+
+            assert first == second
+            assert mock_search.call_count == 1
+            assert mock_embed.call_count == 1
+
+            entity_versions.bump(77)
+            recall.search_facts("What do I like?", entity_id=77)
+
+            assert mock_search.call_count == 2
+            assert config.recall_result_cache.stats()["hits"] == 1
+
+
+def test_search_facts_expands_with_knowledge_graph():
+    config = Config()
+    config.storage = Mock()
+    config.storage.driver = Mock()
+    config.recall_graph.enabled = True
+    config.storage.driver.knowledge_graph.get_edges.return_value = [
+        {"subject_name": "User", "predicate": "lives in", "object_name": "NYC"},
+        {"subject_name": "NYC", "predicate": "is in", "object_name": "USA"},
+    ]
+    recall = Recall(config)
+
+    with (
+        patch("memori.memory.recall.embed_queries_array", return_value=[[0.1, 0.2]]),
+        patch("memori.memory.recall.search_entity_facts") as mock_search,
+    ):
+        mock_search.return_value = [
+            {"id": 1, "content": "User lives in NYC", "similarity": 0.9}
+        ]
+        result = recall.search_facts("Where do I live?", limit=1, entity_id=910)
+
+    assert [fact["content"] for fact in result] == [
+        "User lives in NYC",
+        "NYC is in USA",
+    ]
+    assert result[1]["hops"] == 1
@@ -229,3 +229,8 @@ def test_registry_routes_sqlite3_to_dbapi_adapter(mock_sqlite3_conn):
     registry = Registry()
     adapter = registry.adapter(lambda: mock_sqlite3_conn)
     assert isinstance(adapter, DBAPIAdapter)
+
+
+def test_get_dbapi_connection_sqlite3(mock_sqlite3_conn):
+    adapter = DBAPIAdapter(lambda: mock_sqlite3_conn)
+    assert adapter.get_dbapi_connection() is mock_sqlite3_conn
@@ -234,3 +234,14 @@ def test_registry_routes_sqlite_to_django_adapter(mock_django_sqlite_conn):
     registry = Registry()
     adapter = registry.adapter(lambda: mock_django_sqlite_conn)
     assert isinstance(adapter, DjangoAdapter)
+
+
+def test_get_dbapi_connection_sqlite(mocker):
+    mock_conn = mocker.Mock(spec=["cursor", "ensure_connection", "connection"])
+    mock_conn.__class__.__module__ = "django.db.backends.sqlite3.base"
+    mock_conn.connection = mocker.sentinel.sqlite3_connection
+
+    adapter = DjangoAdapter(lambda: mock_conn)
+
+    assert adapter.get_dbapi_connection() is mocker.sentinel.sqlite3_connection
+    mock_conn.ensure_connection.assert_called_once()
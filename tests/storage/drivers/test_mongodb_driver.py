@@ -611,22 +611,75 @@ def test_entity_fact_get_embeddings(mock_conn):
     assert find_call[0][1] == "find"
     assert find_call[0][2] == {"entity_id": 123}
     assert find_call[0][3] == {"_id": 1, "content_embedding": 1}
+    assert find_call[1]["sort"] == [("num_times", -1), ("date_last_time", -1)]
+
+
+def test_entity_fact_get_embeddings_blended_policy(mock_conn):
+    """Test the blended policy merges the frequent and recent windows."""
+    mock_conn.execute.side_effect = [
+        [{"_id": 1, "content_embedding": b"a"}, {"_id": 2, "content_embedding": b"b"}],
+        [{"_id": 3, "content_embedding": b"c"}, {"_id": 1, "content_embedding": b"a"}],
+    ]
+
+    entity_fact = EntityFact(mock_conn)
+    result = entity_fact.get_embeddings(entity_id=123, limit=4, policy="blended")
+
+    assert [row["id"] for row in result] == [1, 2, 3]
+
+    frequent_call, recent_call = mock_conn.execute.call_args_list
+    assert frequent_call[1]["sort"] == [("num_times", -1), ("date_last_time", -1)]
+    assert frequent_call[1]["limit"] == 2
+    assert recent_call[1]["sort"] == [("date_last_time", -1)]
+    assert recent_call[1]["limit"] == 2
+
+
+def test_entity_fact_search_lexical(mock_conn):
+    """Test lexical candidates come from the text index sorted by score."""
+    mock_conn.execute.side_effect = [
+        {"_id_": {}, "idx_memori_entity_fact_content_text": {}},
+        [{"_id": 5, "score": 1.5}, {"_id": 2, "score": 0.7}],
+    ]
+
+    entity_fact = EntityFact(mock_conn)
+    result = entity_fact.search_lexical(123, "Pizza, pizza and NYC", 50)
+
+    assert result == [5, 2]
+    find_call = mock_conn.execute.call_args_list[1]
+    assert find_call[0][2] == {
+        "entity_id": 123,
+        "$text": {"$search": "pizza and nyc"},
+    }
+    assert find_call[1]["sort"] == [("score", {"$meta": "textScore"})]
+    assert find_call[1]["limit"] == 50
+
+
+def test_entity_fact_search_lexical_without_text_index(mock_conn):
+    """Test lexical search reports itself unavailable without a text index."""
+    mock_conn.execute.return_value = {"_id_": {}}
+
+    entity_fact = EntityFact(mock_conn)
+
+    assert entity_fact.search_lexical(123, "pizza", 50) is None
+    assert entity_fact.search_lexical(123, "pizza", 50) is None
+    mock_conn.execute.assert_called_once_with("memori_entity_fact", "index_information")
 
 
 def test_entity_fact_get_embeddings_with_limit(mock_conn):
-    """Test retrieving embeddings respects the limit."""
-    # Return more results than the limit
-    mock_cursor = [{"_id": i, "content_embedding": bytes([i])} for i in range(1, 11)]
+    """Test the limit is pushed into the cursor instead of slicing client-side."""
+    mock_cursor = [{"_id": i, "content_embedding": bytes([i])} for i in range(1, 6)]
     mock_conn.execute.return_value = mock_cursor
 
     entity_fact = EntityFact(mock_conn)
     result = entity_fact.get_embeddings(entity_id=123, limit=5)
 
-    # Should only return first 5 results
     assert len(result) == 5
     assert result[0]["id"] == 1
     assert result[4]["id"] == 5
 
+    find_call = mock_conn.execute.call_args_list[0]
+    assert find_call[1]["limit"] == 5
+    assert find_call[1]["batch_size"] == 5
+
 
 def test_entity_fact_get_embeddings_default_limit(mock_conn):
     """Test retrieving embeddings with default limit."""
@@ -635,9 +688,10 @@ def test_entity_fact_get_embeddings_default_limit(mock_conn):
     entity_fact = EntityFact(mock_conn)
     entity_fact.get_embeddings(entity_id=123)
 
-    # Verify default limit is used in slicing (1000)
+    # Verify default limit is pushed into the cursor (1000)
     find_call = mock_conn.execute.call_args_list[0]
     assert find_call[0][0] == "memori_entity_fact"
+    assert find_call[1]["limit"] == 1000
 
 
 def test_entity_fact_get_facts_by_ids(mock_conn):
@@ -672,3 +726,46 @@ def test_entity_fact_get_facts_by_ids_empty(mock_conn):
 
     assert result == []
     assert mock_conn.execute.call_count == 0
+
+
+def test_entity_fact_get_ids_by_uniqs(mock_conn):
+    """Test resolving fact ids from their uniq hashes."""
+    mock_conn.execute.return_value = [{"_id": 1, "uniq": "abc"}]
+
+    entity_fact = EntityFact(mock_conn)
+    result = entity_fact.get_ids_by_uniqs(123, ["abc", "def"])
+
+    assert result == [{"id": 1, "uniq": "abc"}]
+
+    find_call = mock_conn.execute.call_args_list[0]
+    assert find_call[0][1] == "find"
+    assert find_call[0][2] == {"entity_id": 123, "uniq": {"$in": ["abc", "def"]}}
+    assert find_call[0][3] == {"_id": 1, "uniq": 1}
+
+
+def test_entity_fact_increment_num_times(mock_conn):
+    """Test existing facts get their frequency bumped with one update_many."""
+    entity_fact = EntityFact(mock_conn)
+    entity_fact.increment_num_times(123, ["abc", "def"])
+    entity_fact.increment_num_times(123, [])
+
+    assert mock_conn.execute.call_count == 1
+    update_call = mock_conn.execute.call_args_list[0]
+    assert update_call[0][1] == "update_many"
+    assert update_call[0][2] == {"entity_id": 123, "uniq": {"$in": ["abc", "def"]}}
+    assert update_call[0][3]["$inc"] == {"num_times": 1}
+
+
+def test_entity_fact_get_embeddings_bulk(mock_conn):
+    """Test retrieving embeddings packed into one contiguous buffer."""
+    mock_conn.execute.return_value = [
+        {"_id": 1, "content_embedding": b"\x00\x01\x02\x03"},
+        {"_id": 2, "content_embedding": b"\x04\x05\x06\x07"},
+    ]
+
+    entity_fact = EntityFact(mock_conn)
+    result = entity_fact.get_embeddings_bulk(entity_id=123, limit=100)
+
+    assert result["ids"] == [1, 2]
+    assert result["sizes"] == [4, 4]
+    assert result["buffer"] == b"\x00\x01\x02\x03\x04\x05\x06\x07"
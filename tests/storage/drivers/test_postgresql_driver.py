@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, Mock
 from uuid import UUID
 
 from memori.storage.drivers.postgresql._driver import (
@@ -7,6 +7,7 @@ from memori.storage.drivers.postgresql._driver import (
     ConversationMessages,
     Driver,
     Entity,
+    EntityFact,
     Process,
     Schema,
     SchemaVersion,
@@ -325,3 +326,196 @@ def test_schema_initialization(mock_conn):
 
     assert isinstance(schema.version, SchemaVersion)
     assert schema.conn == mock_conn
+
+
+def test_entity_fact_get_embeddings_bulk(mock_conn, mock_single_result):
+    """Test embeddings are aggregated into one buffer server-side."""
+    mock_conn.execute.return_value = mock_single_result(
+        {"ids": [1, 2], "sizes": [4, 4], "buffer": b"\x00\x01\x02\x03\x04\x05\x06\x07"}
+    )
+
+    entity_fact = EntityFact(mock_conn)
+    result = entity_fact.get_embeddings_bulk(entity_id=123, limit=100)
+
+    assert result == {
+        "ids": [1, 2],
+        "sizes": [4, 4],
+        "buffer": b"\x00\x01\x02\x03\x04\x05\x06\x07",
+    }
+
+    select_call = mock_conn.execute.call_args_list[0]
+    assert "string_agg(value" in select_call[0][0]
+    assert "content_embedding AS value" in select_call[0][0]
+    assert "order by id" in select_call[0][0].lower()
+    assert "ORDER BY num_times DESC, date_last_time DESC" in select_call[0][0]
+    assert select_call[0][1] == (123, 100)
+
+
+def test_entity_fact_get_embeddings_bulk_empty(mock_conn, mock_single_result):
+    """Test an entity without facts returns an empty bulk result."""
+    mock_conn.execute.return_value = mock_single_result(
+        {"ids": None, "sizes": None, "buffer": None}
+    )
+
+    entity_fact = EntityFact(mock_conn)
+
+    assert entity_fact.get_embeddings_bulk(entity_id=123) == {
+        "ids": [],
+        "sizes": [],
+        "buffer": b"",
+    }
+
+
+def test_entity_fact_search_embeddings(
+    mock_conn, mock_single_result, mock_multiple_results
+):
+    """Test top-k similarity is ranked with the native vector column."""
+    mock_conn.execute.side_effect = [
+        mock_single_result({"present": 1}),
+        mock_multiple_results(
+            [{"id": 7, "content": "User likes pizza", "similarity": 0.9}]
+        ),
+    ]
+
+    entity_fact = EntityFact(mock_conn)
+    result = entity_fact.search_embeddings(123, [0.5] * 384, 5)
+
+    assert result == [{"id": 7, "content": "User likes pizza", "similarity": 0.9}]
+
+    select_call = mock_conn.execute.call_args_list[1]
+    assert "<=> %s::vector" in select_call[0][0]
+    assert "AS MATERIALIZED" in select_call[0][0]
+    assert "limit %s" in select_call[0][0].lower()
+    assert select_call[0][1][1:] == (123, 123, 5)
+    assert select_call[0][1][0].startswith("[0.5,0.5,")
+
+
+def test_entity_fact_search_embeddings_cockroachdb_uses_vector_index(
+    mock_conn, mock_single_result, mock_multiple_results
+):
+    """Test CockroachDB orders by distance through its entity-prefixed index."""
+    mock_conn.get_dialect.return_value = "cockroachdb"
+    mock_conn.execute.side_effect = [
+        mock_single_result({"present": 1}),
+        mock_multiple_results([]),
+    ]
+
+    EntityFact(mock_conn).search_embeddings(123, [0.5] * 384, 5)
+
+    select_call = mock_conn.execute.call_args_list[1]
+    assert "MATERIALIZED" not in select_call[0][0]
+    assert "ORDER BY f.content_embedding_vector <=> %s::vector" in select_call[0][0]
+    assert select_call[0][1][1:] == (123, 123, select_call[0][1][0], 5)
+
+
+def test_entity_fact_search_embeddings_without_vector_column(
+    mock_conn, mock_single_result
+):
+    """Test None is returned when the vector column was not migrated."""
+    mock_conn.execute.return_value = mock_single_result(None)
+
+    entity_fact = EntityFact(mock_conn)
+
+    assert entity_fact.search_embeddings(123, [0.5] * 384, 5) is None
+    assert entity_fact.search_embeddings(123, [0.5] * 384, 5) is None
+    assert mock_conn.execute.call_count == 1
+
+
+def test_entity_fact_search_embeddings_dimension_mismatch(mock_conn):
+    """Test None is returned for queries the vector column cannot hold."""
+    entity_fact = EntityFact(mock_conn)
+
+    assert entity_fact.search_embeddings(123, [0.5] * 768, 5) is None
+    assert not mock_conn.execute.called
+
+
+def test_entity_fact_search_embeddings_dimension_mismatch_warns_once(mock_conn, caplog):
+    """Test a query dimension the vector column cannot hold is logged once."""
+    entity_fact = EntityFact(mock_conn)
+
+    with caplog.at_level("WARNING"):
+        entity_fact.search_embeddings(123, [0.5] * 1024, 5)
+        entity_fact.search_embeddings(123, [0.5] * 1024, 5)
+
+    assert len(caplog.records) == 1
+    assert "1024" in caplog.records[0].getMessage()
+
+
+def test_entity_fact_search_lexical(mock_conn, mock_multiple_results):
+    """Test lexical candidates match any query term through tsvector."""
+    mock_conn.execute.return_value = mock_multiple_results([{"id": 7}, {"id": 3}])
+
+    entity_fact = EntityFact(mock_conn)
+    result = entity_fact.search_lexical(123, "Pizza in NYC?", 200)
+
+    assert result == [7, 3]
+    select_call = mock_conn.execute.call_args_list[0]
+    assert "to_tsvector('english', content) @@ q" in select_call[0][0]
+    assert select_call[0][1] == ("pizza | in | nyc", 123, 200)
+
+
+def test_entity_fact_search_lexical_without_terms(mock_conn):
+    """Test a query without word characters skips the database."""
+    entity_fact = EntityFact(mock_conn)
+
+    assert entity_fact.search_lexical(123, "?!", 200) == []
+    mock_conn.execute.assert_not_called()
+
+
+def test_entity_fact_create_with_vector_column(mock_conn, mock_single_result):
+    """Test facts also populate the native vector column when it exists."""
+    mock_conn.get_dialect.return_value = "postgresql"
+    mock_conn.execute.return_value = mock_single_result({"present": 1})
+
+    entity_fact = EntityFact(mock_conn)
+    entity_fact.create(123, ["fact a", "fact b"], [[0.25] * 384, [0.5] * 3])
+
+    insert_calls = mock_conn.execute.call_args_list[1:]
+    assert len(insert_calls) == 2
+    assert "content_embedding_vector" in insert_calls[0][0][0]
+    assert insert_calls[0][0][1][5].startswith("[0.25,0.25,")
+    assert insert_calls[1][0][1][5] is None
+    assert insert_calls[0][0][1][4] == b"\xff" * 48
+    assert insert_calls[1][0][1][4] == b"\xe0"
+
+
+def test_entity_fact_create_without_vector_column(mock_conn, mock_single_result):
+    """Test facts are stored as before when the vector column is absent."""
+    mock_conn.get_dialect.return_value = "postgresql"
+    mock_conn.execute.return_value = mock_single_result(None)
+
+    entity_fact = EntityFact(mock_conn)
+    entity_fact.create(123, ["fact a"], [[0.25] * 384])
+
+    insert_call = mock_conn.execute.call_args_list[1]
+    assert "content_embedding_vector" not in insert_call[0][0]
+    assert len(insert_call[0][1]) == 6
+
+
+def test_entity_fact_backfill_embedding_vectors(
+    mock_conn, mock_single_result, mock_multiple_results
+):
+    """Test stored BYTEA embeddings are copied into the vector column."""
+    import struct
+
+    mock_conn.execute.side_effect = [
+        mock_single_result({"present": 1}),
+        mock_multiple_results(
+            [
+                {"id": 1, "content_embedding": struct.pack("<384f", *([0.5] * 384))},
+                {"id": 2, "content_embedding": struct.pack("<3f", 1.0, 0.0, 0.0)},
+            ]
+        ),
+        Mock(),
+        mock_multiple_results([]),
+    ]
+
+    entity_fact = EntityFact(mock_conn)
+
+    assert entity_fact.backfill_embedding_vectors() == 1
+
+    update_call = mock_conn.execute.call_args_list[2]
+    assert "UPDATE memori_entity_fact" in update_call[0][0]
+    assert update_call[0][1][1] == 1
+    assert mock_conn.execute.call_args_list[3][0][1] == (2, 1000)
+    assert mock_conn.commit.called
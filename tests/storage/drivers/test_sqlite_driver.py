@@ -1,6 +1,13 @@
+import sqlite3
 from unittest.mock import MagicMock
 from uuid import UUID
 
+import numpy as np
+import pytest
+
+from memori._cache import entity_versions
+from memori._search import parse_embedding
+from memori.storage.adapters.dbapi._adapter import Adapter as DBAPIAdapter
 from memori.storage.drivers.sqlite._driver import (
     Conversation,
     ConversationMessage,
@@ -12,7 +19,9 @@ from memori.storage.drivers.sqlite._driver import (
     Schema,
     SchemaVersion,
     Session,
+    load_sqlite_vec,
 )
+from memori.storage.migrations._sqlite import migrations
 
 
 def test_driver_initialization(mock_conn):
@@ -356,8 +365,9 @@ def test_entity_fact_create(mock_conn, mocker):
     assert params[1] == 123  # entity_id
     assert params[2] == "User likes Python"  # content
     assert params[3] == b"\x00\x01\x02\x03"  # content_embedding (binary)
-    assert params[4] == 1  # num_times
-    assert params[5] == "uniq123"  # uniq
+    assert params[4] == b"\xe0"  # content_embedding_code (sign bits)
+    assert params[5] == 1  # num_times
+    assert params[6] == "uniq123"  # uniq
 
 
 def test_entity_fact_create_empty_facts(mock_conn):
@@ -464,3 +474,334 @@ def test_entity_fact_get_facts_by_ids_empty(mock_conn):
 
     assert result == []
     assert mock_conn.execute.call_count == 0
+
+
+def test_entity_fact_get_ids_by_uniqs(mock_conn, mock_multiple_results):
+    """Test resolving fact ids from their uniq hashes."""
+    mock_conn.execute.return_value = mock_multiple_results(
+        [{"id": 1, "uniq": "abc"}, {"id": 2, "uniq": "def"}]
+    )
+
+    entity_fact = EntityFact(mock_conn)
+    result = entity_fact.get_ids_by_uniqs(42, ["abc", "def"])
+
+    assert result == [{"id": 1, "uniq": "abc"}, {"id": 2, "uniq": "def"}]
+
+    select_call = mock_conn.execute.call_args_list[0]
+    assert "where entity_id = ?" in select_call[0][0].lower()
+    assert "uniq in (?,?)" in select_call[0][0].lower()
+    assert select_call[0][1] == (42, "abc", "def")
+
+
+def test_entity_fact_get_ids_by_uniqs_empty(mock_conn):
+    """Test resolving ids with empty uniq list."""
+    entity_fact = EntityFact(mock_conn)
+
+    assert entity_fact.get_ids_by_uniqs(42, []) == []
+    assert mock_conn.execute.call_count == 0
+
+
+def test_entity_fact_get_embeddings_bulk(mock_conn, mock_multiple_results):
+    """Test retrieving embeddings packed into one contiguous buffer."""
+    mock_conn.execute.return_value = mock_multiple_results(
+        [
+            {"id": 1, "content_embedding": b"\x00\x01\x02\x03"},
+            {"id": 2, "content_embedding": b"\x04\x05\x06\x07"},
+        ]
+    )
+
+    entity_fact = EntityFact(mock_conn)
+    result = entity_fact.get_embeddings_bulk(entity_id=123, limit=100)
+
+    assert result["ids"] == [1, 2]
+    assert result["sizes"] == [4, 4]
+    assert result["buffer"] == b"\x00\x01\x02\x03\x04\x05\x06\x07"
+    assert mock_conn.execute.call_args_list[0][0][1] == (123, 100)
+
+
+def _cosine_distance(a, b):
+    x = np.frombuffer(a, dtype="<f4")
+    y = np.frombuffer(b, dtype="<f4")
+    denominator = float(np.linalg.norm(x) * np.linalg.norm(y))
+    if denominator == 0.0:
+        return None
+    return 1.0 - float(np.dot(x, y)) / denominator
+
+
+@pytest.fixture
+def sqlite_driver():
+    """Create a driver on an in-memory SQLite database with the schema built.
+
+    sqlite-vec's SQL functions are stood in for by Python functions so the
+    in-database ranking query runs on any Python build.
+    """
+    conn = sqlite3.connect(":memory:")
+    conn.create_function("vec_version", 0, lambda: "v0.0.0")
+    conn.create_function("vec_distance_cosine", 2, _cosine_distance)
+    for num in sorted(migrations):
+        for migration in migrations[num]:
+            operations = migration.get("operations") or [migration["operation"]]
+            for operation in operations:
+                conn.executescript(operation)
+
+    yield Driver(DBAPIAdapter(lambda: conn))
+    conn.close()
+
+
+def test_entity_fact_search_embeddings(sqlite_driver):
+    """Test top-k similarity is computed inside SQLite."""
+    entity_id = sqlite_driver.entity.create("entity-1")
+    sqlite_driver.entity_fact.create(
+        entity_id,
+        ["likes pizza", "lives in NYC", "zero vector"],
+        [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 0.0]],
+    )
+
+    result = sqlite_driver.entity_fact.search_embeddings(entity_id, [0.9, 0.1, 0.0], 5)
+
+    assert [row["content"] for row in result] == ["likes pizza", "lives in NYC"]
+    assert result[0]["similarity"] == pytest.approx(0.9939, abs=1e-4)
+
+
+def test_entity_fact_search_embeddings_with_unreadable_rows(sqlite_driver, caplog):
+    """Test facts sqlite-vec cannot read are left out with a warning."""
+    entity_id = sqlite_driver.entity.create("entity-1")
+    sqlite_driver.entity_fact.create(entity_id, ["likes pizza"], [[1.0, 0.0, 0.0]])
+    sqlite_driver.entity_fact.create(
+        entity_id, ["lives in NYC"], [[0.0, 1.0, 0.0]], embedding_dtype="int8"
+    )
+
+    with caplog.at_level("WARNING"):
+        result = sqlite_driver.entity_fact.search_embeddings(
+            entity_id, [1.0, 0.0, 0.0], 5
+        )
+        sqlite_driver.entity_fact.search_embeddings(entity_id, [1.0, 0.0, 0.0], 5)
+
+    assert [row["content"] for row in result] == ["likes pizza"]
+    assert list(result[0]) == ["id", "content", "similarity"]
+    assert caplog.text.count("sqlite-vec cannot read") == 1
+
+
+def test_entity_fact_increment_num_times(sqlite_driver):
+    """Test existing facts get their frequency bumped in one statement."""
+    from memori._utils import generate_uniq
+
+    entity_id = sqlite_driver.entity.create("entity-1")
+    sqlite_driver.entity_fact.create(
+        entity_id, ["likes pizza", "lives in NYC"], [[1.0, 0.0], [0.0, 1.0]]
+    )
+    version = entity_versions.get(entity_id)
+
+    sqlite_driver.entity_fact.increment_num_times(
+        entity_id, [generate_uniq(["likes pizza"]), generate_uniq(["unknown"])]
+    )
+    sqlite_driver.entity_fact.increment_num_times(entity_id, [])
+
+    rows = sqlite_driver.entity_fact.conn.execute(
+        "SELECT content, num_times FROM memori_entity_fact ORDER BY id"
+    ).fetchall()
+    assert [tuple(row) for row in rows] == [("likes pizza", 2), ("lives in NYC", 1)]
+    assert entity_versions.get(entity_id) == version + 1
+
+
+def test_entity_fact_search_embeddings_respects_limit(sqlite_driver):
+    """Test only k rows are returned."""
+    entity_id = sqlite_driver.entity.create("entity-1")
+    sqlite_driver.entity_fact.create(
+        entity_id,
+        [f"fact {i}" for i in range(10)],
+        [[1.0, float(i)] for i in range(10)],
+    )
+
+    result = sqlite_driver.entity_fact.search_embeddings(entity_id, [1.0, 0.0], 3)
+
+    assert [row["content"] for row in result] == ["fact 0", "fact 1", "fact 2"]
+
+
+def test_entity_fact_search_embeddings_without_sqlite_connection(mock_conn):
+    """Test None is returned when no sqlite3 connection is reachable."""
+    mock_conn.get_dbapi_connection.return_value = None
+
+    entity_fact = EntityFact(mock_conn)
+
+    assert entity_fact.search_embeddings(123, [1.0, 0.0], 5) is None
+    assert not mock_conn.execute.called
+
+
+def test_load_sqlite_vec_unavailable(mocker):
+    """Test a failed load is remembered and reported as unavailable."""
+    mocker.patch("memori.storage.drivers.sqlite._driver._sqlite_vec_loadable", None)
+    mocker.patch.dict("sys.modules", {"sqlite_vec": None})
+    conn = sqlite3.connect(":memory:")
+
+    assert load_sqlite_vec(conn) is False
+    assert load_sqlite_vec(conn) is False
+    conn.close()
+
+
+def test_entity_fact_embedding_codes_and_embeddings_by_ids(sqlite_driver):
+    """Test sign-bit codes are stored with facts and full vectors fetched by id."""
+    entity_id = sqlite_driver.entity.create("entity-1")
+    sqlite_driver.entity_fact.create(
+        entity_id,
+        ["likes pizza", "lives in NYC", "no embedding"],
+        [[1.0, -1.0, 0.5], [-1.0, 1.0, 0.0]],
+    )
+
+    bulk = sqlite_driver.entity_fact.get_embedding_codes_bulk(entity_id, 10)
+    assert bulk["sizes"] == [1, 1, 0]
+    assert bulk["buffer"] == b"\xa0\x40"
+
+    rows = sqlite_driver.entity_fact.get_embeddings_by_ids(bulk["ids"][:2])
+    assert [parse_embedding(row["content_embedding"]).tolist() for row in rows] == [
+        [1.0, -1.0, 0.5],
+        [-1.0, 1.0, 0.0],
+    ]
+
+
+def test_entity_fact_create_with_float32_array(sqlite_driver):
+    """Test facts can be written with an (N, dim) float32 array of embeddings."""
+    entity_id = sqlite_driver.entity.create("entity-1")
+    embeddings = np.array([[1.0, -1.0, 0.5], [-1.0, 1.0, 0.0]], dtype=np.float32)
+    sqlite_driver.entity_fact.create(
+        entity_id, ["likes pizza", "lives in NYC"], embeddings
+    )
+
+    bulk = sqlite_driver.entity_fact.get_embeddings_bulk(entity_id, 10)
+    assert bulk["buffer"] == embeddings.tobytes()
+
+
+def test_entity_fact_get_embeddings_bulk_with_content(sqlite_driver):
+    """Test facts are returned with their content in the same query."""
+    entity_id = sqlite_driver.entity.create("entity-1")
+    sqlite_driver.entity_fact.create(
+        entity_id, ["likes pizza", "lives in NYC"], [[1.0, 0.0], [0.0, 1.0]]
+    )
+
+    bulk = sqlite_driver.entity_fact.get_embeddings_bulk(
+        entity_id, 10, with_content=True
+    )
+
+    assert sorted(bulk["contents"]) == ["likes pizza", "lives in NYC"]
+    assert len(bulk["contents"]) == len(bulk["ids"])
+    assert "contents" not in sqlite_driver.entity_fact.get_embeddings_bulk(
+        entity_id, 10
+    )
+
+
+def test_entity_fact_search_lexical(sqlite_driver):
+    """Test full-text candidates are ranked by FTS5 and scoped to the entity."""
+    entity_id = sqlite_driver.entity.create("entity-1")
+    other_id = sqlite_driver.entity.create("entity-2")
+    sqlite_driver.entity_fact.create(
+        entity_id,
+        ["likes pizza", "likes pizza with pineapple pizza", "lives in NYC"],
+        [[1.0, 0.0]] * 3,
+    )
+    sqlite_driver.entity_fact.create(other_id, ["likes pizza"], [[1.0, 0.0]])
+
+    ids = sqlite_driver.entity_fact.search_lexical(entity_id, "Pineapple pizza?", 10)
+    contents = {
+        row["id"]: row["content"]
+        for row in sqlite_driver.entity_fact.get_facts_by_ids(ids)
+    }
+
+    assert [contents[fact_id] for fact_id in ids] == [
+        "likes pizza with pineapple pizza",
+        "likes pizza",
+    ]
+    assert sqlite_driver.entity_fact.search_lexical(entity_id, "?!", 10) == []
+
+
+def test_entity_fact_search_lexical_without_fts_table():
+    """Test lexical search reports itself unavailable without FTS5."""
+    conn = sqlite3.connect(":memory:")
+    driver = Driver(DBAPIAdapter(lambda: conn))
+
+    assert driver.entity_fact.search_lexical(1, "pizza", 10) is None
+    conn.close()
+
+
+def test_knowledge_graph_get_edges(sqlite_driver):
+    """Test an entity's edges are read with names resolved, strongest first."""
+    from memori.memory._struct import SemanticTriple
+
+    def triple(subject, predicate, obj):
+        semantic_triple = SemanticTriple()
+        semantic_triple.subject_name = subject
+        semantic_triple.subject_type = "thing"
+        semantic_triple.predicate = predicate
+        semantic_triple.object_name = obj
+        semantic_triple.object_type = "thing"
+        return semantic_triple
+
+    entity_id = sqlite_driver.entity.create("entity-1")
+    other_id = sqlite_driver.entity.create("entity-2")
+    version = entity_versions.get(entity_id)
+
+    sqlite_driver.knowledge_graph.create(
+        entity_id,
+        [triple("User", "likes", "Pizza"), triple("User", "lives in", "NYC")],
+    )
+    sqlite_driver.knowledge_graph.create(entity_id, [triple("User", "lives in", "NYC")])
+    sqlite_driver.knowledge_graph.create(other_id, [triple("Other", "likes", "Tea")])
+
+    assert [
+        dict(edge) for edge in sqlite_driver.knowledge_graph.get_edges(entity_id)
+    ] == [
+        {"subject_name": "User", "predicate": "lives in", "object_name": "NYC"},
+        {"subject_name": "User", "predicate": "likes", "object_name": "Pizza"},
+    ]
+    assert len(sqlite_driver.knowledge_graph.get_edges(entity_id, 1)) == 1
+    assert entity_versions.get(entity_id) == version + 2
+
+
+def test_entity_fact_create_bumps_entity_version(sqlite_driver):
+    """Test writing facts invalidates cached recall results for the entity."""
+    entity_id = sqlite_driver.entity.create("entity-1")
+    version = entity_versions.get(entity_id)
+
+    sqlite_driver.entity_fact.create(entity_id, ["likes pizza"], [[1.0, 0.0]])
+
+    assert entity_versions.get(entity_id) == version + 1
+
+
+@pytest.mark.parametrize(
+    ("policy", "expected"),
+    [
+        ("frequent", {"often", "often and old"}),
+        ("recent", {"new", "often"}),
+        ("blended", {"often and old", "new"}),
+    ],
+)
+def test_entity_fact_get_embeddings_candidate_policy(sqlite_driver, policy, expected):
+    """Test the embeddings limit is filled by the selected candidate policy."""
+    entity_id = sqlite_driver.entity.create("entity-1")
+    facts = ["often and old", "often", "rare", "new"]
+    sqlite_driver.entity_fact.create(entity_id, facts, [[1.0, 0.0]] * 4)
+
+    conn = sqlite_driver.entity_fact.conn
+    for content, num_times, date_last_time in [
+        ("often and old", 9, "2024-01-01 00:00:00"),
+        ("often", 5, "2024-06-01 00:00:00"),
+        ("rare", 1, "2024-03-01 00:00:00"),
+        ("new", 1, "2024-12-01 00:00:00"),
+    ]:
+        conn.execute(
+            "UPDATE memori_entity_fact SET num_times = ?, date_last_time = ? "
+            "WHERE content = ?",
+            (num_times, date_last_time, content),
+        )
+
+    bulk = sqlite_driver.entity_fact.get_embeddings_bulk(entity_id, 2, policy)
+    rows = sqlite_driver.entity_fact.get_facts_by_ids(bulk["ids"])
+    codes = sqlite_driver.entity_fact.get_embedding_codes_bulk(entity_id, 2, policy)
+
+    assert {row["content"] for row in rows} == expected
+    assert sorted(codes["ids"]) == sorted(bulk["ids"])
+
+
+def test_entity_fact_get_embeddings_unsupported_policy(sqlite_driver):
+    """Test an unknown candidate policy is rejected."""
+    with pytest.raises(ValueError, match="Unsupported recall candidate policy"):
+        sqlite_driver.entity_fact.get_embeddings(1, 10, "random")
@@ -1,3 +1,4 @@
+import sqlite3
 from unittest.mock import MagicMock
 
 import pytest
@@ -170,3 +171,125 @@ def test_create_data_structures_no_migration_mapping(mock_config):
     assert "No migration mapping found for dialect: unknown_dialect" in str(
         exc_info.value
     )
+
+
+def test_create_data_structures_skips_failed_optional_migration(mock_config):
+    """Test that a failing optional migration is rolled back and skipped."""
+    mock_config.storage.adapter.get_dialect.return_value = "postgresql"
+    mock_config.storage.driver.schema.version.read.return_value = 1
+
+    def execute(operation):
+        if "VECTOR" in operation:
+            raise Exception('type "vector" does not exist')
+
+    mock_config.storage.adapter.execute.side_effect = execute
+
+    builder = Builder(mock_config)
+    builder.cli = MagicMock()
+    builder.create_data_structures()
+
+    assert mock_config.storage.adapter.rollback.called
+    mock_config.storage.driver.schema.version.create.assert_called_once_with(
+        max(PostgresqlDriver.migrations)
+    )
+    recorded = {
+        call.args
+        for call in mock_config.storage.driver.schema.skipped.create.call_args_list
+    }
+    assert recorded == {(2, 1)}
+
+
+def test_create_data_structures_retries_skipped_optional_migration(mock_config):
+    """Test that steps skipped by an earlier build are retried when up-to-date."""
+    mock_config.storage.adapter.get_dialect.return_value = "postgresql"
+    mock_config.storage.driver.schema.version.read.return_value = max(
+        PostgresqlDriver.migrations
+    )
+    mock_config.storage.driver.schema.skipped.read.return_value = {
+        (2, 0),
+        (2, 1),
+        (2, 3),
+    }
+
+    def execute(operation):
+        if "CREATE EXTENSION" in operation:
+            raise Exception("permission denied")
+
+    mock_config.storage.adapter.execute.side_effect = execute
+
+    builder = Builder(mock_config)
+    builder.cli = MagicMock()
+    builder.create_data_structures()
+
+    executed = [
+        call.args[0] for call in mock_config.storage.adapter.execute.call_args_list
+    ]
+    assert len(executed) == 2
+    assert "content_embedding_vector VECTOR" in executed[1]
+    deleted = {
+        call.args
+        for call in mock_config.storage.driver.schema.skipped.delete.call_args_list
+    }
+    assert deleted == {(2, 1), (2, 3)}
+    assert not mock_config.storage.driver.schema.skipped.create.called
+    assert not mock_config.storage.driver.schema.version.create.called
+
+
+@pytest.mark.parametrize(
+    ("dialect", "skipped_index", "ran_index"),
+    [
+        ("postgresql", "CREATE VECTOR INDEX", "DROP INDEX"),
+        ("cockroachdb", "DROP INDEX", "CREATE VECTOR INDEX"),
+    ],
+)
+def test_create_data_structures_runs_dialect_specific_steps(
+    mock_config, dialect, skipped_index, ran_index
+):
+    """Test that steps limited to one dialect are neither run nor recorded on another."""
+    mock_config.storage.adapter.get_dialect.return_value = dialect
+    mock_config.storage.driver.schema.version.read.return_value = 0
+
+    builder = Builder(mock_config)
+    builder.cli = MagicMock()
+    builder.create_data_structures()
+
+    executed = " ".join(
+        call.args[0] for call in mock_config.storage.adapter.execute.call_args_list
+    )
+    assert skipped_index not in executed
+    assert ran_index in executed
+    assert not mock_config.storage.driver.schema.skipped.create.called
+
+
+def test_create_data_structures_forgets_skipped_step_once_applied(tmp_path):
+    """Test the skipped-step record round trip against a real database."""
+    path = tmp_path / "memori.db"
+    config = Config()
+    storage = StorageManager(config).start(lambda: sqlite3.connect(path))
+    config.storage = storage
+    builder = Builder(config).disable_banner()
+    builder.cli = MagicMock()
+    builder.create_data_structures()
+
+    storage.driver.schema.skipped.create(4, 0)
+    storage.adapter.commit()
+    assert storage.driver.schema.skipped.read() == {(4, 0)}
+
+    builder.create_data_structures()
+
+    assert storage.driver.schema.skipped.read() == set()
+
+
+def test_create_data_structures_raises_failed_required_migration(mock_config):
+    """Test that a failing required migration still aborts the build."""
+    mock_config.storage.adapter.get_dialect.return_value = "postgresql"
+    mock_config.storage.driver.schema.version.read.return_value = 0
+    mock_config.storage.adapter.execute.side_effect = Exception("Syntax error")
+
+    builder = Builder(mock_config)
+    builder.cli = MagicMock()
+
+    with pytest.raises(Exception, match="Syntax error"):
+        builder.create_data_structures()
+
+    assert not mock_config.storage.driver.schema.version.create.called
@@ -0,0 +1,216 @@
+r"""
+ __  __                           _
+|  \/  | ___ _ __ ___   ___  _ __(_)
+| |\/| |/ _ \ '_ ` _ \ / _ \| '__| |
+| |  | |  __/ | | | | | (_) | |  | |
+|_|  |_|\___|_| |_| |_|\___/|_|  |_|
+                 perfectam memoriam
+                      memorilabs.ai
+"""
+
+from unittest.mock import patch
+
+import numpy as np
+
+from memori._cache import (
+    EntityGraphCache,
+    EntityIndexCache,
+    RecallResultCache,
+    entity_versions,
+)
+from memori._config import Config
+from memori._search import EntityIndex
+
+
+def _index(rows: int, dim: int = 4) -> EntityIndex:
+    vectors = np.ones((rows, dim), dtype=np.float32)
+    return EntityIndex(dim).add(list(range(rows)), vectors)
+
+
+def test_entity_index_cache_get_miss_and_hit():
+    config = Config()
+    config.recall_index_cache_max_bytes = 1024 * 1024
+    cache = EntityIndexCache(config)
+    index = _index(2)
+
+    assert cache.get(1) is None
+    cache.put(1, index)
+
+    assert cache.get(1) is index
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entity_index_cache_evicts_least_recently_used():
+    config = Config()
+    config.recall_index_cache_max_bytes = _index(10).nbytes * 2
+    cache = EntityIndexCache(config)
+
+    cache.put(1, _index(10))
+    cache.put(2, _index(10))
+    cache.get(1)
+    cache.put(3, _index(10))
+
+    assert 1 in cache
+    assert 2 not in cache
+    assert 3 in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entity_index_cache_disabled_by_default():
+    config = Config()
+    cache = EntityIndexCache(config)
+
+    cache.put(1, _index(2))
+
+    assert len(cache) == 0
+
+
+def test_entity_index_cache_append_only_updates_cached_entities():
+    config = Config()
+    config.recall_index_cache_max_bytes = 1024 * 1024
+    cache = EntityIndexCache(config)
+    cache.put(1, _index(2))
+
+    assert cache.append(1, [10], np.ones((1, 4), dtype=np.float32)) is True
+    assert cache.append(2, [10], np.ones((1, 4), dtype=np.float32)) is False
+    assert len(cache.peek(1)) == 3
+
+
+def test_entity_index_cache_invalidate_and_clear():
+    config = Config()
+    cache = EntityIndexCache(config)
+    cache.put(1, _index(2))
+    cache.put(2, _index(2))
+
+    cache.invalidate(1)
+    assert 1 not in cache
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+
+
+def _result_cache() -> RecallResultCache:
+    config = Config()
+    config.recall_result_cache_max_entries = 16
+    return RecallResultCache(config)
+
+
+def test_recall_result_cache_hit_normalizes_query():
+    cache = _result_cache()
+    facts = [{"id": 1, "content": "User likes pizza", "similarity": 0.9}]
+
+    assert cache.get(901, "What do I like?", 5) is None
+    cache.put(901, "What do I like?", 5, facts, entity_versions.get(901))
+
+    assert cache.get(901, "  what do I   LIKE? ", 5) == facts
+    assert cache.get(901, "What do I like?", 3) is None
+    assert cache.stats() == {"entries": 1, "evictions": 0, "hits": 1, "misses": 2}
+
+
+def test_recall_result_cache_invalidated_by_entity_version():
+    cache = RecallResultCache(Config())
+    version = entity_versions.get(902)
+    cache.put(902, "query", 5, [{"id": 1}], version)
+
+    entity_versions.bump(902)
+
+    assert cache.get(902, "query", 5) is None
+    assert len(cache) == 0
+
+
+def test_recall_result_cache_stale_version_at_put():
+    cache = RecallResultCache(Config())
+    version = entity_versions.get(903)
+    entity_versions.bump(903)
+
+    cache.put(903, "query", 5, [{"id": 1}], version)
+
+    assert cache.get(903, "query", 5) is None
+
+
+def test_recall_result_cache_expires_after_ttl():
+    config = Config()
+    config.recall_result_cache_max_entries = 16
+    config.recall_result_cache_ttl_seconds = 10
+    cache = RecallResultCache(config)
+
+    with patch("memori._cache.time.monotonic", return_value=100.0):
+        cache.put(904, "query", 5, [{"id": 1}], entity_versions.get(904))
+    with patch("memori._cache.time.monotonic", return_value=109.0):
+        assert cache.get(904, "query", 5) == [{"id": 1}]
+    with patch("memori._cache.time.monotonic", return_value=110.0):
+        assert cache.get(904, "query", 5) is None
+
+
+def test_recall_result_cache_evicts_and_disables():
+    config = Config()
+    config.recall_result_cache_max_entries = 2
+    cache = RecallResultCache(config)
+
+    for query in ["a", "b", "c"]:
+        cache.put(905, query, 5, [], entity_versions.get(905))
+
+    assert cache.get(905, "a", 5) is None
+    assert cache.stats()["evictions"] == 1
+
+    config.recall_result_cache_max_entries = 0
+    assert cache.get(905, "c", 5) is None
+
+
+def test_recall_result_cache_disabled_by_default():
+    cache = RecallResultCache(Config())
+    cache.put(908, "query", 5, [{"id": 1}], entity_versions.get(908))
+
+    assert cache.get(908, "query", 5) is None
+    assert len(cache) == 0
+
+
+def test_recall_result_cache_get_stale_serves_invalidated_results():
+    cache = _result_cache()
+    version = entity_versions.get(907)
+    cache.put(907, "query", 5, [{"id": 1}], version)
+
+    assert cache.get_stale(907, "query", 5) == [{"id": 1}]
+
+    entity_versions.bump(907)
+    assert cache.get(907, "query", 5) is None
+    assert len(cache) == 0
+    assert cache.get_stale(907, "  QUERY ", 5) == [{"id": 1}]
+    assert cache.get_stale(907, "query", 3) is None
+
+    cache.put(907, "query", 5, [{"id": 2}], entity_versions.get(907))
+    assert cache.get_stale(907, "query", 5) == [{"id": 2}]
+    assert cache.stats()["hits"] == 0
+
+    cache.clear()
+    assert cache.get_stale(907, "query", 5) is None
+
+
+def test_entity_graph_cache_invalidated_by_entity_version():
+    cache = EntityGraphCache(Config())
+    graph = object()
+
+    cache.put(906, graph, entity_versions.get(906))
+    assert cache.get(906) is graph
+
+    entity_versions.bump(906)
+    assert cache.get(906) is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_entity_graph_cache_evicts_and_disables():
+    config = Config()
+    config.recall_graph.cache_max_entities = 1
+    cache = EntityGraphCache(config)
+
+    cache.put(907, "a", entity_versions.get(907))
+    cache.put(908, "b", entity_versions.get(908))
+
+    assert cache.get(907) is None
+    assert cache.get(908) == "b"
+    assert cache.stats()["evictions"] == 1
+
+    config.recall_graph.cache_max_entities = 0
+    assert cache.get(908) is None
@@ -0,0 +1,121 @@
+r"""
+ __  __                           _
+|  \/  | ___ _ __ ___   ___  _ __(_)
+| |\/| |/ _ \ '_ ` _ \ / _ \| '__| |
+| |  | |  __/ | | | | | (_) | |  | |
+|_|  |_|\___|_| |_| |_|\___/|_|  |_|
+                 perfectam memoriam
+                      memorilabs.ai
+"""
+
+from unittest.mock import MagicMock
+
+from memori._cache import EntityGraphCache, entity_versions
+from memori._config import Config
+from memori._graph import EntityGraph, expand_facts_with_graph
+
+
+def _edge(subject, predicate, obj):
+    return {"subject_name": subject, "predicate": predicate, "object_name": obj}
+
+
+EDGES = [
+    _edge("User", "lives in", "New York"),
+    _edge("New York", "is in", "USA"),
+    _edge("USA", "uses", "US Dollar"),
+    _edge("User", "likes", "Pizza"),
+    _edge("Pizza", "comes from", "Italy"),
+]
+
+
+def _graph_config(**overrides):
+    graph = Config().recall_graph
+    graph.enabled = True
+    for key, value in overrides.items():
+        setattr(graph, key, value)
+    return graph
+
+
+def test_entity_graph_seeds_match_whole_words():
+    graph = EntityGraph(EDGES)
+
+    assert graph.seeds("The user moved to  new york last year") == [
+        "user",
+        "new york",
+    ]
+    assert graph.seeds("Users like pizzas") == []
+
+
+def test_entity_graph_expand_respects_hops():
+    graph = EntityGraph(EDGES)
+
+    one_hop = graph.expand({"new york": 0.8}, 1, 5, 10)
+    assert [(content, hops) for content, hops, _ in one_hop] == [
+        ("User lives in New York", 1),
+        ("New York is in USA", 1),
+    ]
+
+    two_hops = graph.expand({"new york": 0.8}, 2, 5, 10)
+    assert [content for content, _, _ in two_hops][2:] == [
+        "User likes Pizza",
+        "USA uses US Dollar",
+    ]
+    assert {similarity for _, _, similarity in two_hops} == {0.8}
+
+
+def test_entity_graph_expand_respects_fan_out_and_max_facts():
+    graph = EntityGraph(EDGES)
+
+    assert [content for content, _, _ in graph.expand({"user": 1.0}, 1, 1, 10)] == [
+        "User lives in New York"
+    ]
+    assert len(graph.expand({"user": 1.0}, 3, 5, 3)) == 3
+    assert graph.expand({"user": 1.0}, 3, 5, 0) == []
+
+
+def test_expand_facts_with_graph_appends_reachable_facts():
+    driver = MagicMock()
+    driver.get_edges.return_value = EDGES
+    facts = [
+        {"id": 1, "content": "User lives in New York", "similarity": 0.9},
+    ]
+
+    result = expand_facts_with_graph(
+        driver, 42, facts, _graph_config(max_hops=1, max_facts=2)
+    )
+
+    assert result[0] == facts[0]
+    assert result[1:] == [
+        {"id": None, "content": "User likes Pizza", "similarity": 0.9, "hops": 1},
+        {"id": None, "content": "New York is in USA", "similarity": 0.9, "hops": 1},
+    ]
+    driver.get_edges.assert_called_once_with(42, 10_000)
+
+
+def test_expand_facts_with_graph_caches_adjacency():
+    config = Config()
+    config.recall_graph.enabled = True
+    cache = EntityGraphCache(config)
+    driver = MagicMock()
+    driver.get_edges.return_value = EDGES
+    facts = [{"id": 1, "content": "likes Pizza", "similarity": 0.5}]
+
+    for _ in range(2):
+        expand_facts_with_graph(driver, 909, facts, config.recall_graph, cache)
+    assert driver.get_edges.call_count == 1
+
+    entity_versions.bump(909)
+    expand_facts_with_graph(driver, 909, facts, config.recall_graph, cache)
+    assert driver.get_edges.call_count == 2
+
+
+def test_expand_facts_with_graph_disabled_or_unmatched():
+    driver = MagicMock()
+    driver.get_edges.return_value = EDGES
+    facts = [{"id": 1, "content": "Enjoys hiking", "similarity": 0.5}]
+
+    assert expand_facts_with_graph(driver, 42, facts, Config().recall_graph) == facts
+    driver.get_edges.assert_not_called()
+
+    assert expand_facts_with_graph(driver, 42, facts, _graph_config()) == facts
+    assert expand_facts_with_graph(driver, 42, [], _graph_config()) == []
@@ -1,3 +1,6 @@
+import subprocess
+import sys
+
 import pytest
 
 from memori import Memori
@@ -67,3 +70,104 @@ def test_set_session_resets_cache(mocker):
 
     assert mem.config.cache.conversation_id is None
     assert mem.config.cache.session_id is None
+
+
+def test_attribution_prefetches_recall(mocker):
+    mock_conn = mocker.Mock(spec=["cursor", "commit", "rollback"])
+    mock_conn.__module__ = "psycopg"
+    type(mock_conn).__module__ = "psycopg"
+    mock_conn.cursor = mocker.MagicMock(return_value=mocker.MagicMock())
+
+    mem = Memori(conn=lambda: mock_conn)
+    prefetch = mocker.patch.object(mem.config.augmentation, "prefetch")
+
+    mem.attribution(entity_id="user-1")
+    prefetch.assert_not_called()
+
+    mem.config.recall_prefetch = True
+    mem.attribution(entity_id="user-1")
+    mem.new_session()
+
+    assert prefetch.call_args_list == [mocker.call("user-1"), mocker.call("user-1")]
+
+
+def test_attribution_resets_cached_entity_id(mocker):
+    mock_conn = mocker.Mock(spec=["cursor", "commit", "rollback"])
+    mock_conn.__module__ = "psycopg"
+    type(mock_conn).__module__ = "psycopg"
+    mock_conn.cursor = mocker.MagicMock(return_value=mocker.MagicMock())
+
+    mem = Memori(conn=lambda: mock_conn).attribution(entity_id="user-1")
+    mem.config.cache.entity_id = 7
+
+    mem.attribution(entity_id="user-1")
+    assert mem.config.cache.entity_id == 7
+
+    mem.attribution(entity_id="user-2")
+    assert mem.config.cache.entity_id is None
+
+
+def test_warmup_encodes_in_background(mocker):
+    mock_conn = mocker.Mock(spec=["cursor", "commit", "rollback"])
+    mock_conn.__module__ = "psycopg"
+    type(mock_conn).__module__ = "psycopg"
+    mock_conn.cursor = mocker.MagicMock(return_value=mocker.MagicMock())
+    mock_embed = mocker.patch("memori.embed_texts")
+
+    mem = Memori(conn=lambda: mock_conn, warmup=True)
+    mem.warmup_thread.join(timeout=5)
+
+    mock_embed.assert_called_once_with(
+        "warmup",
+        mem.config.embeddings.model,
+        mem.config.embeddings.fallback_dimension,
+        onnx=mem.config.embeddings.onnx,
+    )
+
+
+def test_warmup_failure_is_logged(mocker, caplog):
+    mock_conn = mocker.Mock(spec=["cursor", "commit", "rollback"])
+    mock_conn.__module__ = "psycopg"
+    type(mock_conn).__module__ = "psycopg"
+    mock_conn.cursor = mocker.MagicMock(return_value=mocker.MagicMock())
+    mocker.patch("memori.embed_texts", side_effect=OSError("model not found"))
+
+    mem = Memori(conn=lambda: mock_conn)
+    with caplog.at_level("WARNING", logger="memori"):
+        mem._warmup()
+
+    assert "Embedding warmup failed: model not found" in caplog.text
+
+
+def test_warmup_is_off_by_default(mocker):
+    mock_conn = mocker.Mock(spec=["cursor", "commit", "rollback"])
+    mock_conn.__module__ = "psycopg"
+    type(mock_conn).__module__ = "psycopg"
+    mock_conn.cursor = mocker.MagicMock(return_value=mocker.MagicMock())
+    mock_embed = mocker.patch("memori.embed_texts")
+
+    mem = Memori(conn=lambda: mock_conn)
+
+    assert mem.warmup_thread is None
+    mock_embed.assert_not_called()
+
+
+def test_import_does_not_load_heavy_modules():
+    script = (
+        "import sys\n"
+        "import memori\n"
+        "heavy = [\n"
+        "    'botocore', 'faiss', 'google.protobuf', 'grpc', 'psycopg',\n"
+        "    'pyfiglet', 'sentence_transformers', 'torch',\n"
+        "]\n"
+        "print(','.join(m for m in heavy if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        check=True,
+        text=True,
+        timeout=120,
+    )
+
+    assert result.stdout.strip() == ""
@@ -13,8 +13,35 @@ import struct
 from unittest.mock import MagicMock
 
 import numpy as np
-
-from memori._search import find_similar_embeddings, parse_embedding, search_entity_facts
+import pytest
+
+from memori._cache import EntityIndexCache
+from memori._config import Config
+from memori._search import (
+    BinaryEntityIndex,
+    EntityIndex,
+    binary_codes,
+    build_binary_entity_index_from_bulk,
+    build_entity_index,
+    decode_embeddings_bulk,
+    encode_binary_code,
+    encode_embedding,
+    find_similar_embeddings,
+    pack_code_rows,
+    pack_embedding_rows,
+    parse_embedding,
+    reciprocal_rank_fusion,
+    refresh_entity_index,
+    rescore_facts,
+    search_entity_facts,
+    search_entity_facts_many,
+)
+
+
+def _index_cache() -> EntityIndexCache:
+    config = Config()
+    config.recall_index_cache_max_bytes = 1024 * 1024
+    return EntityIndexCache(config)
 
 
 def test_parse_embedding_from_bytes_postgresql():
@@ -200,11 +227,13 @@ def test_find_similar_embeddings_high_dimensional():
 
 def test_search_entity_facts_success():
     mock_driver = MagicMock()
-    mock_driver.get_embeddings.return_value = [
-        {"id": 1, "content_embedding": [1.0, 0.0, 0.0]},
-        {"id": 2, "content_embedding": [0.0, 1.0, 0.0]},
-        {"id": 3, "content_embedding": [0.0, 0.0, 1.0]},
-    ]
+    mock_driver.get_embeddings_bulk.return_value = pack_embedding_rows(
+        [
+            {"id": 1, "content_embedding": [1.0, 0.0, 0.0]},
+            {"id": 2, "content_embedding": [0.0, 1.0, 0.0]},
+            {"id": 3, "content_embedding": [0.0, 0.0, 1.0]},
+        ]
+    )
     mock_driver.get_facts_by_ids.return_value = [
         {"id": 1, "content": "Fact one"},
         {"id": 2, "content": "Fact two"},
@@ -225,13 +254,13 @@ def test_search_entity_facts_success():
     assert "similarity" in result[0]
     assert isinstance(result[0]["similarity"], float)
 
-    mock_driver.get_embeddings.assert_called_once_with(42, 1000)
+    mock_driver.get_embeddings_bulk.assert_called_once_with(42, 1000, policy="frequent")
     mock_driver.get_facts_by_ids.assert_called_once()
 
 
 def test_search_entity_facts_no_embeddings():
     mock_driver = MagicMock()
-    mock_driver.get_embeddings.return_value = []
+    mock_driver.get_embeddings_bulk.return_value = pack_embedding_rows([])
 
     query_embedding = [1.0, 0.0, 0.0]
     result = search_entity_facts(
@@ -243,15 +272,17 @@ def test_search_entity_facts_no_embeddings():
     )
 
     assert result == []
-    mock_driver.get_embeddings.assert_called_once_with(42, 1000)
+    mock_driver.get_embeddings_bulk.assert_called_once_with(42, 1000, policy="frequent")
     mock_driver.get_facts_by_ids.assert_not_called()
 
 
 def test_search_entity_facts_no_similar_results():
     mock_driver = MagicMock()
-    mock_driver.get_embeddings.return_value = [
-        {"id": 1, "content_embedding": "invalid_json"},
-    ]
+    mock_driver.get_embeddings_bulk.return_value = pack_embedding_rows(
+        [
+            {"id": 1, "content_embedding": "invalid_json"},
+        ]
+    )
 
     query_embedding = [1.0, 0.0, 0.0]
     result = search_entity_facts(
@@ -268,10 +299,12 @@ def test_search_entity_facts_no_similar_results():
 
 def test_search_entity_facts_respects_limit():
     mock_driver = MagicMock()
-    mock_driver.get_embeddings.return_value = [
-        {"id": i, "content_embedding": [1.0 if j == i else 0.0 for j in range(5)]}
-        for i in range(5)
-    ]
+    mock_driver.get_embeddings_bulk.return_value = pack_embedding_rows(
+        [
+            {"id": i, "content_embedding": [1.0 if j == i else 0.0 for j in range(5)]}
+            for i in range(5)
+        ]
+    )
     mock_driver.get_facts_by_ids.return_value = [
         {"id": i, "content": f"Fact {i}"} for i in range(3)
     ]
@@ -290,9 +323,11 @@ def test_search_entity_facts_respects_limit():
 
 def test_search_entity_facts_returns_required_keys():
     mock_driver = MagicMock()
-    mock_driver.get_embeddings.return_value = [
-        {"id": 1, "content_embedding": [1.0, 0.0, 0.0]},
-    ]
+    mock_driver.get_embeddings_bulk.return_value = pack_embedding_rows(
+        [
+            {"id": 1, "content_embedding": [1.0, 0.0, 0.0]},
+        ]
+    )
     mock_driver.get_facts_by_ids.return_value = [
         {"id": 1, "content": "Fact one"},
     ]
@@ -314,10 +349,12 @@ def test_search_entity_facts_returns_required_keys():
 
 def test_search_entity_facts_handles_missing_content():
     mock_driver = MagicMock()
-    mock_driver.get_embeddings.return_value = [
-        {"id": 1, "content_embedding": [1.0, 0.0, 0.0]},
-        {"id": 2, "content_embedding": [0.0, 1.0, 0.0]},
-    ]
+    mock_driver.get_embeddings_bulk.return_value = pack_embedding_rows(
+        [
+            {"id": 1, "content_embedding": [1.0, 0.0, 0.0]},
+            {"id": 2, "content_embedding": [0.0, 1.0, 0.0]},
+        ]
+    )
     mock_driver.get_facts_by_ids.return_value = [
         {"id": 1, "content": "Fact one"},
     ]
@@ -337,11 +374,13 @@ def test_search_entity_facts_handles_missing_content():
 
 def test_search_entity_facts_maintains_similarity_order():
     mock_driver = MagicMock()
-    mock_driver.get_embeddings.return_value = [
-        {"id": 1, "content_embedding": [1.0, 0.0, 0.0]},
-        {"id": 2, "content_embedding": [0.707, 0.707, 0.0]},
-        {"id": 3, "content_embedding": [0.0, 1.0, 0.0]},
-    ]
+    mock_driver.get_embeddings_bulk.return_value = pack_embedding_rows(
+        [
+            {"id": 1, "content_embedding": [1.0, 0.0, 0.0]},
+            {"id": 2, "content_embedding": [0.707, 0.707, 0.0]},
+            {"id": 3, "content_embedding": [0.0, 1.0, 0.0]},
+        ]
+    )
     mock_driver.get_facts_by_ids.return_value = [
         {"id": 1, "content": "Most similar"},
         {"id": 2, "content": "Somewhat similar"},
@@ -365,11 +404,13 @@ def test_search_entity_facts_maintains_similarity_order():
 
 def test_search_entity_facts_with_different_db_formats():
     mock_driver = MagicMock()
-    mock_driver.get_embeddings.return_value = [
-        {"id": 1, "content_embedding": json.dumps([1.0, 0.0, 0.0])},
-        {"id": 2, "content_embedding": struct.pack("<3f", 0.0, 1.0, 0.0)},
-        {"id": 3, "content_embedding": [0.0, 0.0, 1.0]},
-    ]
+    mock_driver.get_embeddings_bulk.return_value = pack_embedding_rows(
+        [
+            {"id": 1, "content_embedding": json.dumps([1.0, 0.0, 0.0])},
+            {"id": 2, "content_embedding": struct.pack("<3f", 0.0, 1.0, 0.0)},
+            {"id": 3, "content_embedding": [0.0, 0.0, 1.0]},
+        ]
+    )
     mock_driver.get_facts_by_ids.return_value = [
         {"id": 1, "content": "Fact one"},
         {"id": 2, "content": "Fact two"},
@@ -387,3 +428,739 @@ def test_search_entity_facts_with_different_db_formats():
 
     assert len(result) == 3
     assert result[0]["id"] == 1
+
+
+def test_entity_index_search_matches_find_similar_embeddings():
+    embeddings = [
+        (1, [1.0, 0.0, 0.0]),
+        (2, [0.707, 0.707, 0.0]),
+        (3, [0.0, 0.0, 1.0]),
+    ]
+    query = [1.0, 0.0, 0.0]
+
+    index = build_entity_index(embeddings, 3)
+
+    assert index is not None
+    assert index.search(query, 3) == find_similar_embeddings(embeddings, query, 3)
+
+
+def test_entity_index_add_does_not_mutate_input():
+    vectors = np.array([[3.0, 4.0]], dtype=np.float32)
+    EntityIndex(2).add([1], vectors)
+
+    np.testing.assert_array_equal(vectors, [[3.0, 4.0]])
+
+
+def test_search_entity_facts_reuses_cached_index():
+    mock_driver = MagicMock()
+    mock_driver.get_embeddings_bulk.return_value = pack_embedding_rows(
+        [
+            {"id": 1, "content_embedding": [1.0, 0.0, 0.0]},
+            {"id": 2, "content_embedding": [0.0, 1.0, 0.0]},
+        ]
+    )
+    mock_driver.get_facts_by_ids.return_value = [{"id": 1, "content": "Fact one"}]
+    index_cache = _index_cache()
+
+    for _ in range(3):
+        result = search_entity_facts(
+            mock_driver,
+            entity_id=42,
+            query_embedding=[1.0, 0.0, 0.0],
+            limit=1,
+            embeddings_limit=1000,
+            index_cache=index_cache,
+        )
+        assert result[0]["id"] == 1
+
+    mock_driver.get_embeddings_bulk.assert_called_once_with(42, 1000, policy="frequent")
+    assert 42 in index_cache
+
+
+def test_search_entity_facts_rebuilds_on_dimension_change():
+    mock_driver = MagicMock()
+    mock_driver.get_embeddings_bulk.return_value = pack_embedding_rows(
+        [
+            {"id": 1, "content_embedding": [1.0, 0.0]},
+        ]
+    )
+    mock_driver.get_facts_by_ids.return_value = [{"id": 1, "content": "Fact one"}]
+    index_cache = _index_cache()
+    index_cache.put(42, EntityIndex(3).add([9], np.ones((1, 3), dtype=np.float32)))
+
+    result = search_entity_facts(
+        mock_driver,
+        entity_id=42,
+        query_embedding=[1.0, 0.0],
+        limit=1,
+        embeddings_limit=1000,
+        index_cache=index_cache,
+    )
+
+    assert result[0]["id"] == 1
+    assert index_cache.peek(42).dim == 2
+
+
+def test_refresh_entity_index_appends_only_new_rows():
+    from memori._utils import generate_uniq
+
+    index_cache = _index_cache()
+    index_cache.put(42, EntityIndex(2).add([1], np.array([[0.0, 1.0]])))
+
+    mock_driver = MagicMock()
+    mock_driver.get_ids_by_uniqs.return_value = [
+        {"id": 1, "uniq": generate_uniq(["old fact"])},
+        {"id": 2, "uniq": generate_uniq(["new fact"])},
+    ]
+
+    refresh_entity_index(
+        index_cache,
+        mock_driver,
+        42,
+        ["old fact", "new fact"],
+        [[0.0, 1.0], [1.0, 0.0]],
+    )
+
+    index = index_cache.peek(42)
+    assert index.ids == [1, 2]
+    assert index.search([1.0, 0.0], 1)[0][0] == 2
+
+
+def test_search_entity_facts_fetch_content_single_round_trip():
+    mock_driver = MagicMock()
+    mock_driver.get_embeddings_bulk.return_value = pack_embedding_rows(
+        [
+            {"id": 1, "content_embedding": [1.0, 0.0], "content": "Fact one"},
+            {"id": 2, "content_embedding": [0.0, 1.0], "content": "Fact two"},
+        ],
+        with_content=True,
+    )
+    index_cache = _index_cache()
+
+    for _ in range(2):
+        result = search_entity_facts(
+            mock_driver,
+            entity_id=42,
+            query_embedding=[0.0, 1.0],
+            limit=1,
+            embeddings_limit=1000,
+            index_cache=index_cache,
+            fetch_content=True,
+        )
+        assert result == [{"id": 2, "content": "Fact two", "similarity": 1.0}]
+
+    mock_driver.get_embeddings_bulk.assert_called_once_with(
+        42, 1000, policy="frequent", with_content=True
+    )
+    mock_driver.get_facts_by_ids.assert_not_called()
+    assert index_cache.peek(42).contents_nbytes > 0
+
+
+def test_search_entity_facts_fetch_content_rebuilds_index_without_contents():
+    mock_driver = MagicMock()
+    mock_driver.get_embeddings_bulk.return_value = pack_embedding_rows(
+        [{"id": 1, "content_embedding": [1.0, 0.0], "content": "Fact one"}],
+        with_content=True,
+    )
+    index_cache = _index_cache()
+    index_cache.put(42, EntityIndex(2).add([1], np.array([[1.0, 0.0]])))
+
+    result = search_entity_facts(
+        mock_driver, 42, [1.0, 0.0], 1, 1000, index_cache, fetch_content=True
+    )
+
+    assert result[0]["content"] == "Fact one"
+    assert index_cache.peek(42).contents == {1: "Fact one"}
+    mock_driver.get_facts_by_ids.assert_not_called()
+
+
+def test_refresh_entity_index_keeps_contents():
+    from memori._utils import generate_uniq
+
+    index_cache = _index_cache()
+    index_cache.put(42, EntityIndex(2).add([1], np.array([[0.0, 1.0]]), ["old fact"]))
+
+    mock_driver = MagicMock()
+    mock_driver.get_ids_by_uniqs.return_value = [
+        {"id": 2, "uniq": generate_uniq(["new fact"])},
+    ]
+
+    refresh_entity_index(index_cache, mock_driver, 42, ["new fact"], [[1.0, 0.0]])
+
+    assert index_cache.peek(42).contents == {1: "old fact", 2: "new fact"}
+
+
+def test_refresh_entity_index_skips_uncached_entity():
+    index_cache = _index_cache()
+    mock_driver = MagicMock()
+
+    refresh_entity_index(index_cache, mock_driver, 42, ["fact"], [[1.0, 0.0]])
+
+    mock_driver.get_ids_by_uniqs.assert_not_called()
+
+
+def _ann_config(**overrides):
+    ann = Config().recall_ann
+    ann.enabled = True
+    for key, value in overrides.items():
+        setattr(ann, key, value)
+    return ann
+
+
+def _random_index(rows: int, dim: int) -> tuple[EntityIndex, np.ndarray]:
+    rng = np.random.default_rng(7)
+    vectors = rng.standard_normal((rows, dim)).astype(np.float32)
+    return EntityIndex(dim).add(list(range(rows)), vectors), vectors
+
+
+def test_entity_index_build_ann_disabled_by_default():
+    from concurrent.futures import ThreadPoolExecutor
+
+    index, _ = _random_index(50, 8)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert index.build_ann(Config().recall_ann, executor) is None
+
+    assert index.ann is None
+
+
+def test_entity_index_build_ann_below_threshold():
+    from concurrent.futures import ThreadPoolExecutor
+
+    index, _ = _random_index(50, 8)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert index.build_ann(_ann_config(hnsw_min_facts=100), executor) is None
+
+
+def test_entity_index_hnsw_search_is_rescored_exactly():
+    from concurrent.futures import ThreadPoolExecutor
+
+    index, vectors = _random_index(500, 16)
+    query = vectors[42].tolist()
+    exact = index.search(query, 5)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        index.build_ann(_ann_config(hnsw_min_facts=100), executor).result()
+
+    assert index.ann_kind == "hnsw"
+    approximate = index.search(query, 5)
+    assert approximate[0][0] == 42
+    assert approximate[0][1] == pytest.approx(exact[0][1], abs=1e-5)
+
+
+def test_entity_index_ivfpq_selected_for_large_entities():
+    from concurrent.futures import ThreadPoolExecutor
+
+    index, vectors = _random_index(3000, 16)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        index.build_ann(
+            _ann_config(hnsw_min_facts=100, ivfpq_min_facts=2000), executor
+        ).result()
+
+    assert index.ann_kind == "ivfpq"
+    assert index.search(vectors[7].tolist(), 1)[0][0] == 7
+
+
+def test_entity_index_ann_receives_appended_rows():
+    from concurrent.futures import ThreadPoolExecutor
+
+    index, _ = _random_index(500, 16)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        index.build_ann(_ann_config(hnsw_min_facts=100), executor).result()
+
+    new_vector = np.zeros((1, 16), dtype=np.float32)
+    new_vector[0, 3] = 1.0
+    index.add([1000], new_vector)
+
+    assert index.ann.ntotal == 501
+    assert index.search(new_vector[0].tolist(), 1)[0][0] == 1000
+
+
+def test_pack_embedding_rows_joins_binary_rows():
+    rows = [
+        {"id": 1, "content_embedding": struct.pack("<2f", 1.0, 0.0)},
+        {"id": 2, "content_embedding": memoryview(struct.pack("<2f", 0.0, 1.0))},
+    ]
+
+    bulk = pack_embedding_rows(rows)
+
+    assert bulk["ids"] == [1, 2]
+    assert bulk["sizes"] == [8, 8]
+    assert bulk["buffer"] == struct.pack("<4f", 1.0, 0.0, 0.0, 1.0)
+
+
+def test_pack_embedding_rows_converts_legacy_formats():
+    rows = [
+        {"id": 1, "content_embedding": json.dumps([1.0, 0.0])},
+        {"id": 2, "content_embedding": [0.0, 1.0]},
+        {"id": 3, "content_embedding": "not_valid_json"},
+    ]
+
+    bulk = pack_embedding_rows(rows)
+
+    assert bulk["sizes"] == [8, 8, 0]
+    assert bulk["buffer"] == struct.pack("<4f", 1.0, 0.0, 0.0, 1.0)
+
+
+def test_decode_embeddings_bulk_is_zero_copy():
+    buffer = struct.pack("<4f", 1.0, 0.0, 0.0, 1.0)
+    bulk = {"ids": [1, 2], "sizes": [8, 8], "buffer": buffer}
+
+    ids, matrix = decode_embeddings_bulk(bulk, 2)
+
+    assert ids == [1, 2]
+    assert matrix.shape == (2, 2)
+    assert matrix.dtype == np.float32
+    assert np.shares_memory(matrix, np.frombuffer(buffer, dtype=np.uint8))
+
+
+def test_decode_embeddings_bulk_filters_mismatched_dimensions():
+    bulk = pack_embedding_rows(
+        [
+            {"id": 1, "content_embedding": struct.pack("<3f", 1.0, 0.0, 0.0)},
+            {"id": 2, "content_embedding": struct.pack("<2f", 0.0, 1.0)},
+            {"id": 3, "content_embedding": struct.pack("<3f", 0.0, 0.0, 1.0)},
+        ]
+    )
+
+    ids, matrix = decode_embeddings_bulk(bulk, 3)
+
+    assert ids == [1, 3]
+    np.testing.assert_array_equal(matrix, [[1.0, 0.0, 0.0], [0.0, 0.0, 1.0]])
+
+
+def test_decode_embeddings_bulk_no_matching_rows():
+    bulk = pack_embedding_rows([{"id": 1, "content_embedding": [1.0, 0.0]}])
+
+    assert decode_embeddings_bulk(bulk, 3) == ([], None)
+
+
+def test_search_entity_facts_native_vector():
+    mock_driver = MagicMock()
+    mock_driver.search_embeddings.return_value = [
+        {"id": 7, "content": "User likes pizza", "similarity": 0.91}
+    ]
+
+    results = search_entity_facts(
+        mock_driver, 1, [1.0, 0.0], 5, 1000, native_vector=True
+    )
+
+    assert results == [{"id": 7, "content": "User likes pizza", "similarity": 0.91}]
+    mock_driver.search_embeddings.assert_called_once_with(1, [1.0, 0.0], 5)
+    mock_driver.get_embeddings_bulk.assert_not_called()
+    mock_driver.get_facts_by_ids.assert_not_called()
+
+
+@pytest.mark.parametrize("native_result", [None, [], NotImplementedError])
+def test_search_entity_facts_native_vector_fallback(native_result):
+    mock_driver = MagicMock()
+    if native_result is NotImplementedError:
+        mock_driver.search_embeddings.side_effect = NotImplementedError
+    else:
+        mock_driver.search_embeddings.return_value = native_result
+    mock_driver.get_embeddings_bulk.return_value = pack_embedding_rows(
+        [{"id": 1, "content_embedding": [1.0, 0.0]}]
+    )
+    mock_driver.get_facts_by_ids.return_value = [{"id": 1, "content": "Fact"}]
+
+    results = search_entity_facts(
+        mock_driver, 1, [1.0, 0.0], 5, 1000, native_vector=True
+    )
+
+    assert [r["id"] for r in results] == [1]
+    mock_driver.get_embeddings_bulk.assert_called_once_with(1, 1000, policy="frequent")
+
+
+@pytest.mark.parametrize(
+    ("dtype", "size", "tolerance"),
+    [
+        ("float32", 384 * 4, 0.0),
+        ("float16", 4 + 384 * 2, 2e-3),
+        ("int8", 8 + 384, 2e-2),
+    ],
+)
+def test_encode_embedding_round_trip(dtype, size, tolerance):
+    embedding = np.random.default_rng(0).standard_normal(384).astype(np.float32)
+
+    raw = encode_embedding(embedding, dtype)
+
+    assert len(raw) == size
+    np.testing.assert_allclose(parse_embedding(raw), embedding, atol=tolerance)
+
+
+def test_encode_embedding_int8_zero_vector():
+    raw = encode_embedding([0.0, 0.0, 0.0], "int8")
+
+    np.testing.assert_array_equal(parse_embedding(raw), [0.0, 0.0, 0.0])
+
+
+def test_encode_embedding_unsupported_dtype():
+    with pytest.raises(ValueError, match="Unsupported embedding dtype: bfloat16"):
+        encode_embedding([1.0], "bfloat16")
+
+
+def test_decode_embeddings_bulk_mixed_storage_dtypes():
+    vectors = np.random.default_rng(1).standard_normal((4, 8)).astype(np.float32)
+    bulk = pack_embedding_rows(
+        [
+            {"id": 1, "content_embedding": encode_embedding(vectors[0], "int8")},
+            {"id": 2, "content_embedding": encode_embedding(vectors[1])},
+            {"id": 3, "content_embedding": encode_embedding(vectors[2], "float16")},
+            {"id": 4, "content_embedding": encode_embedding(vectors[3][:4])},
+        ]
+    )
+
+    ids, matrix = decode_embeddings_bulk(bulk, 8)
+
+    assert ids == [1, 2, 3]
+    np.testing.assert_allclose(matrix, vectors[:3], atol=2e-2)
+    np.testing.assert_array_equal(matrix[1], vectors[1])
+
+
+def test_rescore_facts():
+    facts = [
+        {"id": 1, "content": "a", "similarity": 0.9},
+        {"id": 2, "content": "b", "similarity": 0.8},
+        {"id": 3, "content": "c", "similarity": 0.7},
+    ]
+
+    result = rescore_facts(
+        facts, [1.0, 0.0], [[0.0, 1.0], [0.0, 0.0], [2.0, 0.0]], limit=2
+    )
+
+    assert [fact["id"] for fact in result] == [3, 1]
+    assert result[0]["similarity"] == pytest.approx(1.0)
+    assert rescore_facts([], [1.0, 0.0], [], limit=2) == []
+
+
+def test_encode_binary_code_packs_sign_bits():
+    assert encode_binary_code([0.5, -0.1, 0.0, 2.0, 1.0, -3.0, 0.2, 0.1, 4.0]) == (
+        b"\x9b\x80"
+    )
+    assert encode_binary_code([]) == b""
+
+
+def test_binary_entity_index_candidates_by_hamming_distance():
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((200, 64)).astype(np.float32)
+    index = BinaryEntityIndex(64).add(list(range(200)), vectors)
+
+    assert len(index) == 200
+    assert index.nbytes == 200 * (8 + 8)
+    assert index.candidates(vectors[42].tolist(), 5)[0] == 42
+    assert index.candidates([1.0, 0.0], 5) == []
+
+
+def test_build_binary_entity_index_from_bulk_reports_missing_codes():
+    vectors = np.array([[1.0, -1.0, 1.0], [-1.0, 1.0, 1.0]], dtype=np.float32)
+    bulk = pack_code_rows(
+        [
+            {"id": 1, "content_embedding_code": binary_codes(vectors[0]).tobytes()},
+            {"id": 2, "content_embedding_code": None},
+            {"id": 3, "content_embedding_code": binary_codes(vectors[1]).tobytes()},
+        ]
+    )
+
+    index, missing_ids = build_binary_entity_index_from_bulk(bulk, 3)
+
+    assert index.ids == [1, 3]
+    assert missing_ids == [2]
+
+
+def test_search_entity_facts_prefilter_rescores_candidates():
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((50, 16)).astype(np.float32)
+    rows = {i: {"id": i, "content_embedding": vectors[i].tobytes()} for i in range(50)}
+
+    mock_driver = MagicMock()
+    mock_driver.get_embedding_codes_bulk.return_value = pack_code_rows(
+        [
+            {
+                "id": i,
+                "content_embedding_code": None
+                if i == 7
+                else encode_binary_code(vectors[i]),
+            }
+            for i in range(50)
+        ]
+    )
+    mock_driver.get_embeddings_by_ids.side_effect = lambda ids: [rows[i] for i in ids]
+    mock_driver.get_facts_by_ids.side_effect = lambda ids: [
+        {"id": i, "content": f"fact {i}"} for i in ids
+    ]
+
+    config = Config()
+    config.recall_prefilter.enabled = True
+    config.recall_prefilter.candidates = 10
+    config.recall_index_cache_max_bytes = 1024 * 1024
+    cache = EntityIndexCache(config)
+
+    query = vectors[7].tolist()
+    results = search_entity_facts(
+        mock_driver,
+        1,
+        query,
+        3,
+        1000,
+        index_cache=cache,
+        prefilter=config.recall_prefilter,
+    )
+
+    assert results[0]["id"] == 7
+    assert results[0]["similarity"] == pytest.approx(1.0, abs=1e-5)
+    assert len(results) == 3
+    mock_driver.get_embedding_codes_bulk.assert_called_once_with(
+        1, 1_000_000, policy="frequent"
+    )
+    mock_driver.get_embeddings_bulk.assert_not_called()
+    assert mock_driver.get_embeddings_by_ids.call_args_list[0][0][0] == [7]
+    assert len(mock_driver.get_embeddings_by_ids.call_args_list[1][0][0]) == 10
+
+    search_entity_facts(
+        mock_driver,
+        1,
+        query,
+        3,
+        1000,
+        index_cache=cache,
+        prefilter=config.recall_prefilter,
+    )
+    mock_driver.get_embedding_codes_bulk.assert_called_once()
+
+
+def test_entity_index_search_many_matches_search():
+    rng = np.random.default_rng(2)
+    vectors = rng.standard_normal((100, 8)).astype(np.float32)
+    index = EntityIndex(8).add(list(range(100)), vectors)
+    queries = rng.standard_normal((4, 8)).astype(np.float32).tolist()
+
+    assert index.search_many(queries, 3) == [index.search(q, 3) for q in queries]
+    assert index.search_many([], 3) == []
+    assert index.search_many([[1.0, 0.0]], 3) == [[]]
+
+
+def test_search_entity_facts_many_shares_fetches():
+    mock_driver = MagicMock()
+    mock_driver.get_embeddings_bulk.return_value = pack_embedding_rows(
+        [
+            {"id": 1, "content_embedding": [1.0, 0.0]},
+            {"id": 2, "content_embedding": [0.0, 1.0]},
+            {"id": 3, "content_embedding": [0.7, 0.7]},
+        ]
+    )
+    mock_driver.get_facts_by_ids.side_effect = lambda ids: [
+        {"id": i, "content": f"fact {i}"} for i in ids
+    ]
+
+    results = search_entity_facts_many(
+        mock_driver, 1, [[1.0, 0.0], [0.0, 1.0]], 2, 1000
+    )
+
+    assert [[r["id"] for r in facts] for facts in results] == [[1, 3], [2, 3]]
+    assert results[1][0]["content"] == "fact 2"
+    mock_driver.get_embeddings_bulk.assert_called_once_with(1, 1000, policy="frequent")
+    mock_driver.get_facts_by_ids.assert_called_once_with([1, 3, 2])
+
+
+def test_search_entity_facts_many_no_embeddings():
+    mock_driver = MagicMock()
+    mock_driver.get_embeddings_bulk.return_value = {
+        "ids": [],
+        "sizes": [],
+        "buffer": b"",
+    }
+
+    assert search_entity_facts_many(mock_driver, 1, [[1.0], [0.5]], 2, 1000) == [
+        [],
+        [],
+    ]
+    assert search_entity_facts_many(mock_driver, 1, [], 2, 1000) == []
+
+
+def _lexical_config(**overrides):
+    lexical = Config().recall_lexical
+    lexical.enabled = True
+    for key, value in overrides.items():
+        setattr(lexical, key, value)
+    return lexical
+
+
+def test_reciprocal_rank_fusion():
+    assert reciprocal_rank_fusion([[1, 2, 3], [3, 4]], k=60, limit=3) == [3, 1, 2]
+    assert reciprocal_rank_fusion([[1, 2], [2, 1]], k=60, limit=2) == [1, 2]
+    assert reciprocal_rank_fusion([[], []], k=60, limit=2) == []
+
+
+def test_entity_index_similarities():
+    index = EntityIndex(2).add([7, 8], np.array([[1.0, 0.0], [1.0, 1.0]]))
+    index.add([9], np.array([[0.0, 3.0]]))
+
+    similarities = index.similarities([1.0, 0.0], [9, 8, 99])
+
+    assert list(similarities) == [9, 8]
+    assert similarities[9] == pytest.approx(0.0)
+    assert similarities[8] == pytest.approx(0.7071, abs=1e-4)
+
+
+def test_search_entity_facts_lexical_fuses_candidates():
+    mock_driver = MagicMock()
+    mock_driver.get_embeddings_bulk.return_value = pack_embedding_rows(
+        [
+            {"id": 1, "content_embedding": [1.0, 0.0]},
+            {"id": 2, "content_embedding": [0.9, 0.1]},
+            {"id": 3, "content_embedding": [0.5, 0.5]},
+        ]
+    )
+    mock_driver.search_lexical.return_value = [3, 4]
+    mock_driver.get_embeddings_by_ids.return_value = [
+        {"id": 4, "content_embedding": [0.0, 1.0]}
+    ]
+    mock_driver.get_facts_by_ids.side_effect = lambda ids: [
+        {"id": i, "content": f"fact {i}"} for i in ids
+    ]
+
+    result = search_entity_facts(
+        mock_driver,
+        42,
+        [1.0, 0.0],
+        3,
+        1000,
+        query_text="pizza",
+        lexical=_lexical_config(rrf_k=1),
+    )
+
+    assert [fact["id"] for fact in result] == [3, 1, 2]
+    assert result[0]["similarity"] == pytest.approx(0.7071, abs=1e-4)
+    mock_driver.search_lexical.assert_called_once_with(42, "pizza", 200)
+    mock_driver.get_embeddings_by_ids.assert_not_called()
+
+    result = search_entity_facts(
+        mock_driver,
+        42,
+        [1.0, 0.0],
+        1,
+        1000,
+        query_text="pizza",
+        lexical=_lexical_config(rrf_k=1),
+    )
+    assert result == [
+        {"id": 3, "content": "fact 3", "similarity": result[0]["similarity"]}
+    ]
+
+
+def test_search_entity_facts_lexical_scores_facts_outside_index():
+    mock_driver = MagicMock()
+    mock_driver.get_embeddings_bulk.return_value = pack_embedding_rows(
+        [{"id": 1, "content_embedding": [1.0, 0.0]}]
+    )
+    mock_driver.search_lexical.return_value = [4]
+    mock_driver.get_embeddings_by_ids.return_value = [
+        {"id": 4, "content_embedding": [0.6, 0.8]}
+    ]
+    mock_driver.get_facts_by_ids.side_effect = lambda ids: [
+        {"id": i, "content": f"fact {i}"} for i in ids
+    ]
+
+    result = search_entity_facts(
+        mock_driver,
+        42,
+        [1.0, 0.0],
+        2,
+        1000,
+        query_text="nyc",
+        lexical=_lexical_config(),
+    )
+
+    assert {fact["id"]: fact["similarity"] for fact in result} == pytest.approx(
+        {1: 1.0, 4: 0.6}
+    )
+    mock_driver.get_embeddings_by_ids.assert_called_once_with([4])
+
+
+@pytest.mark.parametrize("lexical_result", [None, [], NotImplementedError])
+def test_search_entity_facts_lexical_unavailable(lexical_result):
+    mock_driver = MagicMock()
+    mock_driver.get_embeddings_bulk.return_value = pack_embedding_rows(
+        [
+            {"id": 1, "content_embedding": [1.0, 0.0]},
+            {"id": 2, "content_embedding": [0.0, 1.0]},
+        ]
+    )
+    if lexical_result is NotImplementedError:
+        mock_driver.search_lexical.side_effect = NotImplementedError
+    else:
+        mock_driver.search_lexical.return_value = lexical_result
+    mock_driver.get_facts_by_ids.side_effect = lambda ids: [
+        {"id": i, "content": f"fact {i}"} for i in ids
+    ]
+
+    result = search_entity_facts(
+        mock_driver, 42, [1.0, 0.0], 1, 1000, query_text="x", lexical=_lexical_config()
+    )
+
+    assert [fact["id"] for fact in result] == [1]
+
+
+def test_search_entity_facts_lexical_disabled_by_default():
+    mock_driver = MagicMock()
+    mock_driver.get_embeddings_bulk.return_value = pack_embedding_rows(
+        [{"id": 1, "content_embedding": [1.0, 0.0]}]
+    )
+    mock_driver.get_facts_by_ids.return_value = [{"id": 1, "content": "fact 1"}]
+
+    search_entity_facts(
+        mock_driver,
+        42,
+        [1.0, 0.0],
+        1,
+        1000,
+        query_text="x",
+        lexical=Config().recall_lexical,
+    )
+
+    mock_driver.search_lexical.assert_not_called()
+
+
+def test_search_entity_facts_prefilter_includes_lexical_candidates():
+    prefilter = Config().recall_prefilter
+    prefilter.enabled = True
+    prefilter.candidates = 2
+
+    vectors = {
+        1: [1.0, 0.0],
+        2: [-1.0, 0.0],
+        3: [0.8, -0.6],
+    }
+    mock_driver = MagicMock()
+    mock_driver.get_embedding_codes_bulk.return_value = pack_code_rows(
+        [
+            {"id": fact_id, "content_embedding_code": encode_binary_code(vector)}
+            for fact_id, vector in vectors.items()
+        ]
+    )
+    mock_driver.search_lexical.return_value = [2]
+    mock_driver.get_embeddings_by_ids.side_effect = lambda ids: [
+        {"id": i, "content_embedding": vectors[i]} for i in ids
+    ]
+    mock_driver.get_facts_by_ids.side_effect = lambda ids: [
+        {"id": i, "content": f"fact {i}"} for i in ids
+    ]
+
+    result = search_entity_facts(
+        mock_driver,
+        42,
+        [1.0, 0.0],
+        2,
+        1000,
+        prefilter=prefilter,
+        query_text="x",
+        lexical=_lexical_config(),
+    )
+
+    assert [(fact["id"], fact["similarity"]) for fact in result] == pytest.approx(
+        [(2, -1.0), (1, 1.0)]
+    )
+    mock_driver.get_embeddings_by_ids.assert_called_once_with([1, 3, 2])